@@ -22,7 +22,13 @@ if sys.version_info < tuple((int(val) for val in __minimum_python_version__.spli
 
 if not _ASTROPY_SETUP_:
 
-    import pyqtgraph as pg
+    # pyqtgraph is only needed by the GUI, so that the analysis routines and
+    # the headless session can be used on systems without Qt
+    try:
+        import pyqtgraph as pg
+    except ImportError:
+        pg = None
+
     from configparser import ConfigParser
 
     # Setup logging level and display
@@ -70,6 +76,7 @@ if not _ASTROPY_SETUP_:
                 parser.write(config_file)
 
         # Set the pyqtgraph options
-        pg.setConfigOptions(**pyqtgraph_settings)
+        if pg is not None:
+            pg.setConfigOptions(**pyqtgraph_settings)
 
     load_settings()
@@ -1,16 +1,18 @@
 import os
 import sys
-import random
+import time
 import logging
 import pkgutil
 import importlib
+from collections import OrderedDict
+from contextlib import contextmanager
 
 import click
 import numpy as np
 
 from qtpy.uic import loadUi
 from qtpy.QtGui import QIcon
-from qtpy.QtCore import QTimer, Qt, Signal
+from qtpy.QtCore import Qt, Signal
 from qtpy.QtWidgets import QApplication, QDialog, QMainWindow
 
 import astropy.units as u
@@ -20,6 +22,9 @@ from specutils import Spectrum1D
 from specutils import __version__ as specutils_version
 
 from . import __version__, plugins
+from .core.loading import expand_paths
+from .core.plugin import plugin
+from .core.storage import MemmapStorage
 from .widgets.workspace import Workspace
 
 
@@ -31,62 +36,148 @@ class Application(QApplication):
     workspace_added = Signal(Workspace)
 
     def __init__(self, *args, file_path=None, file_loader=None, embedded=False,
-                 dev=False, skip_splash=False, load_all=False, **kwargs):
+                 dev=False, skip_splash=False, load_all=False, scratch_dir=None,
+                 profile_startup=False, **kwargs):
         super(Application, self).__init__(*args, **kwargs)
 
         # Store references to workspace instances
         self._workspaces = []
 
+        # If set, the spectra of every workspace are spilled to memory-mapped
+        # files in a temporary directory created within this directory
+        self._scratch_dir = scratch_dir
+
         # Set application icon
         if not embedded:
             self.setWindowIcon(QIcon(":/icons/specviz.icns"))
 
-        # Load local plugins
-        self.load_local_plugins()
+        # Time of each initialization phase, as shown by the splash screen
+        self._startup_times = OrderedDict()
+        self._splash_dialog = None
 
-        # Show splash
+        # Show splash, advanced as each initialization phase starts
         if not skip_splash:
-            self._splash_dialog = SplashDialog(2000)
-            self._splash_dialog.exec()
+            self._splash_dialog = SplashDialog(2 + bool(dev) + bool(file_path))
+            self._splash_dialog.show()
 
-        # Cache a reference to the currently active window
-        self.current_workspace = self.add_workspace()
+        # Load local plugins
+        with self._startup_phase("Loading plugins"):
+            self.load_local_plugins()
 
-        # Add an initially empty plot
-        self.current_workspace.add_plot_window()
+        with self._startup_phase("Creating workspace"):
+            # Cache a reference to the currently active window
+            self.current_workspace = self.add_workspace()
+
+            # Add an initially empty plot
+            self.current_workspace.add_plot_window()
 
         if dev:
-            y = Gaussian1D(mean=50, stddev=10)(np.arange(100)) + np.random.sample(100) * 0.1
+            with self._startup_phase("Adding example data"):
+                self._add_example_data()
 
-            spec1 = Spectrum1D(flux=y * u.Jy,
-                            spectral_axis=np.arange(100) * u.AA)
-            spec2 = Spectrum1D(flux=np.random.sample(100) * u.erg,
-                            spectral_axis=np.arange(100) * u.Hz)
-            spec3 = Spectrum1D(flux=np.random.sample(100) * u.erg,
-                            spectral_axis=np.arange(100) * u.Hz)
+        # If a file path has been given, automatically add data
+        if file_path:
+            with self._startup_phase("Loading data"):
+                self._load_files(file_path, file_loader, load_all)
 
-            data_item = self.current_workspace.model.add_data(spec1, "Spectrum 1")
-            self.current_workspace.model.add_data(spec2, "Spectrum 2")
-            self.current_workspace.model.add_data(spec3, "Spectrum 3")
+        if self._splash_dialog is not None:
+            self._splash_dialog.close()
 
-            # Set the first item as selected
-            self.current_workspace.force_plot(data_item)
+        if profile_startup:
+            self.print_startup_times()
 
-        # If a file path has been given, automatically add data
-        if file_path is not None:
-            try:
+    @contextmanager
+    def _startup_phase(self, name):
+        """
+        Time an initialization phase, and show its progress on the splash
+        screen.
+        """
+        if self._splash_dialog is not None:
+            self._splash_dialog.set_progress(len(self._startup_times), name)
+
+        start = time.perf_counter()
+
+        try:
+            yield
+        finally:
+            self._startup_times[name] = time.perf_counter() - start
+
+    @property
+    def startup_times(self):
+        """
+        The time in seconds taken by each initialization phase of the
+        application, in order.
+        """
+        return self._startup_times
+
+    def print_startup_times(self, file=None):
+        """
+        Print the time taken by each initialization phase of the application.
+
+        Parameters
+        ----------
+        file : file-like, optional
+            The stream to print to. Defaults to the standard output.
+        """
+        width = max([len(x) for x in self._startup_times] + [len("Total")])
+
+        print("Startup time breakdown:", file=file)
+
+        for name, elapsed in self._startup_times.items():
+            print("  {:<{}}  {:8.3f} s".format(name, width, elapsed),
+                  file=file)
+
+        print("  {:<{}}  {:8.3f} s".format(
+            "Total", width, sum(self._startup_times.values())), file=file)
+
+    def _add_example_data(self):
+        """
+        Add generated example spectra to the current workspace.
+        """
+        y = Gaussian1D(mean=50, stddev=10)(np.arange(100)) + np.random.sample(100) * 0.1
+
+        spec1 = Spectrum1D(flux=y * u.Jy,
+                           spectral_axis=np.arange(100) * u.AA)
+        spec2 = Spectrum1D(flux=np.random.sample(100) * u.erg,
+                           spectral_axis=np.arange(100) * u.Hz)
+        spec3 = Spectrum1D(flux=np.random.sample(100) * u.erg,
+                           spectral_axis=np.arange(100) * u.Hz)
+
+        data_item = self.current_workspace.model.add_data(spec1, "Spectrum 1")
+        self.current_workspace.model.add_data(spec2, "Spectrum 2")
+        self.current_workspace.model.add_data(spec3, "Spectrum 3")
+
+        # Set the first item as selected
+        self.current_workspace.force_plot(data_item)
+
+    def _load_files(self, file_path, file_loader=None, load_all=False):
+        """
+        Load the files given on the command line into the current workspace.
+        """
+        file_paths = expand_paths(file_path)
+
+        try:
+            if len(file_paths) == 1:
                 self.current_workspace.load_data_from_file(
-                                            file_path, file_loader=file_loader,
-                                            multi_select=not load_all)
-            except Exception as e:
-                self.current_workspace.display_load_data_error(e)
+                                        file_paths[0], file_loader=file_loader,
+                                        multi_select=not load_all)
+            else:
+                self.current_workspace.load_data_from_files(
+                    file_paths, file_loader=file_loader)
+        except Exception as e:
+            self.current_workspace.display_load_data_error(e)
 
     def add_workspace(self):
         """
         Create a new main window instance with a new workspace embedded within.
         """
         # Initialize with a single main window
-        workspace = Workspace()
+        storage = None
+
+        if self._scratch_dir is not None:
+            storage = MemmapStorage(root=self._scratch_dir)
+
+        workspace = Workspace(storage=storage)
         workspace.show()
         self._workspaces.append(workspace)
 
@@ -101,6 +192,8 @@ class Application(QApplication):
         Import and parse any defined plugins in the `specviz.plugins`
         namespace. These are then added to the plugin registry for future
         initialization (e.g. when new workspaces are added to the application).
+        The modules of the plugins declared in `specviz.plugins` are not
+        imported, since these plugins are imported on first use.
         """
         # Load plugins
         def iter_namespace(ns_pkg):
@@ -124,10 +217,13 @@ class Application(QApplication):
             # modification to the name.
             return pkgutil.iter_modules(ns_pkg.__path__, ns_pkg.__name__ + ".")
 
+        declared = {entry.module for entry in plugin.entries.values()}
+
         # Import plugins modules into current namespace
         loaded_plugins = {name: importlib.import_module(name)
                           for finder, name, ispkg
-                          in iter_namespace(plugins)}
+                          in iter_namespace(plugins)
+                          if name not in declared}
 
     def remove_workspace(self):
         """
@@ -157,18 +253,17 @@ class Application(QApplication):
 class SplashDialog(QDialog):
     """
     Provides a splash screen when loading SpecViz providing basic information
-    of the current version of relevant packages, and waits a set amount of
-    time to ensure that initialization of the application is complete.
+    of the current version of relevant packages, and the progress of the
+    initialization of the application.
 
     Parameters
     ----------
-    wait_time : float
-        The time in milliseconds to wait for application start-up.
+    steps : int
+        The number of initialization phases.
     """
-    def __init__(self, wait_time, *args, **kwargs):
+    def __init__(self, steps, *args, **kwargs):
         super().__init__(*args, **kwargs)
-        self._wait_time = wait_time
-        self._total_time = 0
+        self._steps = max(steps, 1)
 
         self.setWindowFlags(Qt.FramelessWindowHint)
         self.setAutoFillBackground(True)
@@ -184,36 +279,37 @@ class SplashDialog(QDialog):
         self.specviz_version_label.setText("Version {}".format(__version__))
         self.specutils_version_label.setText("Using specutils {}".format(specutils_version))
 
-        self._timer = QTimer()
-        self._timer.timeout.connect(self.calculate_progress)
-        self._timer.start(300)
-
-    def calculate_progress(self):
+    def set_progress(self, step, message):
         """
-        Calculates a random amount of progress to show in the progress bar.
-        The progress bar currently is not attached to any load operation, so
-        it's a simple visual representation for the time defined in
-        `wait_time`.
+        Show the progress of the initialization as a new phase starts.
+
+        Parameters
+        ----------
+        step : int
+            The number of phases completed.
+        message : str
+            The description of the phase starting.
         """
-        rand = random.randrange(100, 500)
-        self._total_time += rand
-        self.progress_bar.setValue(self._total_time/self._wait_time*100)
+        self.progress_bar.setValue(int(step / self._steps * 100))
+        self.progress_bar.setFormat("{}... %p%".format(message))
 
-        if self._total_time > self._wait_time:
-            self._timer.stop()
-            self.close()
+        # Repaint the splash screen before the phase blocks the event loop
+        QApplication.processEvents()
 
 
 @click.command()
 @click.option('--hide_splash', '-H', is_flag=True, help="Hide the startup splash screen.")
-@click.option('--file_path', '-F', type=click.Path(exists=True), help="Load the file at the given path on startup.")
+@click.option('--file_path', '-F', type=click.Path(), multiple=True, help="Load the file at the given path on startup. May be repeated, and may be a glob pattern or a directory, in which case the files are read in parallel.")
 @click.option('--loader', '-L', type=str, help="Use specified loader when opening the provided file.")
 @click.option('--embed', '-E', is_flag=True, help="Only display a single plot window. Useful when embedding in other applications.")
 @click.option('--dev', '-D', is_flag=True, help="Open SpecViz in developer mode. This mode auto-loads example spectral data.")
 @click.option('--load_all', is_flag=True, help="Automatically load all spectra in file instead of displaying spectrum selection dialog")
+@click.option('--scratch_dir', type=click.Path(exists=True, file_okay=False), help="Spill loaded spectra to memory-mapped files in the given directory instead of keeping them in memory.")
+@click.option('--profile-startup', 'profile_startup', is_flag=True, help="Print the time taken by each phase of the startup.")
 @click.option('--version', '-V', is_flag=True, help="Print version information", is_eager=True)
 def start(version=False, file_path=None, loader=None, embed=None, dev=None,
-          hide_splash=False, load_all=None):
+          hide_splash=False, load_all=None, scratch_dir=None,
+          profile_startup=False):
     """
     The function called when accessed through the command line. Parses any
     command line arguments and provides them to the application instance, or
@@ -223,8 +319,9 @@ def start(version=False, file_path=None, loader=None, embed=None, dev=None,
     ----------
     version : str
         Prints the version number of SpecViz.
-    file_path : str
-        Path to a data file to load directly into SpecViz.
+    file_path : tuple
+        Paths, glob patterns or directories of data files to load directly
+        into SpecViz.
     loader : str
         Loader definition for specifying how to load the given data.
     embed : bool
@@ -233,6 +330,12 @@ def start(version=False, file_path=None, loader=None, embed=None, dev=None,
         Auto-generates sample data for easy developer testing.
     hide_splash : bool
         Hides the splash screen on startup.
+    load_all : bool
+        Load all spectra in the file without displaying the selection dialog.
+    scratch_dir : str
+        Directory in which to spill loaded spectra to memory-mapped files.
+    profile_startup : bool
+        Prints the time taken by each phase of the startup.
     """
     if version:
         print(__version__)
@@ -241,7 +344,8 @@ def start(version=False, file_path=None, loader=None, embed=None, dev=None,
     # Start the application, passing in arguments
     app = Application(sys.argv, file_path=file_path, file_loader=loader,
                       embedded=embed, dev=dev, skip_splash=hide_splash,
-                      load_all=load_all)
+                      load_all=load_all, scratch_dir=scratch_dir,
+                      profile_startup=profile_startup)
 
     # Enable hidpi icons
     QApplication.setAttribute(Qt.AA_UseHighDpiPixmaps, True)
@@ -0,0 +1,257 @@
+"""
+Command line runner applying a saved `~specviz.core.recipe.Recipe` to many
+files, without a display.
+
+The files are processed in a pool of processes, each file being read,
+processed by the recipe and written independently, so that a file failing
+does not stop the others. The time taken by each phase is reported for each
+file, along with the failures.
+"""
+import json
+import multiprocessing
+import os
+import sys
+import time
+import traceback
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from contextlib import contextmanager
+
+import click
+
+from .core.export import EXPORT_FORMATS, _file_names, export_spectrum
+from .core.loading import expand_paths, read_spectra
+from .core.recipe import Recipe
+
+__all__ = ['FileReport', 'run_recipe', 'main']
+
+
+class FileReport:
+    """
+    The outcome of applying a recipe to a file.
+
+    Parameters
+    ----------
+    file_path : str
+        The path of the input file.
+
+    Attributes
+    ----------
+    outputs : list
+        The paths of the files written.
+    times : `~collections.OrderedDict`
+        The time taken by each phase (``read``, ``process`` and ``write``),
+        in seconds.
+    error : str or `None`
+        The traceback of the exception raised while processing the file, or
+        `None` if the file was processed.
+    """
+    def __init__(self, file_path):
+        self.file_path = file_path
+        self.outputs = []
+        self.times = OrderedDict()
+        self.error = None
+
+    @property
+    def total_time(self):
+        """The time taken by all the phases, in seconds."""
+        return sum(self.times.values())
+
+    @contextmanager
+    def timing(self, phase):
+        """
+        Record the time taken by a phase.
+        """
+        start = time.perf_counter()
+
+        try:
+            yield
+        finally:
+            self.times[phase] = time.perf_counter() - start
+
+    def to_dict(self):
+        """
+        The JSON-serialisable representation of the report.
+        """
+        return {'file_path': self.file_path, 'outputs': self.outputs,
+                'times': self.times, 'error': self.error}
+
+    def __str__(self):
+        phases = ", ".join("{} {:.2f} s".format(phase, seconds)
+                           for phase, seconds in self.times.items())
+        status = "FAILED" if self.error is not None else \
+            "{} spectra written".format(len(self.outputs))
+
+        return "{}: {:.2f} s ({}) {}".format(self.file_path, self.total_time,
+                                             phases, status)
+
+
+def _process_file(recipe, file_path, output_base, fmt, file_loader=None):
+    """
+    Apply a recipe to the spectra of a file in a worker process.
+    """
+    report = FileReport(file_path)
+
+    try:
+        with report.timing('read'):
+            speclist = read_spectra(file_path, file_loader=file_loader)
+
+        with report.timing('process'):
+            results = [recipe.apply(spectrum) for spectrum in speclist]
+
+        with report.timing('write'):
+            if len(results) == 1:
+                paths = [output_base + fmt[1:]]
+            else:
+                # The spectra of a file are written to a directory of their
+                # own, so that their names cannot collide with the results
+                # of the other files
+                os.makedirs(output_base, exist_ok=True)
+                name = os.path.basename(output_base)
+                paths = [os.path.join(output_base, file_name)
+                         for file_name in _file_names(
+                             ["{}-{}".format(name, i)
+                              for i in range(len(results))], fmt[1:])]
+
+            for result, path in zip(results, paths):
+                export_spectrum(result, path, fmt=fmt)
+                report.outputs.append(path)
+    except Exception:
+        report.error = traceback.format_exc()
+
+    return report
+
+
+def run_recipe(recipe, paths, directory, fmt='*.fits', file_loader=None,
+               max_workers=None):
+    """
+    Apply a recipe to the spectra of many files in parallel, in a pool of
+    processes.
+
+    Parameters
+    ----------
+    recipe : `~specviz.core.recipe.Recipe`
+        The recipe.
+    paths : list of str
+        Paths, glob patterns or directories of the files to process.
+    directory : str
+        The directory to write the results to, created if it does not exist.
+        The results are named after the input files. The results of a file
+        holding several spectra are written to a subdirectory named after the
+        file.
+    fmt : str, optional
+        The key of the output format in
+        :data:`~specviz.core.export.EXPORT_FORMATS`.
+    file_loader : str, optional
+        Format specified for the astropy io interface, used for all the
+        files.
+    max_workers : int, optional
+        The number of processes. Defaults to the number of processors.
+
+    Yields
+    ------
+    `FileReport`
+        The report of each file, in the order the files are processed.
+    """
+    if fmt not in EXPORT_FORMATS:
+        raise ValueError("Unknown export format '{}', must be one of "
+                         "{}.".format(fmt, list(EXPORT_FORMATS)))
+
+    file_paths = expand_paths(paths)
+
+    os.makedirs(directory, exist_ok=True)
+
+    # Input files with the same name in different directories get distinct
+    # output names
+    output_bases = [os.path.join(directory, name) for name in _file_names(
+        [os.path.basename(x).split('.')[0] for x in file_paths], '')]
+
+    kwargs = {}
+
+    # Forking a process that imported Qt is unsafe
+    if sys.version_info >= (3, 7):
+        kwargs['mp_context'] = multiprocessing.get_context('spawn')
+
+    with ProcessPoolExecutor(max_workers=max_workers, **kwargs) as executor:
+        futures = {executor.submit(_process_file, recipe, file_path,
+                                   output_base, fmt, file_loader): file_path
+                   for file_path, output_base in zip(file_paths,
+                                                     output_bases)}
+
+        try:
+            for future in as_completed(futures):
+                try:
+                    yield future.result()
+                except Exception:
+                    # The worker process itself failed
+                    report = FileReport(futures[future])
+                    report.error = traceback.format_exc()
+
+                    yield report
+        finally:
+            # Stop processing the remaining files if the caller stops
+            # iterating
+            for future in futures:
+                future.cancel()
+
+
+@click.command()
+@click.argument('recipe', type=click.Path(exists=True, dir_okay=False))
+@click.argument('paths', nargs=-1, required=True)
+@click.option('--output', '-o', type=click.Path(file_okay=False), required=True, help="Directory to write the results to.")
+@click.option('--format', '-f', 'fmt', type=click.Choice(['fits', 'hdf5', 'ecsv']), default='fits', help="Format of the results.")
+@click.option('--loader', '-L', type=str, help="Use specified loader when opening the input files.")
+@click.option('--workers', '-j', type=int, help="Number of processes. Defaults to the number of processors.")
+@click.option('--report', type=click.Path(dir_okay=False), help="Path of the JSON report of the timings and failures. Defaults to batch_report.json in the output directory.")
+def main(recipe, paths, output, fmt='fits', loader=None, workers=None,
+         report=None):
+    """
+    Apply the RECIPE saved to a JSON file to the spectra of the files at
+    PATHS, which may be glob patterns or directories, and write the results
+    to the output directory.
+
+    Parameters
+    ----------
+    recipe : str
+        Path of the recipe file.
+    paths : tuple
+        Paths, glob patterns or directories of the files to process.
+    output : str
+        Directory to write the results to.
+    fmt : str
+        Format of the results.
+    loader : str
+        Loader definition for specifying how to load the input files.
+    workers : int
+        Number of processes.
+    report : str
+        Path of the JSON report.
+    """
+    start = time.perf_counter()
+    reports = []
+
+    for file_report in run_recipe(Recipe.load(recipe), paths, output,
+                                  fmt='*.' + fmt, file_loader=loader,
+                                  max_workers=workers):
+        click.echo(str(file_report))
+        reports.append(file_report)
+
+    failures = [x for x in reports if x.error is not None]
+
+    click.echo("Processed {} files in {:.2f} s, {} failed.".format(
+        len(reports), time.perf_counter() - start, len(failures)))
+
+    for file_report in failures:
+        click.echo("\n{}:\n{}".format(file_report.file_path,
+                                      file_report.error), err=True)
+
+    report = report or os.path.join(output, 'batch_report.json')
+
+    with open(report, 'w') as f:
+        json.dump([x.to_dict() for x in reports], f, indent=4)
+
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,382 @@
+"""
+Analysis routines shared by the specviz plugins and the headless session.
+
+Nothing in this module depends on Qt, so that the same code paths can be used
+without a display.
+"""
+import logging
+import math
+
+import astropy.units as u
+import numpy as np
+import specutils
+from astropy.convolution import (Box1DKernel, Gaussian1DKernel,
+                                 Trapezoid1DKernel, convolve)
+from astropy.modeling import fitting
+from scipy.ndimage import median_filter
+from specutils import SpectralRegion, Spectrum1D
+from specutils.analysis import (centroid, equivalent_width, fwhm, line_flux,
+                                snr)
+from specutils.fitting import fit_lines
+from specutils.manipulation import extract_region
+from specutils.manipulation.smoothing import (box_smooth, gaussian_smooth,
+                                              median_smooth, trapezoid_smooth)
+
+from .operations import register_batch
+
+__all__ = ['KERNEL_REGISTRY', 'FITTERS', 'smooth', 'smoothed_name',
+           'fit_model', 'evaluate_expression', 'check_unit_compatibility',
+           'clip_region', 'compute_stats', 'region_statistics']
+
+# Dictionary to store available kernel options.
+#
+# KERNEL_REGISTRY:
+#     kernel_type: Type of kernel
+#         name: Display name
+#         unit_label: Display units of kernel size (singular)
+#         size_dimension: Dimension of kernel (width, radius, etc..)
+#         function: Smoothing function
+KERNEL_REGISTRY = {
+    "box": {"name": "Box",
+            "unit_label": "Pixel",
+            "size_dimension": "Width",
+            "function": box_smooth},
+    "gaussian": {"name": "Gaussian",
+                 "unit_label": "Pixel",
+                 "size_dimension": "Std Dev",
+                 "function": gaussian_smooth},
+    "trapezoid": {"name": "Trapezoid",
+                  "unit_label": "Pixel",
+                  "size_dimension": "Width",
+                  "function": trapezoid_smooth},
+    "median": {"name": "Median",
+               "unit_label": "Pixel",
+               "size_dimension": "Width",
+               "function": median_smooth}
+}
+
+FITTERS = {
+    'Levenberg-Marquardt': fitting.LevMarLSQFitter,
+    'Simplex Least Squares': fitting.SimplexLSQFitter,
+    # Disabled # 'SLSQP Optimization': fitting.SLSQPLSQFitter,
+}
+
+
+def _convolve_rows(flux, kernel):
+    # Convolving with a single row kernel convolves each row independently,
+    # with the same boundary and NaN treatment as `convolution_smooth`
+    flux = np.asarray(getattr(flux, 'value', flux), dtype=float)
+
+    return convolve(flux, kernel.array[np.newaxis, :])
+
+
+@register_batch(box_smooth)
+def _box_smooth_batch(flux, spectral_axis, width):
+    return _convolve_rows(flux, Box1DKernel(width))
+
+
+@register_batch(gaussian_smooth)
+def _gaussian_smooth_batch(flux, spectral_axis, stddev):
+    return _convolve_rows(flux, Gaussian1DKernel(stddev))
+
+
+@register_batch(trapezoid_smooth)
+def _trapezoid_smooth_batch(flux, spectral_axis, width):
+    return _convolve_rows(flux, Trapezoid1DKernel(width))
+
+
+@register_batch(median_smooth)
+def _median_smooth_batch(flux, spectral_axis, width):
+    # Reject the widths `median_smooth` rejects, rather than truncating them
+    if not isinstance(width, (int, float)) or width <= 0:
+        raise ValueError("The width parameter, {}, must be a number greater "
+                         "than 0".format(width))
+
+    if width != int(width) or int(width) % 2 != 1:
+        raise ValueError("Each element of kernel_size should be odd.")
+
+    # Zero padding, as `scipy.signal.medfilt` used by `median_smooth`
+    flux = np.asarray(getattr(flux, 'value', flux), dtype=float)
+
+    return median_filter(flux, size=(1, int(width)), mode='constant', cval=0)
+
+
+def smooth(spectrum, kernel, size):
+    """
+    Smooth a spectrum.
+
+    Parameters
+    ----------
+    spectrum : :class:`~specutils.Spectrum1D`
+        The spectrum to smooth.
+    kernel : str
+        The key of the kernel in `KERNEL_REGISTRY`.
+    size : float
+        The size of the kernel, in pixels.
+
+    Returns
+    -------
+    :class:`~specutils.Spectrum1D`
+        The smoothed spectrum.
+    """
+    if kernel not in KERNEL_REGISTRY:
+        raise ValueError("Unknown smoothing kernel '{}', must be one of "
+                         "{}.".format(kernel, list(KERNEL_REGISTRY)))
+
+    return KERNEL_REGISTRY[kernel]["function"](spectrum, size)
+
+
+def smoothed_name(name, kernel, size):
+    """
+    Generate the display name of a smoothed spectrum.
+
+    Parameters
+    ----------
+    name : str
+        The display name of the spectrum that was smoothed.
+    kernel : str
+        The key of the kernel in `KERNEL_REGISTRY`.
+    size : float
+        The size of the kernel, in pixels.
+    """
+    kernel = KERNEL_REGISTRY[kernel]
+    unit_label = kernel["unit_label"].lower()
+    unit_format = "{0} {1}" if size == 1. else "{0} {1}s"
+    size_text = unit_format.format(size, unit_label)
+
+    return "{0} Smoothed({1}, {2})".format(name, kernel["name"], size_text)
+
+
+def fit_model(spectrum, model, region=None, fitter='Levenberg-Marquardt',
+              **kwargs):
+    """
+    Fit a model to a spectrum.
+
+    Parameters
+    ----------
+    spectrum : :class:`~specutils.Spectrum1D`
+        The spectrum to fit.
+    model : :class:`~astropy.modeling.Model`
+        The model to fit, with initial parameter values.
+    region : :class:`~specutils.SpectralRegion`, optional
+        The region of the spectrum to fit. Defaults to the whole spectrum.
+    fitter : str, optional
+        The key of the fitter in `FITTERS`.
+    kwargs : dict
+        Additional keyword arguments given to the fitter, such as
+        ``maxiter``.
+
+    Returns
+    -------
+    :class:`~astropy.modeling.Model`
+        The fitted model.
+    """
+    if fitter not in FITTERS:
+        raise ValueError("Unknown fitter '{}', must be one of "
+                         "{}.".format(fitter, list(FITTERS)))
+
+    return fit_lines(spectrum, model, fitter=FITTERS[fitter](),
+                     window=region, **kwargs)
+
+
+def evaluate_expression(expression, spectra):
+    """
+    Evaluate an arithmetic expression between spectra.
+
+    Parameters
+    ----------
+    expression : str
+        The expression, where the names of the spectra are surrounded by
+        ``{}`` brackets, e.g. ``{Spectrum 1} * 2 - {Spectrum 2}``. The
+        expression may use ``np``, ``u``, ``math``, ``specutils`` and
+        ``Spectrum1D``.
+    spectra : dict
+        The :class:`~specutils.Spectrum1D` objects the expression can refer
+        to, by name.
+
+    Returns
+    -------
+    :class:`~specutils.Spectrum1D`
+        The result of the expression.
+
+    Raises
+    ------
+    ValueError
+        If the expression does not evaluate to a spectrum.
+    """
+    namespace = {'np': np, 'u': u, 'math': math, 'specutils': specutils,
+                 'Spectrum1D': Spectrum1D}
+    references = {}
+
+    for i, (name, spectrum) in enumerate(spectra.items()):
+        references[name] = '_spectrum_{}'.format(i)
+        namespace[references[name]] = spectrum
+
+    result = eval(expression.format(**references), namespace)
+
+    if not isinstance(result, Spectrum1D):
+        raise ValueError("Arithmetic Editor must return Spectrum1D object "
+                         "not {}".format(type(result)))
+
+    return result
+
+
+def check_unit_compatibility(spec, region):
+    """
+    Checks if the unit of a region is compatible with the unit of the spectral
+    axis of the spectrum object.
+
+    Parameters
+    ----------
+    spec : :class:`specutils.Spectrum1D`
+        The spectrum object with which to check compatibility.
+    region : :class:`specutils.SpectralRegion`
+        The region object with which to check compatibility.
+
+    Returns
+    -------
+    bool
+        Whether or not units are compatible.
+    """
+    spec_unit = spec.spectral_axis.unit
+    if region.lower is not None:
+        region_unit = region.lower.unit
+    elif region.upper is not None:
+        region_unit = region.upper.unit
+    else:
+        return False
+    return spec_unit.is_equivalent(region_unit)
+
+
+def clip_region(spectrum, region):
+    """
+    Given a region, clips the lower and upper bounds to the limits of the
+    spectrum's spectral axis.
+
+    Parameters
+    ----------
+    spec : :class:`specutils.Spectrum1D`
+        The spectrum whose bounds will be used in clipping.
+    region : :class:`specutils.SpectralRegion`
+        The region object whose bounds will change.
+
+    Returns
+    -------
+    :class:`specutils.SpectralRegion`
+        New spectral region object with correct bounds.
+    """
+    # If the region is out of data range return None:
+    if region.lower > spectrum.spectral_axis.max() or \
+            region.upper < spectrum.spectral_axis.min():
+        return None
+
+    # Clip region. There is currently no way to update
+    # SpectralRegion lower and upper so we have to create
+    # a new object here.
+    lower = max(region.lower, spectrum.spectral_axis.min())
+    upper = min(region.upper, spectrum.spectral_axis.max())
+
+    return SpectralRegion(lower, upper)
+
+
+def compute_stats(spectrum):
+    """
+    Compute basic statistics for a spectral region.
+    Parameters
+    ----------
+    spectrum : `~specutils.spectra.spectrum1d.Spectrum1D`
+    region: `~specutils.utils.SpectralRegion`
+    """
+
+    try:
+        cent = centroid(spectrum, region=None) # we may want to adjust this for continuum subtraction
+    except Exception as e:
+        logging.debug(e)
+        cent = "Error"
+
+    try:
+        snr_val = snr(spectrum)
+    except Exception as e:
+        logging.debug(e)
+        snr_val = "N/A"
+
+    try:
+        fwhm_val = fwhm(spectrum)
+    except Exception as e:
+        logging.debug(e)
+        fwhm_val = "Error"
+
+    try:
+        ew = equivalent_width(spectrum)
+    except Exception as e:
+        logging.debug(e)
+        ew = "Error"
+
+    try:
+        total = line_flux(spectrum)
+    except Exception as e:
+        logging.debug(e)
+        total = "Error"
+
+    return {'mean': spectrum.flux.mean(),
+            'median': np.median(spectrum.flux),
+            'stddev': spectrum.flux.std(),
+            'centroid': cent,
+            'snr': snr_val,
+            'fwhm': fwhm_val,
+            'ew': ew,
+            'total': total,
+            'maxval': spectrum.flux.max(),
+            'minval': spectrum.flux.min()}
+
+
+def region_statistics(spectrum, region=None):
+    """
+    Compute the statistics of a spectrum over a region.
+
+    Parameters
+    ----------
+    spectrum : :class:`~specutils.Spectrum1D`
+        The spectrum.
+    region : :class:`~specutils.SpectralRegion`, optional
+        The region, clipped to the spectral axis of the spectrum. Defaults to
+        the whole spectrum.
+
+    Returns
+    -------
+    dict
+        The statistics, as returned by `compute_stats`.
+
+    Raises
+    ------
+    ValueError
+        If the statistics cannot be computed over the region, with a message
+        describing why.
+    """
+    if region is not None:
+        if not check_unit_compatibility(spectrum, region):
+            raise ValueError("Region units are not compatible with "
+                             "selected data's spectral axis units.")
+
+        region = clip_region(spectrum, region)
+
+        if region is None:
+            raise ValueError("Region out of bound.")
+
+        idx1, idx2 = region.bounds
+
+        if idx1 == idx2:
+            raise ValueError("Region over single value.")
+
+        try:
+            extracted = extract_region(spectrum, region)
+        except ValueError:
+            raise ValueError("Region could not be extracted "
+                             "from target data.")
+
+        if not len(extracted.flux) > 0:
+            raise ValueError("Region range is too small.")
+
+        spectrum = extracted
+
+    return compute_stats(spectrum)
@@ -0,0 +1,432 @@
+import hashlib
+import weakref
+
+import astropy.units as u
+import numpy as np
+from astropy.modeling.tabular import Tabular1D
+from gwcs import coordinate_frames as cf
+from gwcs.wcs import WCS as GWCS
+from specutils import Spectrum1D
+
+__all__ = ['BufferPool', 'ConvertedArrayStore', 'GrowableArray',
+           'spectral_axis_pool', 'intern_spectral_axis', 'share_spectral_axis',
+           'spectral_axis_buffer', 'spectral_axis_view', 'build_spectrum',
+           'is_memory_mapped', 'buffer_digest']
+
+
+def buffer_digest(quantity):
+    """
+    Compute a digest of the content of an array or quantity, including its
+    unit, data type and shape.
+
+    Parameters
+    ----------
+    quantity : `~astropy.units.Quantity` or `~numpy.ndarray`
+        The array to hash.
+
+    Returns
+    -------
+    str
+        The hexadecimal digest.
+    """
+    value = np.ascontiguousarray(getattr(quantity, 'value', quantity))
+    unit = getattr(quantity, 'unit', None)
+
+    digest = hashlib.sha1()
+    digest.update(str(unit).encode())
+    digest.update(str(value.dtype).encode())
+    digest.update(str(value.shape).encode())
+    digest.update(value.data)
+
+    return digest.hexdigest()
+
+
+class BufferPool:
+    """
+    Content-addressed pool of read-only quantities.
+
+    Interning a quantity returns the pooled quantity with the same content if
+    one exists, so that identical arrays held by different spectra share a
+    single buffer. The pool only holds weak references, and a buffer is
+    released once no spectrum references it anymore.
+    """
+    def __init__(self):
+        self._buffers = weakref.WeakValueDictionary()
+
+        # Pooled quantities by object identity, to recognize arrays backed by
+        # the pool without hashing them
+        self._pooled = weakref.WeakValueDictionary()
+
+    def __len__(self):
+        return len(self._buffers)
+
+    def find(self, array):
+        """
+        Retrieve the pooled quantity holding the memory of an array, without
+        hashing its content.
+
+        Parameters
+        ----------
+        array : `~numpy.ndarray`
+            A pooled quantity or a view of one.
+
+        Returns
+        -------
+        `~astropy.units.Quantity`
+            The pooled quantity, or `None` if the array is not backed by the
+            pool.
+        """
+        while isinstance(array, np.ndarray):
+            if self._pooled.get(id(array)) is array:
+                return array
+
+            array = array.base
+
+    def intern(self, quantity):
+        """
+        Retrieve the pooled quantity with the same content as the one given,
+        adding it to the pool if necessary.
+
+        Parameters
+        ----------
+        quantity : `~astropy.units.Quantity`
+            The quantity to intern.
+
+        Returns
+        -------
+        `~astropy.units.Quantity`
+            The read-only pooled quantity.
+        """
+        key = buffer_digest(quantity)
+        pooled = self._buffers.get(key)
+
+        if pooled is None:
+            # Never make the caller's array read-only behind its back
+            pooled = u.Quantity(quantity, copy=quantity.flags.writeable)
+            pooled.flags.writeable = False
+
+            self._buffers[key] = pooled
+            self._pooled[id(pooled)] = pooled
+
+        return pooled
+
+
+class GrowableArray:
+    """
+    One-dimensional array with amortised constant time appends.
+
+    The values are held at the start of a larger buffer whose capacity is
+    doubled whenever it is exhausted, so that appending ``n`` values costs
+    ``O(n)`` on average rather than a copy of the whole array. Views returned
+    by `GrowableArray.array` share the buffer until it is reallocated.
+
+    Parameters
+    ----------
+    values : array-like, optional
+        The initial values, which are copied.
+    dtype : `~numpy.dtype`, optional
+        The data type of the array. Defaults to that of ``values``, or to
+        `float` if no values are given.
+    """
+    def __init__(self, values=None, dtype=None):
+        values = np.ravel(np.asarray([] if values is None else values,
+                                     dtype=dtype or (float if values is None
+                                                     else None)))
+
+        self._buffer = np.empty(max(values.size, 16), dtype=values.dtype)
+        self._buffer[:values.size] = values
+        self._size = values.size
+
+    def __len__(self):
+        return self._size
+
+    @property
+    def array(self):
+        """
+        A view of the values in the buffer.
+        """
+        return self._buffer[:self._size]
+
+    @property
+    def buffer(self):
+        """
+        The whole underlying buffer, including the unused capacity.
+        """
+        return self._buffer
+
+    def resize(self, size):
+        """
+        Change the number of values, growing the buffer if necessary. Values
+        added at the end are left uninitialised.
+
+        Parameters
+        ----------
+        size : int
+            The new number of values.
+        """
+        if size > self._buffer.size:
+            buffer = np.empty(max(size, 2 * self._buffer.size),
+                              dtype=self._buffer.dtype)
+            buffer[:self._size] = self._buffer[:self._size]
+            self._buffer = buffer
+
+        self._size = size
+
+    def append(self, values):
+        """
+        Append values to the end of the array.
+
+        Parameters
+        ----------
+        values : array-like
+            The values to append.
+        """
+        values = np.ravel(values)
+        start = self._size
+
+        self.resize(start + values.size)
+        self._buffer[start:self._size] = values
+
+
+class ConvertedArrayStore:
+    """
+    Store of the arrays of data items converted to display units, shared by
+    all the plot data items drawing the same data item.
+
+    Entries are keyed by the data item identifier, its data version, the kind
+    of array (e.g. ``'flux'``) and the display unit(s) it was converted to.
+    The store only holds weak references: an entry is released once no plot
+    data item uses it anymore, so arrays of older data versions or of units
+    no longer displayed do not accumulate.
+    """
+    def __init__(self):
+        self._arrays = weakref.WeakValueDictionary()
+
+    def __len__(self):
+        return len(self._arrays)
+
+    def get(self, identifier, version, kind, unit):
+        """
+        Retrieve a converted array.
+
+        Parameters
+        ----------
+        identifier : :class:`uuid.UUID`
+            The identifier of the data item.
+        version : int
+            The data version the array was converted from.
+        kind : str
+            The kind of array.
+        unit : str or tuple
+            The display unit(s) the array was converted to.
+
+        Returns
+        -------
+        `~numpy.ndarray` or object
+            The stored array, or `None` if it is not in the store.
+        """
+        return self._arrays.get((identifier, version, kind, unit))
+
+    def put(self, identifier, version, kind, unit, values):
+        """
+        Add a converted array to the store, replacing any array stored under
+        the same key. See `ConvertedArrayStore.get` for the parameters.
+        """
+        self._arrays[(identifier, version, kind, unit)] = values
+
+    def nbytes(self):
+        """
+        The number of bytes used by the stored arrays. Objects derived from
+        the arrays, such as envelope pyramids, are not counted.
+        """
+        return sum(values.nbytes for values in self._arrays.values()
+                   if isinstance(values, np.ndarray))
+
+
+#: The pool shared by the spectral axes of all data items
+spectral_axis_pool = BufferPool()
+
+
+def intern_spectral_axis(spectral_axis):
+    """
+    Intern a spectral axis in the shared `spectral_axis_pool`.
+
+    Parameters
+    ----------
+    spectral_axis : `~astropy.units.Quantity`
+        The spectral axis to intern.
+
+    Returns
+    -------
+    `~astropy.units.Quantity`
+        The read-only pooled spectral axis.
+    """
+    return spectral_axis_pool.intern(spectral_axis)
+
+
+def is_memory_mapped(array):
+    """
+    Whether an array, or the array owning its memory, is memory-mapped.
+    """
+    # Walk up to the array owning the memory
+    while isinstance(getattr(array, 'base', None), np.ndarray):
+        array = array.base
+
+    return isinstance(array, np.memmap)
+
+
+def _tabular_transform(spectrum):
+    # Spectra built from a spectral axis array hold its values as the lookup
+    # table of a tabular GWCS
+    wcs = getattr(spectrum.wcs, 'wcs', None)
+    transform = getattr(wcs, 'forward_transform', None)
+
+    if isinstance(transform, Tabular1D):
+        return transform
+
+
+def spectral_axis_buffer(spectrum):
+    """
+    Retrieve the array holding the spectral axis values retained by a
+    spectrum.
+
+    Parameters
+    ----------
+    spectrum : :class:`~specutils.Spectrum1D`
+        The spectrum.
+
+    Returns
+    -------
+    `~numpy.ndarray`
+        The lookup table of the tabular WCS of the spectrum, or `None` if its
+        spectral axis is computed from a FITS WCS.
+    """
+    transform = _tabular_transform(spectrum)
+
+    return transform.lookup_table if transform is not None else None
+
+
+def spectral_axis_view(spectrum):
+    """
+    Retrieve the spectral axis of a spectrum without computing it from its
+    WCS, as a quantity viewing the values held by its tabular WCS.
+
+    Parameters
+    ----------
+    spectrum : :class:`~specutils.Spectrum1D`
+        The spectrum.
+
+    Returns
+    -------
+    `~astropy.units.Quantity`
+        The pooled spectral axis if the spectrum was built around one, a view
+        of the lookup table of its tabular WCS otherwise, or `None` if its
+        spectral axis is computed from a FITS WCS or in other units than the
+        ones of its WCS.
+    """
+    buffer = spectral_axis_buffer(spectrum)
+
+    if buffer is None:
+        return
+
+    unit = spectrum.wcs.wcs.output_frame.unit[0]
+
+    if unit != spectrum.spectral_axis_unit:
+        return
+
+    pooled = spectral_axis_pool.find(buffer)
+
+    if pooled is not None and pooled.unit == unit and \
+            pooled.shape == buffer.shape:
+        return pooled
+
+    return u.Quantity(buffer, unit, copy=False)
+
+
+def build_spectrum(flux, spectral_axis, **kwargs):
+    """
+    Build a spectrum holding the given spectral axis rather than a copy of
+    it, so that several spectra can share a single buffer.
+
+    Spectra given a ``spectral_axis`` copy it into their tabular WCS. The
+    same WCS is built here around the values of the spectral axis instead,
+    and given to the spectrum as its ``wcs``.
+
+    Parameters
+    ----------
+    flux : `~astropy.units.Quantity`
+        The flux of the spectrum.
+    spectral_axis : `~astropy.units.Quantity`
+        The spectral axis to hold, usually a pooled or memory-mapped one.
+    kwargs
+        Other arguments of :class:`~specutils.Spectrum1D`.
+
+    Returns
+    -------
+    :class:`~specutils.Spectrum1D`
+        The new spectrum.
+    """
+    values = spectral_axis.value
+    pixels = np.arange(len(values))
+
+    forward_transform = Tabular1D(pixels, values)
+    forward_transform.inverse = Tabular1D(values, pixels)
+
+    wcs = GWCS(forward_transform=forward_transform,
+               input_frame=cf.CoordinateFrame(naxes=1,
+                                              axes_type=('SPECTRAL',),
+                                              axes_order=(0,)),
+               output_frame=cf.SpectralFrame(unit=spectral_axis.unit,
+                                             axes_order=(0,)))
+
+    return Spectrum1D(flux=flux, wcs=wcs, **kwargs)
+
+
+def share_spectral_axis(spectrum, previous=None):
+    """
+    Rebuild a spectrum around the pooled copy of its spectral axis, so that
+    spectra with identical spectral axes (e.g. spectra derived from one
+    another) retain a single buffer.
+
+    Parameters
+    ----------
+    spectrum : :class:`~specutils.Spectrum1D`
+        The spectrum whose spectral axis to share.
+    previous : `~astropy.units.Quantity`, optional
+        The pooled spectral axis of the spectrum replaced by this one. Edits
+        usually keep the spectral axis, which is then compared to the
+        previous one rather than hashed to be interned again.
+
+    Returns
+    -------
+    :class:`~specutils.Spectrum1D`
+        A spectrum holding the same flux, uncertainty, mask and meta data
+        arrays, with a pooled spectral axis. The spectrum itself is returned
+        if its spectral axis is already pooled or memory-mapped, or if it is
+        computed from a FITS WCS.
+    """
+    buffer = spectral_axis_buffer(spectrum)
+
+    if buffer is None or is_memory_mapped(buffer) or \
+            spectral_axis_pool.find(buffer) is not None:
+        return spectrum
+
+    # Viewing the lookup table avoids evaluating the WCS
+    spectral_axis = spectral_axis_view(spectrum)
+
+    if spectral_axis is None:
+        spectral_axis = spectrum.spectral_axis
+
+    if previous is not None and spectral_axis_pool.find(previous) is not None \
+            and previous.unit == spectral_axis.unit and \
+            np.array_equal(previous.value, spectral_axis.value):
+        pooled = previous
+    else:
+        pooled = intern_spectral_axis(spectral_axis)
+
+    return build_spectrum(spectrum.flux, pooled,
+                          uncertainty=spectrum.uncertainty,
+                          mask=spectrum.mask,
+                          meta=spectrum.meta,
+                          velocity_convention=spectrum.velocity_convention,
+                          rest_value=spectrum.rest_value)
@@ -0,0 +1,316 @@
+import numpy as np
+
+from .buffers import GrowableArray
+
+__all__ = ['EnvelopePyramid']
+
+
+def _reduce_blocks(func, values, factor):
+    """
+    Reduce consecutive blocks of ``factor`` elements with a NaN-ignoring
+    ufunc (e.g. `numpy.fmin`), padding the last block with NaN.
+    """
+    remainder = values.size % factor
+
+    if remainder:
+        values = np.append(values, np.full(factor - remainder, np.nan))
+
+    return func.reduce(values.reshape(-1, factor), axis=1)
+
+
+class EnvelopePyramid:
+    """
+    Multi-resolution min/max envelope of a curve drawn in step mode.
+
+    Level zero is the full resolution data. Each subsequent level stores, for
+    consecutive bins of ``factor`` times as many samples as the previous
+    level, the minimum and maximum of the values in the bin. Rendering the
+    level whose number of bins matches the pixel width of the view draws the
+    same envelope as the full data at a fraction of the cost.
+
+    The envelope of a band (e.g. the uncertainties around a curve) is built
+    by passing its lower bound as ``values`` and its upper bound as ``upper``.
+
+    Parameters
+    ----------
+    edges : `~numpy.ndarray`
+        The ``N + 1`` bin edges of the step-mode curve.
+    values : `~numpy.ndarray`
+        The ``N`` values of the step-mode curve, with ``N > 0``.
+    upper : `~numpy.ndarray`, optional
+        The ``N`` upper bounds of a band whose lower bounds are ``values``.
+    factor : int, optional
+        The reduction factor between two consecutive levels.
+    min_size : int, optional
+        No further levels are built once a level has at most this many bins.
+    """
+    def __init__(self, edges, values, upper=None, factor=4, min_size=1024):
+        self._factor = factor
+        self._min_size = min_size
+
+        # Each level is a tuple of (bin size in samples, minima, maxima). The
+        # minima and maxima of the reduced levels are views of growable
+        # buffers, so that levels can be updated in place as data streams in.
+        self._levels = []
+        self._buffers = []
+        self._order = None
+
+        self.update(edges, values, 0, np.size(values), upper=upper)
+
+    def update(self, edges, values, start, stop, upper=None):
+        """
+        Update the pyramid after the samples in ``[start, stop)`` were
+        modified or appended. Only the bins of each level covering these
+        samples are recomputed, and new levels are added as needed.
+
+        Parameters
+        ----------
+        edges : `~numpy.ndarray`
+            The new ``N + 1`` bin edges.
+        values : `~numpy.ndarray`
+            The new ``N`` values, with ``N`` at least the previous size.
+        start, stop : int
+            The range of modified samples. Samples beyond the previous size
+            must be included.
+        upper : `~numpy.ndarray`, optional
+            The new ``N`` upper bounds of the band, if any.
+        """
+        factor = self._factor
+        first = 0 if self._order is None else start
+
+        self._edges = np.asarray(edges, dtype=float)
+        self._values = np.asarray(values, dtype=float)
+
+        upper = self._values if upper is None else \
+            np.asarray(upper, dtype=float)
+
+        self._levels[:1] = [(1, self._values, upper)]
+
+        mins, maxs = self._values, upper
+        bin_size = 1
+        level = 1
+
+        while mins.size > self._min_size:
+            # Bins of this level covering the modified bins of the previous
+            # level. New levels are computed in full.
+            if level > len(self._buffers):
+                self._buffers.append((GrowableArray(), GrowableArray()))
+                start, stop = 0, mins.size
+
+            start, stop = start // factor, -(-stop // factor)
+            size = -(-mins.size // factor)
+
+            lower_buffer, upper_buffer = self._buffers[level - 1]
+            lower_buffer.resize(size)
+            upper_buffer.resize(size)
+
+            lower_buffer.array[start:stop] = _reduce_blocks(
+                np.fmin, mins[start * factor:stop * factor], factor)
+            upper_buffer.array[start:stop] = _reduce_blocks(
+                np.fmax, maxs[start * factor:stop * factor], factor)
+
+            mins, maxs = lower_buffer.array, upper_buffer.array
+            bin_size *= factor
+
+            self._levels[level:level + 1] = [(bin_size, mins, maxs)]
+            level += 1
+
+        # Clipping to the view relies on sorted edges. Spectral axes are
+        # either increasing (e.g. wavelength) or decreasing (e.g. frequency
+        # converted from wavelength), anything else is never clipped. Only
+        # the modified edges need checking against the known order.
+        with np.errstate(invalid='ignore'):
+            diff = np.diff(self._edges[max(first - 1, 0):])
+
+        increasing, decreasing = np.all(diff >= 0), np.all(diff <= 0)
+
+        if self._order is None:
+            self._order = 1 if increasing else -1 if decreasing else 0
+        elif not (self._order > 0 and increasing or
+                  self._order < 0 and decreasing):
+            self._order = 0
+
+        with np.errstate(invalid='ignore'):
+            edges = self._edges[first:]
+            x_bounds = (np.nanmin(edges), np.nanmax(edges))
+
+            if first > 0:
+                x_bounds = (np.fmin(self._x_bounds[0], x_bounds[0]),
+                            np.fmax(self._x_bounds[1], x_bounds[1]))
+
+            self._x_bounds = x_bounds
+            self._y_bounds = (np.nanmin(self._levels[-1][1]),
+                              np.nanmax(self._levels[-1][2]))
+
+    @property
+    def size(self):
+        """The number of full resolution samples."""
+        return self._values.size
+
+    @property
+    def levels(self):
+        """The number of levels, including the full resolution level."""
+        return len(self._levels)
+
+    def _index_range(self, x_range):
+        """
+        Convert a range in data coordinates into a ``(start, stop)`` range of
+        full resolution sample indices.
+        """
+        if x_range is None or self._order == 0:
+            return 0, self.size
+
+        x_min, x_max = sorted(x_range)
+
+        if self._order > 0:
+            start = np.searchsorted(self._edges, x_min, side='left') - 1
+            stop = np.searchsorted(self._edges, x_max, side='right')
+        else:
+            # Search the reversed (increasing) edges and map the indices back
+            n = self._edges.size
+            edges = self._edges[::-1]
+            start = n - 1 - np.searchsorted(edges, x_max, side='right')
+            stop = n - np.searchsorted(edges, x_min, side='left')
+
+        return int(max(start, 0)), int(min(max(stop, 0), self.size))
+
+    def window(self, x_range=None, max_bins=2000, pad=True):
+        """
+        Select the level and range of bins to draw for a given view.
+
+        Parameters
+        ----------
+        x_range : tuple, optional
+            The visible ``(min, max)`` range in data coordinates. If `None`,
+            the whole curve is considered visible.
+        max_bins : int, optional
+            The maximum number of bins to draw over the visible range,
+            typically the width of the view in pixels.
+        pad : bool, optional
+            Pad the range by the visible width on either side so that small
+            pans do not require selecting a new window.
+
+        Returns
+        -------
+        tuple
+            ``(level, start, stop)`` where ``start`` and ``stop`` are bin
+            indices in the selected level.
+        """
+        start, stop = self._index_range(x_range)
+        visible = max(stop - start, 1)
+
+        level = 0
+
+        while level + 1 < self.levels and \
+                visible / self._levels[level][0] > max_bins:
+            level += 1
+
+        bin_size = self._levels[level][0]
+        n_bins = self._levels[level][1].size
+
+        if pad:
+            start, stop = start - visible, stop + visible
+
+        # Snap to the bin boundaries of the selected level
+        start = max(start, 0) // bin_size
+        stop = min(-(-stop // bin_size), n_bins)
+
+        return level, int(start), int(max(stop, start))
+
+    def data(self, level, start, stop):
+        """
+        Generate the step-mode arrays to draw for a window.
+
+        Parameters
+        ----------
+        level : int
+            The level to draw.
+        start, stop : int
+            The range of bins of the level to draw.
+
+        Returns
+        -------
+        x, y : `~numpy.ndarray`
+            The edges and values to pass to a step-mode curve, with
+            ``len(x) == len(y) + 1``.
+        """
+        bin_size, mins, maxs = self._levels[level]
+
+        if stop <= start:
+            return np.array([0., 0.]), np.array([np.nan])
+
+        if bin_size == 1 and mins is maxs:
+            return self._edges[start:stop + 1], self._values[start:stop]
+
+        # Edges of each bin in the full resolution edge array
+        indices = np.minimum(np.arange(start, stop + 1) * bin_size, self.size)
+        edges = self._edges[indices]
+
+        # Split each bin in two steps, one at the minimum and one at the
+        # maximum. The vertical segment joining the steps spans the envelope.
+        x = np.empty(2 * (stop - start) + 1)
+        x[0:-1:2] = edges[:-1]
+        x[1::2] = 0.5 * (edges[:-1] + edges[1:])
+        x[-1] = edges[-1]
+
+        y = np.empty(2 * (stop - start))
+        y[0::2] = mins[start:stop]
+        y[1::2] = maxs[start:stop]
+
+        return x, y
+
+    def band(self, level, start, stop):
+        """
+        Generate the per-bin envelope of a window.
+
+        Parameters
+        ----------
+        level : int
+            The level to draw.
+        start, stop : int
+            The range of bins of the level to draw.
+
+        Returns
+        -------
+        edges, lower, upper : `~numpy.ndarray`
+            The ``n + 1`` edges and the ``n`` lower and upper bounds of the
+            bins in the window.
+        """
+        bin_size, mins, maxs = self._levels[level]
+        stop = max(stop, start)
+
+        indices = np.minimum(np.arange(start, stop + 1) * bin_size, self.size)
+
+        return self._edges[indices], mins[start:stop], maxs[start:stop]
+
+    def bounds(self, axis, x_range=None):
+        """
+        The data bounds along an axis.
+
+        Parameters
+        ----------
+        axis : int
+            ``0`` for the x axis, ``1`` for the y axis.
+        x_range : tuple, optional
+            When computing the y bounds, restrict them to the samples within
+            this range in data coordinates.
+
+        Returns
+        -------
+        tuple
+            The ``(min, max)`` bounds.
+        """
+        if axis == 0:
+            return self._x_bounds
+
+        if x_range is None:
+            return self._y_bounds
+
+        level, start, stop = self.window(x_range, max_bins=4096, pad=False)
+        _, mins, maxs = self._levels[level]
+
+        if stop <= start:
+            return None, None
+
+        with np.errstate(invalid='ignore'):
+            return (np.nanmin(mins[start:stop]), np.nanmax(maxs[start:stop]))
@@ -0,0 +1,105 @@
+from enum import IntFlag
+
+from qtpy.QtCore import QObject, QTimer, Signal
+
+__all__ = ['WorkspaceChange', 'WorkspaceEventBus']
+
+
+class WorkspaceChange(IntFlag):
+    """
+    The kinds of workspace changes reported by the `WorkspaceEventBus`,
+    combined into a change mask.
+    """
+    #: Data items were added, removed or modified
+    DATA = 1
+    #: The current or selected data item changed
+    SELECTION = 2
+    #: A plot window was added or activated
+    PLOT_WINDOW = 4
+    #: Data items were added to or removed from a plot
+    PLOTS = 8
+    #: A region of interest was moved or removed
+    ROI = 16
+    #: The display units of a plot changed
+    UNITS = 32
+
+
+class WorkspaceEventBus(QObject):
+    """
+    Coalesces the bursts of workspace signals fired by a single user action
+    into one notification.
+
+    Changes reported with `WorkspaceEventBus.notify` are accumulated until
+    control returns to the event loop, and then delivered once through
+    `WorkspaceEventBus.state_changed` with the mask of all the kinds of
+    changes that occurred. Consumers refreshing on the state of the workspace
+    (e.g. the statistics of the current item) thereby refresh once per user
+    action, rather than once per signal.
+
+    Attributes
+    ----------
+    state_changed : ``qtpy.QtCore.Signal``
+        Fired with the `WorkspaceChange` mask of the changes accumulated
+        since the last notification.
+    """
+    state_changed = Signal(int)
+
+    def __init__(self, *args, **kwargs):
+        super(WorkspaceEventBus, self).__init__(*args, **kwargs)
+
+        self._pending = WorkspaceChange(0)
+
+        self._timer = QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.setInterval(0)
+        self._timer.timeout.connect(self.flush)
+
+    @property
+    def pending(self):
+        """
+        The mask of the changes not delivered yet.
+        """
+        return self._pending
+
+    def notify(self, change):
+        """
+        Report a change, delivered with the other changes reported during the
+        same event loop iteration.
+
+        Parameters
+        ----------
+        change : `WorkspaceChange`
+            The kind(s) of change.
+        """
+        self._pending |= change
+
+        if not self._timer.isActive():
+            self._timer.start()
+
+    def notifier(self, change):
+        """
+        Create a slot reporting a change whatever the arguments it is called
+        with, to connect signals to the bus.
+
+        Parameters
+        ----------
+        change : `WorkspaceChange`
+            The kind(s) of change reported by the slot.
+
+        Returns
+        -------
+        callable
+            The slot.
+        """
+        return lambda *args: self.notify(change)
+
+    def flush(self):
+        """
+        Deliver the pending changes immediately, if any.
+        """
+        self._timer.stop()
+
+        pending, self._pending = self._pending, WorkspaceChange(0)
+
+        if pending:
+            self.state_changed.emit(int(pending))
@@ -0,0 +1,264 @@
+import os
+import re
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+import astropy.units as u
+from astropy.io import fits
+from astropy.table import QTable
+
+__all__ = ['EXPORT_FORMATS', 'write_fits', 'write_hdf5', 'write_ecsv',
+           'export_spectrum', 'export_spectra', 'format_from_path']
+
+
+def _columns(spectrum):
+    """
+    The columns of a spectrum, referencing its arrays rather than copying
+    them. Missing uncertainties and masks are omitted.
+    """
+    columns = OrderedDict([('spectral_axis', spectrum.spectral_axis),
+                           ('flux', spectrum.flux)])
+
+    uncertainty = spectrum.uncertainty
+
+    if uncertainty is not None:
+        columns['uncertainty'] = u.Quantity(uncertainty.array,
+                                            uncertainty.unit, copy=False)
+
+    if spectrum.mask is not None:
+        columns['mask'] = spectrum.mask
+
+    return columns
+
+
+def _header(spectrum):
+    """
+    The header stored in the meta data of a spectrum as a FITS header, with
+    the entries that cannot be represented in FITS dropped.
+    """
+    header = fits.Header()
+    meta = spectrum.meta or {}
+
+    for key, value in dict(meta.get('header') or {}).items():
+        try:
+            header[key] = value
+        except (ValueError, TypeError, KeyError):
+            pass
+
+    return header
+
+
+def write_fits(spectrum, path):
+    """
+    Write a spectrum to a FITS file, as a binary table extension holding the
+    spectral axis, flux, uncertainty and mask columns with their units. The
+    header of the spectrum, if any, is written to the primary HDU.
+
+    Parameters
+    ----------
+    spectrum : :class:`~specutils.Spectrum1D`
+        The spectrum to write.
+    path : str
+        The path of the file, overwritten if it exists.
+    """
+    table = fits.table_to_hdu(QTable(_columns(spectrum), copy=False))
+    primary = fits.PrimaryHDU(header=_header(spectrum))
+
+    fits.HDUList([primary, table]).writeto(path, overwrite=True)
+
+
+def write_hdf5(spectrum, path):
+    """
+    Write a spectrum to an HDF5 file, with one dataset per column holding its
+    unit as an attribute. Each dataset is written directly from the array of
+    the spectrum. The header of the spectrum, if any, is stored as a FITS
+    header string in the ``header`` attribute of the file.
+
+    Parameters
+    ----------
+    spectrum : :class:`~specutils.Spectrum1D`
+        The spectrum to write.
+    path : str
+        The path of the file, overwritten if it exists.
+
+    Raises
+    ------
+    ImportError
+        If h5py is not installed.
+    """
+    try:
+        import h5py
+    except ImportError:
+        raise ImportError("h5py is required to export spectra to HDF5.")
+
+    with h5py.File(path, 'w') as f:
+        for name, column in _columns(spectrum).items():
+            dataset = f.create_dataset(name, data=getattr(column, 'value',
+                                                          column))
+
+            if isinstance(column, u.Quantity):
+                dataset.attrs['unit'] = column.unit.to_string()
+
+        header = _header(spectrum)
+
+        if len(header) > 0:
+            f.attrs['header'] = header.tostring()
+
+
+def write_ecsv(spectrum, path):
+    """
+    Write a spectrum to an ECSV file, with one column per array and the
+    header of the spectrum, if any, in the table meta data.
+
+    Parameters
+    ----------
+    spectrum : :class:`~specutils.Spectrum1D`
+        The spectrum to write.
+    path : str
+        The path of the file, overwritten if it exists.
+    """
+    meta = {}
+
+    if spectrum.meta is not None and 'header' in spectrum.meta:
+        meta['header'] = {k: v for k, v in spectrum.meta['header'].items()}
+
+    QTable(_columns(spectrum), meta=meta, copy=False).write(
+        path, format='ascii.ecsv', overwrite=True)
+
+
+#: The export formats, as a mapping of file dialog filter patterns to the
+#: functions writing spectra in these formats
+EXPORT_FORMATS = OrderedDict([
+    ('*.fits', write_fits),
+    ('*.hdf5', write_hdf5),
+    ('*.ecsv', write_ecsv)
+])
+
+
+def format_from_path(path):
+    """
+    Find the export format matching the extension of a path.
+
+    Parameters
+    ----------
+    path : str
+        The path of the file to export to.
+
+    Returns
+    -------
+    str or `None`
+        The key of the matching format in `EXPORT_FORMATS`, or `None` if no
+        format matches.
+    """
+    extension = os.path.splitext(path)[1].lower()
+
+    if extension in ('.fit', '.fits'):
+        return '*.fits'
+    elif extension in ('.h5', '.hdf5'):
+        return '*.hdf5'
+    elif extension == '.ecsv':
+        return '*.ecsv'
+
+
+def export_spectrum(spectrum, path, fmt=None):
+    """
+    Write a spectrum to a file.
+
+    Parameters
+    ----------
+    spectrum : :class:`~specutils.Spectrum1D`
+        The spectrum to write.
+    path : str
+        The path of the file, overwritten if it exists.
+    fmt : str, optional
+        The key of the format in `EXPORT_FORMATS`. Defaults to the format
+        matching the extension of the path.
+
+    Raises
+    ------
+    ValueError
+        If the format is unknown.
+    """
+    fmt = fmt or format_from_path(path)
+
+    if fmt not in EXPORT_FORMATS:
+        raise ValueError("Unknown export format '{}', must be one of "
+                         "{}.".format(fmt, list(EXPORT_FORMATS)))
+
+    EXPORT_FORMATS[fmt](spectrum, path)
+
+
+def _file_names(names, extension):
+    """
+    Derive unique file names from display names.
+    """
+    used = set()
+    file_names = []
+
+    for name in names:
+        base = re.sub(r'[^\w.+-]+', '_', name).strip('_.') or 'spectrum'
+        file_name = base + extension
+        count = 1
+
+        while file_name.lower() in used:
+            file_name = "{}-{}{}".format(base, count, extension)
+            count += 1
+
+        used.add(file_name.lower())
+        file_names.append(file_name)
+
+    return file_names
+
+
+def export_spectra(specs_by_name, directory, fmt, max_workers=None):
+    """
+    Write many spectra to a directory in parallel, in a pool of threads.
+
+    Parameters
+    ----------
+    specs_by_name : dict or iterable
+        A mapping of display names to :class:`~specutils.Spectrum1D`
+        objects, or an iterable of ``(name, spectrum)`` pairs. The file names are
+        derived from the display names, and made unique.
+    directory : str
+        The directory to write the files to, created if it does not exist.
+    fmt : str
+        The key of the format in `EXPORT_FORMATS`.
+    max_workers : int, optional
+        The number of threads. Defaults to the executor's default.
+
+    Yields
+    ------
+    tuple
+        ``(path, exception)`` for each spectrum, in the order the files are
+        written, where the exception raised while writing the file is `None`
+        if the file was written.
+    """
+    if fmt not in EXPORT_FORMATS:
+        raise ValueError("Unknown export format '{}', must be one of "
+                         "{}.".format(fmt, list(EXPORT_FORMATS)))
+
+    if isinstance(specs_by_name, dict):
+        specs_by_name = specs_by_name.items()
+
+    # Generators are always true, consume them before testing for emptiness
+    specs_by_name = list(specs_by_name)
+
+    names, spectra = zip(*specs_by_name) if specs_by_name else ((), ())
+
+    os.makedirs(directory, exist_ok=True)
+
+    paths = [os.path.join(directory, file_name)
+             for file_name in _file_names(names, fmt[1:])]
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = {executor.submit(EXPORT_FORMATS[fmt], spectrum, path): path
+                   for path, spectrum in zip(paths, spectra)}
+
+        try:
+            for future in as_completed(futures):
+                yield futures[future], future.exception()
+        finally:
+            # Stop writing the remaining files if the caller stops iterating
+            for future in futures:
+                future.cancel()
@@ -28,6 +28,11 @@ class Hub:
         """The active workspace."""
         return self._workspace
 
+    @property
+    def event_bus(self):
+        """The event bus of the active workspace."""
+        return self.workspace.event_bus
+
     @property
     def model(self):
         """The data item model of the active workspace."""
@@ -158,6 +163,46 @@ class Hub:
             logging.error("Data item model only accepts items of class "
                           "'DataItem', received '{}'.".format(type(data_item)))
 
+    def append_data_items(self, data_items):
+        """
+        Adds several data item objects to the left data list view in a single
+        model insertion.
+
+        Parameters
+        ----------
+        data_items : list
+            The :class:`~specviz.core.items.DataItem` objects to be added to
+            the list view.
+        """
+        invalid = [x for x in data_items if not isinstance(x, DataItem)]
+
+        if len(invalid) > 0:
+            logging.error("Data item model only accepts items of class "
+                          "'DataItem', received '{}'.".format(
+                              ", ".join({type(x).__name__ for x in invalid})))
+            return
+
+        return self.workspace.model.append_data_items(data_items)
+
+    def add_data_batch(self, specs):
+        """
+        Generates data items for several spectra and adds them to the data
+        list view in a single model insertion.
+
+        Parameters
+        ----------
+        specs : dict or iterable
+            Either a mapping of display names to
+            :class:`~specutils.Spectrum1D` objects, or an iterable of
+            ``(spectrum, name)`` pairs.
+
+        Returns
+        -------
+        list
+            The newly created :class:`~specviz.core.items.DataItem` objects.
+        """
+        return self.workspace.model.add_data_batch(specs)
+
     def plot_data_item_from_data_item(self, data_item):
         """
         Returns the PlotDataItem associated with the provided DataItem.
@@ -1,3 +1,4 @@
+from functools import lru_cache
 from itertools import cycle
 
 import astropy.units as u
@@ -6,8 +7,13 @@ import pyqtgraph as pg
 from astropy.units import spectral, spectral_density
 from qtpy.QtCore import Qt, Signal
 from qtpy.QtGui import QStandardItem, QColor
+from specutils import Spectrum1D
 
-__all__ = ['DataItem', 'PlotDataItem']
+from .buffers import (ConvertedArrayStore, GrowableArray,
+                      share_spectral_axis, spectral_axis_view)
+from .decimation import EnvelopePyramid
+
+__all__ = ['DataItem', 'PlotItemDescriptor', 'PlotDataItem']
 
 
 flatui = cycle(["#000000", "#9b59b6", "#3498db", "#95a5a6", "#e74c3c",
@@ -31,6 +37,17 @@ class DataItem(QStandardItem):
     ----------
     data_changed : ``Signal``
         Fired when the internal stored data is changed.
+    data_version : int
+        Counter incremented every time the stored data is changed. Consumers
+        caching values derived from the data use it to detect staleness.
+
+    Notes
+    -----
+        Spectra that grow or change piecewise, such as a live readout, are
+        updated with `DataItem.append` and `DataItem.patch` rather than by
+        replacing the whole spectrum. The arrays are then held in growable
+        buffers, and the model's ``data_range_changed`` signal reports the
+        range of samples that changed so that views only redraw that span.
     """
     NameRole = Qt.UserRole + 1
     IdRole = Qt.UserRole + 2
@@ -39,6 +56,17 @@ class DataItem(QStandardItem):
     def __init__(self, name, identifier, data, *args, **kwargs):
         super(DataItem, self).__init__(*args, **kwargs)
 
+        self._data_version = 0
+
+        # The pooled spectral axis and the data version it was pooled for
+        self._spectral_axis = None
+        self._spectral_axis_version = None
+
+        # Growable buffers of the arrays of a streamed spectrum, and the
+        # spectrum last built from them
+        self._stream = None
+        self._stream_spectrum = None
+
         self.setData(name, self.NameRole)
         self.setData(identifier, self.IdRole)
         self.setData(data, self.DataRole)
@@ -75,8 +103,30 @@ class DataItem(QStandardItem):
     def spectral_axis(self):
         """
         The spectral axis of the stored :class:`~specutils.Spectrum1D` object.
+
+        Spectra are rebuilt around the spectral axis interned in the shared
+        `~specviz.core.buffers.spectral_axis_pool` when added to a model or
+        set with `set_data`, so data items with identical spectral axes return
+        the same read-only quantity. Memory-mapped spectral axes are viewed
+        from the file mapped by the storage backend instead. Reading this
+        property never modifies the stored spectrum.
         """
-        return self.data(self.DataRole).spectral_axis
+        if self._spectral_axis_version != self._data_version:
+            spectrum = self.spectrum
+            spectral_axis = None
+
+            # The spectral axis of a streamed spectrum changes with every
+            # update, and is not shared
+            if self._stream is None:
+                spectral_axis = spectral_axis_view(spectrum)
+
+            if spectral_axis is None:
+                spectral_axis = spectrum.spectral_axis
+
+            self._spectral_axis = spectral_axis
+            self._spectral_axis_version = self._data_version
+
+        return self._spectral_axis
 
     @property
     def uncertainty(self):
@@ -86,12 +136,210 @@ class DataItem(QStandardItem):
         """
         return self.data(self.DataRole).uncertainty
 
+    @property
+    def data_version(self):
+        """
+        A counter that is incremented each time the stored data changes.
+        """
+        return self._data_version
+
+    def setData(self, value, role=Qt.UserRole + 1):
+        """
+        Overrides the Qt method to bump the data version whenever the stored
+        spectrum is replaced. Changes to any other role (e.g. the name or the
+        check state) leave the version untouched.
+        """
+        if role == self.DataRole:
+            self._data_version += 1
+
+            # Replacing the whole spectrum ends any stream
+            if value is not self._stream_spectrum:
+                self._stream = None
+                self._stream_spectrum = None
+
+        super(DataItem, self).setData(value, role)
+
     def set_data(self, data):
         """
-        Update the stored :class:`~specutils.Spectrum1D` data values.
+        Update the stored :class:`~specutils.Spectrum1D` data values. The
+        spectrum is rebuilt around the pooled copy of its spectral axis,
+        which is only interned again if it differs from the previous one.
         """
-        self.setData(data, self.DataRole)
-        self.emitDataChanged()
+        self.setData(share_spectral_axis(data, previous=self._spectral_axis),
+                     self.DataRole)
+
+    def _stream_buffers(self):
+        """
+        Retrieve the growable buffers of the streamed spectrum, copying the
+        arrays of the stored spectrum into new buffers when streaming starts.
+        """
+        if self._stream is None:
+            spectrum = self.spectrum
+            uncertainty = spectrum.uncertainty
+
+            self._stream = {
+                'flux': (GrowableArray(spectrum.flux.value),
+                         spectrum.flux.unit),
+                'spectral_axis': (GrowableArray(spectrum.spectral_axis.value),
+                                  spectrum.spectral_axis.unit)}
+
+            if uncertainty is not None:
+                self._stream['uncertainty'] = (
+                    GrowableArray(uncertainty.array), uncertainty.unit)
+
+            if spectrum.mask is not None:
+                self._stream['mask'] = (GrowableArray(spectrum.mask), None)
+
+        return self._stream
+
+    def _commit_stream(self, start, stop):
+        """
+        Store a spectrum built from the stream buffers, and notify the model
+        that the samples in ``[start, stop)`` changed.
+        """
+        stream = self._stream
+        spectrum = self.spectrum
+
+        def quantity(kind):
+            values, unit = stream[kind]
+
+            return u.Quantity(values.array, unit, copy=False)
+
+        uncertainty = None
+
+        if 'uncertainty' in stream:
+            uncertainty = spectrum.uncertainty.__class__(
+                stream['uncertainty'][0].array,
+                unit=stream['uncertainty'][1], copy=False)
+
+        self._stream_spectrum = Spectrum1D(
+            flux=quantity('flux'), spectral_axis=quantity('spectral_axis'),
+            uncertainty=uncertainty,
+            mask=stream['mask'][0].array if 'mask' in stream else None,
+            meta=spectrum.meta)
+
+        # The generic item change signals would make every view redraw the
+        # whole spectrum, they are replaced by the range signal below
+        model = self.model()
+        blocked = model is not None and model.blockSignals(True)
+
+        try:
+            self.setData(self._stream_spectrum, self.DataRole)
+        finally:
+            if model is not None:
+                model.blockSignals(blocked)
+
+        if hasattr(model, 'data_range_changed'):
+            model.data_range_changed.emit(self, start, stop)
+
+    def append(self, flux, spectral_axis, uncertainty=None, mask=None):
+        """
+        Append samples to the end of the stored spectrum.
+
+        The arrays of the spectrum are copied into growable buffers the first
+        time it is appended to or patched, and held in memory from then on.
+        Subsequent updates take amortised constant time per sample.
+
+        Parameters
+        ----------
+        flux : `~astropy.units.Quantity` or array-like
+            The flux of the new samples. Plain arrays are assumed to be in the
+            flux unit of the stored spectrum.
+        spectral_axis : `~astropy.units.Quantity` or array-like
+            The spectral axis values of the new samples.
+        uncertainty : `~astropy.units.Quantity` or array-like, optional
+            The uncertainties of the new samples. Defaults to NaN if the
+            stored spectrum has uncertainties.
+        mask : array-like, optional
+            The mask of the new samples. Defaults to unmasked if the stored
+            spectrum has a mask.
+
+        Raises
+        ------
+        ValueError
+            If the arrays have different lengths, or if uncertainties are
+            given for a spectrum without uncertainties.
+        """
+        stream = self._stream_buffers()
+        values = {'flux': flux, 'spectral_axis': spectral_axis,
+                  'uncertainty': uncertainty, 'mask': mask}
+        size = np.size(flux)
+
+        if uncertainty is not None and 'uncertainty' not in stream:
+            raise ValueError("Cannot append uncertainties to a spectrum "
+                             "without uncertainties.")
+
+        for kind, (buffer, unit) in stream.items():
+            value = values[kind]
+
+            if value is None:
+                value = np.full(size, False if kind == 'mask' else np.nan)
+            elif kind != 'mask':
+                value = u.Quantity(value, unit).value
+
+            if np.size(value) != size:
+                raise ValueError("The appended {} has {} values, expected "
+                                 "{}.".format(kind, np.size(value), size))
+
+            values[kind] = value
+
+        start = len(stream['flux'][0])
+
+        for kind, (buffer, unit) in stream.items():
+            buffer.append(values[kind])
+
+        self._commit_stream(start, start + size)
+
+    def patch(self, key, flux=None, uncertainty=None, mask=None):
+        """
+        Replace the values of a range of samples of the stored spectrum, in
+        place.
+
+        Parameters
+        ----------
+        key : int or slice
+            The samples to replace.
+        flux : `~astropy.units.Quantity` or array-like, optional
+            The new flux values. Plain arrays are assumed to be in the flux
+            unit of the stored spectrum.
+        uncertainty : `~astropy.units.Quantity` or array-like, optional
+            The new uncertainties.
+        mask : array-like, optional
+            The new mask values.
+
+        Raises
+        ------
+        ValueError
+            If uncertainties or a mask are given for a spectrum without them.
+        """
+        stream = self._stream_buffers()
+        values = {'flux': flux, 'uncertainty': uncertainty, 'mask': mask}
+
+        indices = range(len(stream['flux'][0]))[key]
+
+        if isinstance(indices, int):
+            indices = range(indices, indices + 1)
+
+        if len(indices) == 0:
+            return
+
+        for kind, value in values.items():
+            if value is None:
+                continue
+
+            if kind not in stream:
+                raise ValueError("Cannot patch the {} of a spectrum without "
+                                 "{}.".format(kind, kind))
+
+            buffer, unit = stream[kind]
+
+            if kind != 'mask':
+                value = u.Quantity(value, unit).value
+
+            buffer.array[key] = value
+
+        self._commit_stream(min(indices[0], indices[-1]),
+                            max(indices[0], indices[-1]) + 1)
 
     @property
     def spectrum(self):
@@ -100,6 +348,184 @@ class DataItem(QStandardItem):
         """
         return self.data(self.DataRole)
 
+    def session_state(self):
+        """
+        Additional state of this data item saved in workspace sessions, along
+        with its name, identifier and spectrum. Subclasses deriving their data
+        from other objects (e.g. models) return what is needed to rebuild
+        them.
+
+        Returns
+        -------
+        dict
+            A picklable mapping.
+        """
+        return {}
+
+    @classmethod
+    def from_session_state(cls, name, identifier, data, state):
+        """
+        Rebuild a data item saved in a workspace session.
+
+        Parameters
+        ----------
+        name : str
+            The name of the data item.
+        identifier : :class:`uuid.UUID`
+            The UUID of the data item.
+        data : :class:`specutils.Spectrum1D`
+            The spectrum of the data item.
+        state : dict
+            The state returned by `DataItem.session_state`.
+
+        Returns
+        -------
+        `DataItem`
+            The restored data item.
+        """
+        return cls(name, identifier=identifier, data=data)
+
+
+@lru_cache(maxsize=None)
+def _is_data_unit_compatible(flux_unit, spectral_axis_unit, unit):
+    # The flux density equivalencies only depend on the unit of the spectral
+    # axis, not on its values, so a single representative value is enough.
+    return flux_unit.is_equivalent(
+        unit, equivalencies=spectral_density(1 * spectral_axis_unit))
+
+
+@lru_cache(maxsize=None)
+def _conversion_scale(from_unit, to_unit):
+    # Scale factor between linearly related units, or None if converting
+    # requires equivalencies (e.g. wavelength to frequency). Shared by all the
+    # items with the same source and display units.
+    try:
+        return from_unit.to(u.Unit(to_unit))
+    except u.UnitsError:
+        return None
+
+
+@lru_cache(maxsize=None)
+def _is_spectral_axis_unit_compatible(spectral_axis_unit, unit):
+    return spectral_axis_unit.is_equivalent(unit, equivalencies=spectral())
+
+
+class PlotItemDescriptor:
+    """
+    Lightweight display state of a `DataItem` in a plot window.
+
+    Plot windows keep one descriptor for every data item in the model, but
+    only build the (expensive) `PlotDataItem` graphics item once the data item
+    is first shown. The descriptor is then shared with the `PlotDataItem`, so
+    both always agree on the display state.
+
+    Parameters
+    ----------
+    data_item : `DataItem`
+        The data item described.
+    color : str or `~qtpy.QtGui.QColor`, optional
+        The display color. Defaults to the next color of the cycle.
+    """
+    def __init__(self, data_item, color=None):
+        self.data_item = data_item
+        self.data_unit = data_item.flux.unit.to_string()
+        self.spectral_axis_unit = data_item.spectral_axis.unit.to_string()
+        self.color = color or next(flatui)
+        self.width = 1
+        self.visible = False
+        self.uncertainty_mode = 'bars'
+
+        self._source_units = None
+        self._source_units_version = None
+
+    @property
+    def source_units(self):
+        """
+        The ``(flux unit, spectral axis unit)`` of the underlying
+        :class:`~specutils.Spectrum1D` object. Cached until the data changes.
+        """
+        version = self.data_item.data_version
+
+        if version != self._source_units_version:
+            self._source_units = (self.data_item.spectrum.flux.unit,
+                                  self.data_item.spectral_axis.unit)
+            self._source_units_version = version
+
+        return self._source_units
+
+    def reset_units(self):
+        """
+        Reset the display units for the spectral axis and the data to those of
+        the underlying :class:`~specutils.Spectrum1D` object.
+        """
+        self.data_unit = self.data_item.flux.unit.to_string()
+        self.spectral_axis_unit = self.data_item.spectral_axis.unit.to_string()
+
+    def are_units_compatible(self, spectral_axis_unit, data_unit):
+        """
+        Check whether the specified units are compatible with the spectral axis
+        and flux units of the underlying :class:`~specutils.Spectrum1D` object.
+
+        Parameters
+        ----------
+        spectral_axis_unit : `~astropy.units.Unit`
+            The spectral axis unit to test
+        data_unit : `~astropy.units.Unit`
+            The data unit to test
+
+        Returns
+        -------
+        bool
+            Returns `True` if the both the spectral axis and data units are
+            compatble with the underlying spectrum units, and `False` otherwise.
+        """
+        return self.is_data_unit_compatible(data_unit) and \
+            self.is_spectral_axis_unit_compatible(spectral_axis_unit)
+
+    def is_data_unit_compatible(self, unit):
+        """
+        Check whether the specified unit is compatible with the flux units of
+        the underlying :class:`~specutils.Spectrum1D` object.
+
+        Parameters
+        ----------
+        unit : `~astropy.units.Unit`
+            The data unit to test
+
+        Returns
+        -------
+        bool
+            Returns `True` if the specified data unit is compatible, `False`
+            otherwise.
+
+        Notes
+        -----
+            Results are cached per source and target units, so that spectra
+            sharing the same units are only checked once.
+        """
+        return (unit is not None and
+                _is_data_unit_compatible(*self.source_units, unit))
+
+    def is_spectral_axis_unit_compatible(self, unit):
+        """
+        Check whether the specified unit is compatible with the spectral axis
+        units of the underlying :class:`~specutils.Spectrum1D` object.
+
+        Parameters
+        ----------
+        unit : `~astropy.units.Unit`
+            The spectral axis unit to test
+
+        Returns
+        -------
+        bool
+            Returns `True` if the specified spectral axis unit is compatible,
+            `False` otherwise.
+        """
+        return (unit is not None and
+                _is_spectral_axis_unit_compatible(self.source_units[1],
+                                                  unit))
+
 
 class PlotDataItem(pg.PlotDataItem):
     """
@@ -113,39 +539,117 @@ class PlotDataItem(pg.PlotDataItem):
         signals raised from the data items within the model. Thus, if the
         data item for this plot data item is changed, users must call the
         ``set_data`` method on this class to re-render the plot.
+
+        The unit-converted flux, spectral axis and uncertainty arrays are
+        cached and shared by every consumer of this item. The cache is keyed
+        on the display unit and on the `DataItem.data_version`, so it is
+        invalidated as soon as the underlying data changes. The cached arrays
+        are read-only; copy them before modifying them in place. They are
+        also published to a `~specviz.core.buffers.ConvertedArrayStore`,
+        usually shared by all the plot windows of a workspace, so that plot
+        data items of the same data item in the same units, in different
+        plot windows, convert and hold the arrays only once.
+
+        The display state (color, width, visibility and units) is held by a
+        `PlotItemDescriptor`, which may be shared with the plot window that
+        created this item. The data is only converted and handed to PyQtGraph
+        once the item is visible; changes made while hidden mark the item as
+        stale and are applied when it is next shown.
+
+        Spectra longer than ``lod_threshold`` samples are not drawn at full
+        resolution. Instead, a min/max `~specviz.core.decimation.EnvelopePyramid`
+        is built once per data version and display units, and only the level
+        matching the pixel width of the view is drawn, clipped to the visible
+        range. The drawn envelope is identical to the full resolution curve.
+
+        Uncertainties are drawn either as error bars or as a shaded band (see
+        `PlotDataItem.uncertainty_mode`), from an envelope pyramid of the
+        ``flux - uncertainty`` and ``flux + uncertainty`` bounds. Their
+        geometry follows the same view-dependent decimation as the flux and
+        is only regenerated when the drawn window changes.
+
+        When the data item is appended to or patched, `update_range` only
+        converts the changed samples into growable copies of the cached
+        arrays, and only updates the bins of the envelope pyramids covering
+        them.
     """
+    #: Spectra with more samples than this are drawn from an envelope pyramid
+    lod_threshold = 2 ** 15
+
+    #: The available ways of drawing the uncertainties
+    uncertainty_modes = ('bars', 'band')
+
     data_unit_changed = Signal(str)
     spectral_axis_unit_changed = Signal(str)
     color_changed = Signal(QColor)
     width_changed = Signal(int)
     visibility_changed = Signal(bool)
 
-    def __init__(self, data_item, color=None, *args, **kwargs):
+    def __init__(self, data_item, color=None, descriptor=None, store=None,
+                 *args, **kwargs):
         super(PlotDataItem, self).__init__(stepMode=True, *args, **kwargs)
 
         self._data_item = data_item
-        self._data_unit = self._data_item.flux.unit.to_string()
-        self._spectral_axis_unit = self._data_item.spectral_axis.unit.to_string()
-        self._color = color or next(flatui)
-        self._width = 1
-        self._visible = False
-
-        # Include error bar item
-        self._error_bar_item = pg.ErrorBarItem(pen=[128, 128, 128, 200])
-
-        # Set data
-        self.set_data()
+        self._descriptor = descriptor or PlotItemDescriptor(data_item,
+                                                            color=color)
+
+        # Store of the converted arrays shared with the plot data items of
+        # the same data item in other plot windows
+        self._store = store if store is not None else ConvertedArrayStore()
+
+        # Unit-converted arrays, keyed by kind ('flux', 'spectral_axis',
+        # 'uncertainty', 'edges', 'envelope') and holding the display unit
+        # they were converted to. This keeps the arrays of the shared store
+        # alive while they are used. The whole cache is dropped when the data
+        # item version changes.
+        self._converted_arrays = {}
+        self._converted_version = None
+
+        # Growable copies of the cached arrays, kept while the data item is
+        # appended to or patched so that only the changed samples are
+        # converted. Dropped whenever the arrays are converted from scratch.
+        self._growable_arrays = {}
+
+        # The envelope window currently drawn and the arrays drawn for it
+        self._display_window = None
+        self._display_data = None
+
+        # The uncertainty items of each mode are only built when first
+        # requested, along with the envelope windows they currently draw
+        self._uncertainty_items = {}
+        self._uncertainty_windows = {}
+
+        # Set while the units are changed in a single transaction, during which
+        # the unit change signals must not redraw the item again
+        self._setting_units = False
+
+        # Set data, unless hidden in which case it is deferred until shown
+        self._stale = True
+        self._update_data()
         self._update_pen()
 
         # Connect slots to data item signals
-        self.data_unit_changed.connect(self.set_data)
-        self.spectral_axis_unit_changed.connect(self.set_data)
+        self.data_unit_changed.connect(self._on_units_changed)
+        self.spectral_axis_unit_changed.connect(self._on_units_changed)
 
         # Connect to color signals
         self.color_changed.connect(self._update_pen)
+        self.color_changed.connect(self._update_band_brush)
         self.width_changed.connect(self._update_pen)
+        self.visibility_changed.connect(self._update_data)
         self.visibility_changed.connect(self._update_pen)
 
+    def _on_units_changed(self, *args):
+        if self._setting_units:
+            return
+
+        self._stale = True
+        self._update_data()
+
+    def _update_data(self, *args):
+        if self.visible and self._stale:
+            self.set_data()
+
     def _update_pen(self, *args):
         if self.visible:
             self.setPen(color=self.color, width=float(self.width))
@@ -159,18 +663,50 @@ class PlotDataItem(pg.PlotDataItem):
         """
         return self._data_item
 
+    @property
+    def descriptor(self):
+        """
+        The `PlotItemDescriptor` holding the display state of this item.
+        """
+        return self._descriptor
+
     @property
     def data_unit(self):
         """
         The unit to use for displaying the flux values in the underlying
         :class:`~specutils.Spectrum1D` object.
         """
-        return self._data_unit
+        return self._descriptor.data_unit
 
     @data_unit.setter
     def data_unit(self, value):
-        self._data_unit = value
-        self.data_unit_changed.emit(self._data_unit)
+        self._descriptor.data_unit = value
+        self.data_unit_changed.emit(self._descriptor.data_unit)
+
+    @property
+    def uncertainty_mode(self):
+        """
+        How the uncertainties are drawn, either as error bars (``'bars'``) or
+        as a shaded band (``'band'``).
+        """
+        return self._descriptor.uncertainty_mode
+
+    @uncertainty_mode.setter
+    def uncertainty_mode(self, value):
+        if value not in self.uncertainty_modes:
+            raise ValueError("Uncertainty mode must be one of {}, not "
+                             "'{}'.".format(self.uncertainty_modes, value))
+
+        self._descriptor.uncertainty_mode = value
+
+    @property
+    def uncertainty_item(self):
+        """
+        The PyQtGraph item representing the uncertainties in the underlying
+        :class:`~specutils.Spectrum1D` object, drawn according to the current
+        `uncertainty_mode`.
+        """
+        return self._uncertainty_item(self.uncertainty_mode)
 
     @property
     def error_bar_item(self):
@@ -178,81 +714,113 @@ class PlotDataItem(pg.PlotDataItem):
         A PyQtGraph `~pyqtgraph.ErrorBarItem` to represent the uncertainties
         in the underlying :class:`~specutils.Spectrum1D` object.
         """
-        spectral_axis = self.spectral_axis
+        return self._uncertainty_item('bars')
 
-        # If step mode is one, offset the error bars by a half delta so that
-        # they cross the middle of the bin.
-        if self.opts.get('stepMode'):
-            diff = np.diff(spectral_axis)
-            spectral_axis += np.append(diff, diff[-1]) * 0.5
+    def _uncertainty_item(self, mode):
+        item = self._uncertainty_items.get(mode)
+
+        if item is None:
+            if mode == 'band':
+                item = pg.FillBetweenItem(pg.PlotCurveItem(),
+                                          pg.PlotCurveItem())
+            else:
+                item = pg.ErrorBarItem(pen=[128, 128, 128, 200])
 
-        self._error_bar_item.setData(x=spectral_axis,
-                                     y=self.flux,
-                                     height=self.uncertainty)
+            self._uncertainty_items[mode] = item
+            self._update_band_brush()
 
-        return self._error_bar_item
+        self._update_uncertainty_items()
+
+        return item
+
+    @property
+    def uncertainty_envelope(self):
+        """
+        The `~specviz.core.decimation.EnvelopePyramid` of the band spanned by
+        the uncertainties around the flux, or `None` if there are no
+        uncertainties.
+        """
+        if self.xData is None or self.yData is None or \
+                self.uncertainty is None:
+            return
+
+        def build():
+            uncertainty = self.uncertainty
+
+            return EnvelopePyramid(self.xData, self.yData - uncertainty,
+                                   upper=self.yData + uncertainty)
+
+        return self._converted('uncertainty_envelope',
+                               (self.spectral_axis_unit, self.data_unit),
+                               build)
+
+    def _update_uncertainty_items(self, force=False):
+        """
+        Regenerate the geometry of the uncertainty items whose envelope window
+        to draw has changed.
+        """
+        if len(self._uncertainty_items) == 0:
+            return
+
+        envelope = self.uncertainty_envelope
+
+        if envelope is None:
+            return
+
+        for mode, item in self._uncertainty_items.items():
+            current = self._uncertainty_windows.get(mode)
+            window = self._envelope_window(envelope, current)
+
+            if window == current and not force:
+                continue
+
+            self._uncertainty_windows[mode] = window
+            edges, lower, upper = envelope.band(*window)
+
+            if mode == 'band':
+                item.curves[0].setData(x=edges, y=lower, stepMode=True)
+                item.curves[1].setData(x=edges, y=upper, stepMode=True)
+            else:
+                # Bars cross the middle of each bin
+                item.setData(x=0.5 * (edges[:-1] + edges[1:]),
+                             y=0.5 * (lower + upper),
+                             height=upper - lower)
+
+    def _update_band_brush(self, *args):
+        item = self._uncertainty_items.get('band')
+
+        if item is not None:
+            color = QColor(self.color)
+            color.setAlpha(64)
+            item.setBrush(color)
 
     def are_units_compatible(self, spectral_axis_unit, data_unit):
         """
         Check whether the specified units are compatible with the spectral axis
         and flux units of the underlying :class:`~specutils.Spectrum1D` object.
 
-        Parameters
-        ----------
-        spectral_axis_unit : `~astropy.units.Unit`
-            The spectral axis unit to test
-        data_unit : `~astropy.units.Unit`
-            The data unit to test
-
-        Returns
-        -------
-        bool
-            Returns `True` if the both the spectral axis and data units are
-            compatble with the underlying spectrum units, and `False` otherwise.
+        See `PlotItemDescriptor.are_units_compatible`.
         """
-        return self.is_data_unit_compatible(data_unit) and \
-            self.is_spectral_axis_unit_compatible(spectral_axis_unit)
+        return self._descriptor.are_units_compatible(spectral_axis_unit,
+                                                     data_unit)
 
     def is_data_unit_compatible(self, unit):
         """
         Check whether the specified unit is compatible with the flux units of
         the underlying :class:`~specutils.Spectrum1D` object.
 
-        Parameters
-        ----------
-        unit : `~astropy.units.Unit`
-            The data unit to test
-
-        Returns
-        -------
-        bool
-            Returns `True` if the specified data unit is compatible, `False`
-            otherwise.
+        See `PlotItemDescriptor.is_data_unit_compatible`.
         """
-        return (unit is not None and
-                self.data_item.flux.unit.is_equivalent(
-                    unit, equivalencies=spectral_density(
-                        self.data_item.spectral_axis)))
+        return self._descriptor.is_data_unit_compatible(unit)
 
     def is_spectral_axis_unit_compatible(self, unit):
         """
         Check whether the specified unit is compatible with the spectral axis
         units of the underlying :class:`~specutils.Spectrum1D` object.
 
-        Parameters
-        ----------
-        unit : `~astropy.units.Unit`
-            The spectral axis unit to test
-
-        Returns
-        -------
-        bool
-            Returns `True` if the specified spectral axis unit is compatible,
-            `False` otherwise.
+        See `PlotItemDescriptor.is_spectral_axis_unit_compatible`.
         """
-        return (unit is not None and
-                self.data_item.spectral_axis.unit.is_equivalent(
-                    unit, equivalencies=spectral()))
+        return self._descriptor.is_spectral_axis_unit_compatible(unit)
 
     @property
     def spectral_axis_unit(self):
@@ -260,23 +828,146 @@ class PlotDataItem(pg.PlotDataItem):
         The unit to use for displaying the spectral axis in the underlying
         :class:`~specutils.Spectrum1D` object.
         """
-        return self._spectral_axis_unit
+        return self._descriptor.spectral_axis_unit
 
     @spectral_axis_unit.setter
     def spectral_axis_unit(self, value):
         if isinstance(value, u.Unit):
             value = value.to_string()
 
-        self._spectral_axis_unit = value
-        self.spectral_axis_unit_changed.emit(self._spectral_axis_unit)
+        self._descriptor.spectral_axis_unit = value
+        self.spectral_axis_unit_changed.emit(
+            self._descriptor.spectral_axis_unit)
 
     def reset_units(self):
         """
         Reset the display units for the spectral axis and the data to those of
         the underlying :class:`~specutils.Spectrum1D` object.
         """
-        self.data_unit = self.data_item.flux.unit.to_string()
-        self.spectral_axis_unit = self.data_item.spectral_axis.unit.to_string()
+        self.set_units(self.data_item.flux.unit.to_string(),
+                       self.data_item.spectral_axis.unit.to_string())
+
+    def set_units(self, data_unit=None, spectral_axis_unit=None):
+        """
+        Change the data and spectral axis display units at once, redrawing
+        the item a single time. The unit change signals are emitted for the
+        units that were given.
+
+        Parameters
+        ----------
+        data_unit : str or `~astropy.units.Unit`, optional
+            The new data display unit.
+        spectral_axis_unit : str or `~astropy.units.Unit`, optional
+            The new spectral axis display unit.
+        """
+        if isinstance(data_unit, u.UnitBase):
+            data_unit = data_unit.to_string()
+
+        if isinstance(spectral_axis_unit, u.UnitBase):
+            spectral_axis_unit = spectral_axis_unit.to_string()
+
+        if data_unit is not None:
+            self._descriptor.data_unit = data_unit
+
+        if spectral_axis_unit is not None:
+            self._descriptor.spectral_axis_unit = spectral_axis_unit
+
+        self._stale = True
+        self._update_data()
+
+        self._setting_units = True
+
+        try:
+            if data_unit is not None:
+                self.data_unit_changed.emit(self._descriptor.data_unit)
+
+            if spectral_axis_unit is not None:
+                self.spectral_axis_unit_changed.emit(
+                    self._descriptor.spectral_axis_unit)
+        finally:
+            self._setting_units = False
+
+    def _converted(self, kind, unit, convert):
+        """
+        Retrieve a unit-converted array from the cache, calling ``convert`` to
+        generate it if the cached array is missing, was converted to a
+        different unit, or was computed from an older version of the data.
+
+        Parameters
+        ----------
+        kind : str
+            The name of the converted array (e.g. 'flux').
+        unit : str or tuple
+            The display unit(s) the array is converted to.
+        convert : callable
+            Function taking no arguments and returning the converted array, or
+            any other object derived from the converted arrays.
+
+        Returns
+        -------
+        `~numpy.ndarray` or object
+            The read-only converted array, or the cached object.
+        """
+        version = self.data_item.data_version
+
+        if version != self._converted_version:
+            self._converted_arrays.clear()
+            self._growable_arrays.clear()
+            self._converted_version = version
+
+        cached = self._converted_arrays.get(kind)
+
+        if cached is None or cached[0] != unit:
+            identifier = self.data_item.identifier
+            values = self._store.get(identifier, version, kind, unit)
+
+            if values is None:
+                values = convert()
+
+                if not isinstance(values, EnvelopePyramid):
+                    values = np.asarray(values)
+                    values.flags.writeable = False
+
+                self._store.put(identifier, version, kind, unit, values)
+
+            cached = (unit, values)
+            self._converted_arrays[kind] = cached
+
+        return cached[1]
+
+    def _convert(self, kind, key=slice(None)):
+        """
+        Convert the samples ``key`` of the flux, spectral axis or
+        uncertainties of the underlying :class:`~specutils.Spectrum1D` object
+        to the display units.
+        """
+        spectral_axis = self.data_item.spectral_axis[key]
+
+        if kind == 'spectral_axis':
+            values = spectral_axis
+            unit = self.spectral_axis_unit or ""
+            equivalencies = spectral()
+        else:
+            if kind == 'flux':
+                values = self.data_item.flux[key]
+            else:
+                values = self.data_item.uncertainty.array[key] * \
+                         self.data_item.uncertainty.unit
+
+            unit = self.data_unit or ""
+            equivalencies = None
+
+        # Linearly related units are converted with a shared scale factor,
+        # sparing the evaluation of the equivalencies for every item
+        scale = _conversion_scale(values.unit, unit)
+
+        if scale is not None:
+            return values.value * scale
+
+        if equivalencies is None:
+            equivalencies = spectral_density(spectral_axis)
+
+        return values.to(unit, equivalencies=equivalencies).value
 
     @property
     def flux(self):
@@ -285,9 +976,8 @@ class PlotDataItem(pg.PlotDataItem):
         object converted to the current data display units (given by
         `PlotDataItem.data_unit`).
         """
-        return self.data_item.flux.to(self.data_unit,
-                                      equivalencies=spectral_density(
-                                          self.data_item.spectral_axis)).value
+        return self._converted('flux', self.data_unit,
+                               lambda: self._convert('flux'))
 
     @property
     def spectral_axis(self):
@@ -296,8 +986,8 @@ class PlotDataItem(pg.PlotDataItem):
         object converted to the current specrtal axis display units (given by
         `PlotDataItem.spectral_axis_unit`).
         """
-        return self.data_item.spectral_axis.to(self.spectral_axis_unit or "",
-                                               equivalencies=spectral()).value
+        return self._converted('spectral_axis', self.spectral_axis_unit,
+                               lambda: self._convert('spectral_axis'))
 
     @property
     def uncertainty(self):
@@ -311,24 +1001,20 @@ class PlotDataItem(pg.PlotDataItem):
         if self.data_item.uncertainty is None:
             return
 
-        uncertainty = self.data_item.uncertainty.array * \
-                      self.data_item.uncertainty.unit
-
-        return uncertainty.to(self.data_unit or "",
-                              equivalencies=spectral_density(
-                                  self.data_item.spectral_axis)).value
+        return self._converted('uncertainty', self.data_unit,
+                               lambda: self._convert('uncertainty'))
 
     @property
     def color(self):
         """
         The display color to use for the spectrum.
         """
-        return self._color
+        return self._descriptor.color
 
     @color.setter
     def color(self, value):
-        self._color = QColor(value).toRgb()
-        self.color_changed.emit(self._color)
+        self._descriptor.color = QColor(value).toRgb()
+        self.color_changed.emit(self._descriptor.color)
         self.data_item.emitDataChanged()
 
     @property
@@ -336,12 +1022,12 @@ class PlotDataItem(pg.PlotDataItem):
         """
         The display line width to use for the spectrum.
         """
-        return self._width
+        return self._descriptor.width
 
     @width.setter
     def width(self, value):
-        self._width = value
-        self.width_changed.emit(self._width)
+        self._descriptor.width = value
+        self.width_changed.emit(self._descriptor.width)
         self.data_item.emitDataChanged()
 
     @property
@@ -364,12 +1050,12 @@ class PlotDataItem(pg.PlotDataItem):
         """
         A boolean value indicating whether the spectrum is currently visible.
         """
-        return self._visible
+        return self._descriptor.visible
 
     @visible.setter
     def visible(self, value):
-        self._visible = value
-        self.visibility_changed.emit(self._visible)
+        self._descriptor.visible = value
+        self.visibility_changed.emit(self._descriptor.visible)
 
     def set_data(self):
         """
@@ -379,24 +1065,196 @@ class PlotDataItem(pg.PlotDataItem):
         spectral_axis = self.spectral_axis
 
         if self.opts.get('stepMode'):
-            spectral_axis = np.append(self.spectral_axis, self.spectral_axis[-1])
+            spectral_axis = self._converted(
+                'edges', self.spectral_axis_unit,
+                lambda: np.append(spectral_axis, spectral_axis[-1]))
+
+        # Force the drawn envelope window to be regenerated from the new data
+        self._display_window = None
+        self._display_data = None
+        self._growable_arrays.clear()
+        self._stale = False
 
         self.setData(spectral_axis, self.flux, connect="finite")
 
         # Without this call, the plot tries to do autoRange based on DataItem (which does not change), when it should
         # instead be doing autoRange based on PlotDataItem, which updates based on what units are being used
-        self._error_bar_item.setData(x=self.spectral_axis,
-                                     y=self.flux,
-                                     height=self.uncertainty)
+        self._update_uncertainty_items(force=True)
 
-    def getData(self):
+    def _grow(self, kind, size, seed):
         """
-        Override getData method to ensure that the returned values fit the
-        requirements of the pyqtgraph step mode: len(x) == len(y) + 1.
-        Necessary for proper performance implementations.
+        Resize the growable copy of a cached array, creating it from the
+        array returned by ``seed`` if necessary, and return a view of it.
         """
+        buffer = self._growable_arrays.get(kind)
+
+        if buffer is None:
+            buffer = GrowableArray(seed())
+            self._growable_arrays[kind] = buffer
+
+        buffer.resize(size)
+
+        return buffer.array
+
+    def update_range(self, start, stop):
+        """
+        Redraw the item after the samples in ``[start, stop)`` of the data
+        item were appended or patched.
+
+        Only the changed samples are converted to the display units and only
+        the bins of the envelope pyramids covering them are recomputed. The
+        item is redrawn from scratch instead if its cached arrays are not
+        those of the data version preceding the change, and hidden items are
+        marked as stale.
+
+        Parameters
+        ----------
+        start, stop : int
+            The range of samples that changed.
+        """
+        cache = self._converted_arrays
+        units = {'flux': self.data_unit, 'uncertainty': self.data_unit,
+                 'spectral_axis': self.spectral_axis_unit}
+
+        # Hidden items are redrawn from scratch once shown again
+        if not self.visible:
+            self._stale = True
+            return
+
+        if self._stale or self.xData is None or \
+                self._converted_version != self.data_item.data_version - 1 or \
+                any(cache.get(kind, (None,))[0] != units[kind]
+                    for kind in ('flux', 'spectral_axis')):
+            self._stale = True
+            self._update_data()
+            return
+
+        version = self.data_item.data_version
+        identifier = self.data_item.identifier
+
+        # Another plot window may already have updated the shared arrays
+        shared = {kind: self._store.get(identifier, version, kind, unit)
+                  for kind, (unit, _) in cache.items()}
+
+        if all(values is not None for values in shared.values()):
+            for kind, values in shared.items():
+                cache[kind] = (cache[kind][0], values)
+
+            # The growable copies no longer hold the latest samples
+            self._growable_arrays.clear()
+
+            self._converted_version = version
+            self._display_window = None
+            self._display_data = None
+
+            self.setData(cache['edges'][1] if 'edges' in cache else
+                         cache['spectral_axis'][1], cache['flux'][1],
+                         connect="finite")
+            self._update_uncertainty_items(force=True)
+            return
+
+        size = len(self.data_item.flux)
+        key = slice(start, stop)
+        arrays = {}
+
+        for kind in ('spectral_axis', 'flux', 'uncertainty'):
+            if kind in cache:
+                arrays[kind] = self._grow(kind, size,
+                                          lambda kind=kind: cache[kind][1])
+                arrays[kind][key] = self._convert(kind, key)
+
+        spectral_axis, flux = arrays['spectral_axis'], arrays['flux']
+        edges = spectral_axis
+
+        if 'edges' in cache:
+            edges = self._grow('edges', size + 1, lambda: cache['edges'][1])
+            edges[key] = spectral_axis[key]
+            edges[-1] = spectral_axis[-1]
+            arrays['edges'] = edges
+
+        # The cached arrays are now read-only views of the growable copies
+        for kind, values in arrays.items():
+            values = values.view()
+            values.flags.writeable = False
+            cache[kind] = (cache[kind][0], values)
+
+        envelope = cache.get('envelope')
+
+        if envelope is not None:
+            envelope[1].update(edges, flux, start, stop)
+
+        uncertainty_envelope = cache.get('uncertainty_envelope')
+
+        if uncertainty_envelope is not None and 'uncertainty' not in arrays:
+            # Rebuilt in full when next drawn
+            del cache['uncertainty_envelope']
+        elif uncertainty_envelope is not None:
+            uncertainty = arrays['uncertainty']
+            lower = self._grow('lower', size, lambda: flux - uncertainty)
+            upper = self._grow('upper', size, lambda: flux + uncertainty)
+            lower[key] = flux[key] - uncertainty[key]
+            upper[key] = flux[key] + uncertainty[key]
+
+            uncertainty_envelope[1].update(edges, lower, start, stop,
+                                           upper=upper)
+
+        # Share the updated arrays with the other plot windows
+        for kind, (unit, values) in cache.items():
+            self._store.put(identifier, version, kind, unit, values)
+
+        self._converted_version = version
+        self._display_window = None
+        self._display_data = None
+
+        self.setData(edges, flux, connect="finite")
+        self._update_uncertainty_items(force=True)
+
+    @property
+    def envelope(self):
+        """
+        The `~specviz.core.decimation.EnvelopePyramid` used to draw this item,
+        or `None` if the spectrum is short enough to be drawn at full
+        resolution.
+        """
+        if not self.opts.get('stepMode') or self.yData is None or \
+                self.yData.size <= self.lod_threshold:
+            return
+
+        # The pyramid is built from the arrays last passed to ``setData``,
+        # which are always in the current display units.
+        return self._converted(
+            'envelope', (self.spectral_axis_unit, self.data_unit),
+            lambda: EnvelopePyramid(self.xData, self.yData))
+
+    def _envelope_window(self, envelope, current=None):
+        """
+        Select the envelope window matching the current view range and pixel
+        width of the view box containing this item. The ``current`` window is
+        kept if it still covers the view range at the right level.
+        """
+        view_box = self.getViewBox()
+
+        if view_box is None:
+            return envelope.window()
+
+        x_range = view_box.viewRange()[0]
+        width = max(int(view_box.width()), 1)
+
+        # Keep the drawn window as long as it covers the view range and was
+        # drawn at the same level, so that small pans are free.
+        if current is not None:
+            level, start, stop = current
+            visible = envelope.window(x_range, max_bins=width, pad=False)
+
+            if visible[0] == level and start <= visible[1] and \
+                    visible[2] <= stop:
+                return current
+
+        return envelope.window(x_range, max_bins=width)
+
+    def _full_resolution_data(self):
         try:
-            x, y = super().getData()
+            x, y = super(PlotDataItem, self).getData()
         except (ValueError, IndexError):
             # if error occurred during down-sampling and clip to view use original data
             x, y = self.xData, self.yData
@@ -417,3 +1275,52 @@ class PlotDataItem(pg.PlotDataItem):
                 y = np.array([0])
 
         return x, y
+
+    def getData(self):
+        """
+        Override getData method to draw long spectra from their envelope
+        pyramid, at the level matching the width of the view in pixels.
+        Shorter spectra are drawn at full resolution and satisfy the
+        requirements of the pyqtgraph step mode: len(x) == len(y) + 1.
+        """
+        envelope = self.envelope
+
+        if envelope is None:
+            return self._full_resolution_data()
+
+        window = self._envelope_window(envelope, self._display_window)
+
+        if window != self._display_window or self._display_data is None:
+            self._display_window = window
+            self._display_data = envelope.data(*window)
+
+        return self._display_data
+
+    def viewRangeChanged(self):
+        """
+        Overrides the PyQtGraph method to redraw the envelope of long spectra
+        and of the uncertainties when the view range selects a different
+        level or window.
+        """
+        envelope = self.envelope
+
+        if envelope is not None and self._envelope_window(
+                envelope, self._display_window) != self._display_window:
+            self.updateItems()
+
+        self._update_uncertainty_items()
+
+        super(PlotDataItem, self).viewRangeChanged()
+
+    def dataBounds(self, ax, frac=1.0, orthoRange=None):
+        """
+        Overrides the PyQtGraph method so that auto ranging accounts for the
+        whole spectrum rather than the envelope window currently drawn.
+        """
+        envelope = self.envelope
+
+        if envelope is None:
+            return super(PlotDataItem, self).dataBounds(
+                ax, frac=frac, orthoRange=orthoRange)
+
+        return envelope.bounds(ax, x_range=orthoRange if ax == 1 else None)
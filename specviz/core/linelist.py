@@ -51,6 +51,7 @@ columns_to_remove = [REDSHIFTED_WAVELENGTH_COLUMN, COLOR_COLUMN,
                      HEIGHT_COLUMN, MARKER_COLUMN]
 
 _linelists_cache = []
+_linelists_populated = False
 
 
 def get_from_file(linelist_path, filename):
@@ -92,14 +93,20 @@ def get_from_file(linelist_path, filename):
 def populate_linelists_cache():
     """
     Function that should be called at the appropriate time when starting the
-    app, so the lists are cached for speedier access later on.
+    app, so the lists are cached for speedier access later on. The lists are
+    only read the first time this function is called.
     """
+    global _linelists_populated
+
+    if _linelists_populated:
+        return
+
     # we could benefit from a threaded approach here. But I couldn't
     # see the benefits, since the reading of even the largest line
     # list files takes a fraction of a second at most.
     linelist_path = os.path.dirname(os.path.abspath(__file__))
     s = path.sep
-    linelist_path += s + '..' + s + '..' + s + 'data' + s + 'linelists' + s
+    linelist_path += s + '..' + s + 'data' + s + 'linelists' + s
 
     yaml_paths = glob.glob(linelist_path + '*.yaml')
 
@@ -107,6 +114,8 @@ def populate_linelists_cache():
         linelist = get_from_file(linelist_path, yaml_filename)
         _linelists_cache.append(linelist)
 
+    _linelists_populated = True
+
 
 def get_from_cache(index):
     """
@@ -0,0 +1,758 @@
+import glob
+import hashlib
+import io
+import json
+import logging
+import multiprocessing
+import os
+import sys
+import threading
+from concurrent.futures import ProcessPoolExecutor, as_completed, wait
+
+import astropy.units as u
+import numpy as np
+from astropy.io import fits
+from astropy.io import registry as io_registry
+from astropy.io.registry import IORegistryError
+from specutils import Spectrum1D, SpectrumList
+
+try:
+    from multiprocessing import resource_tracker, shared_memory
+except ImportError:
+    # Shared memory requires Python 3.8, the spectra are pickled otherwise
+    shared_memory = None
+
+__all__ = ['LoadCancelled', 'ProgressFile', 'LoaderCache', 'loader_cache',
+           'file_signature', 'identify_formats', 'read_spectra',
+           'read_files', 'expand_paths', 'spectrum_names']
+
+#: Primary header keywords identifying the kind of product held in a FITS
+#: file. Files with the same values are read by the same loader.
+IDENTIFYING_KEYWORDS = ('TELESCOP', 'INSTRUME', 'DETECTOR', 'EXP_TYPE',
+                        'DATAMODL', 'FILETYPE', 'ORIGIN')
+
+_FITS_BLOCK_SIZE = 2880
+_FITS_CARD_SIZE = 80
+
+
+class LoadCancelled(Exception):
+    """
+    Raised when the loading of a file is cancelled while it is being read.
+    """
+
+
+class ProgressFile(io.FileIO):
+    """
+    Read-only file reporting the position reached by every read.
+
+    The ``callback`` is called with the number of bytes read so far and may
+    raise (e.g. `LoadCancelled`) to abort the reader using the file.
+
+    Parameters
+    ----------
+    path : str
+        The path of the file to open.
+    callback : callable, optional
+        Function taking the current position in bytes.
+    """
+    def __init__(self, path, callback=None):
+        super(ProgressFile, self).__init__(path, 'rb')
+        self._callback = callback
+
+    def _report(self):
+        if self._callback is not None:
+            self._callback(self.tell())
+
+    def read(self, *args, **kwargs):
+        """Read bytes, reporting the position reached."""
+        data = super(ProgressFile, self).read(*args, **kwargs)
+        self._report()
+        return data
+
+    def readall(self):
+        """Read until the end of the file, reporting the position reached."""
+        data = super(ProgressFile, self).readall()
+        self._report()
+        return data
+
+    def readinto(self, buffer):
+        """Read bytes into a buffer, reporting the position reached."""
+        size = super(ProgressFile, self).readinto(buffer)
+        self._report()
+        return size
+
+
+def _primary_header(file_path, max_blocks=36):
+    """
+    Read the raw primary header of a FITS file, or the first block of any
+    other file.
+    """
+    blocks = []
+
+    with open(file_path, 'rb') as f:
+        while len(blocks) < max_blocks:
+            block = f.read(_FITS_BLOCK_SIZE)
+            blocks.append(block)
+
+            if not blocks[0].startswith(b'SIMPLE') or \
+                    len(block) < _FITS_BLOCK_SIZE:
+                break
+
+            # The header ends with the block holding the END card
+            if any(block[i:i + 8] == b'END     '
+                   for i in range(0, len(block), _FITS_CARD_SIZE)):
+                break
+
+    return b''.join(blocks)
+
+
+def _header_class(header):
+    """
+    Digest of the identifying keywords of a raw FITS primary header, or
+    `None` if the header is not a FITS header or has none of them.
+    """
+    if not header.startswith(b'SIMPLE'):
+        return
+
+    try:
+        header = fits.Header.fromstring(header.decode('ascii'))
+    except Exception:
+        return
+
+    values = [header.get(keyword) for keyword in IDENTIFYING_KEYWORDS]
+
+    if all(value is None for value in values):
+        return
+
+    return hashlib.sha1(json.dumps([str(value) for value in values])
+                        .encode()).hexdigest()
+
+
+def file_signature(file_path):
+    """
+    Compute the signature of a file, used to detect whether it changed since
+    a loader was last identified for it.
+
+    Parameters
+    ----------
+    file_path : str
+        Path to location of the spectrum file.
+
+    Returns
+    -------
+    list
+        The size, modification time in nanoseconds and digest of the
+        primary header of the file.
+    """
+    return _describe(file_path)[0]
+
+
+def _describe(file_path):
+    """
+    Compute the `file_signature` and the header class of a file, reading its
+    primary header only once.
+    """
+    stat = os.stat(file_path)
+    header = _primary_header(file_path)
+
+    return ([stat.st_size, stat.st_mtime_ns, hashlib.sha1(header).hexdigest()],
+            _header_class(header))
+
+
+class LoaderCache:
+    """
+    On-disk cache of the loaders that successfully read files.
+
+    A file is looked up by its path and `file_signature`, so that the cached
+    loader is discarded as soon as the file changes. Files never seen before
+    are looked up by the identifying keywords of their primary header (see
+    ``IDENTIFYING_KEYWORDS``), so that new products of a known kind are
+    identified from their primary header alone, without running the
+    identifiers of every registered loader.
+
+    Stored loaders are only written to disk by `flush`, so that reading many
+    files rewrites the cache once.
+
+    Parameters
+    ----------
+    path : str, optional
+        The JSON file the cache is stored in. Defaults to
+        ``~/.specviz/loader_cache.json``.
+    max_entries : int, optional
+        The maximum number of files remembered. The oldest entries are
+        dropped first.
+    """
+    def __init__(self, path=None, max_entries=1000):
+        self._path = path or os.path.join(os.path.expanduser("~/.specviz"),
+                                          "loader_cache.json")
+        self._max_entries = max_entries
+        self._entries = None
+        self._dirty = False
+
+        # Descriptions of the files looked up, reused when the loader that
+        # read them is stored
+        self._descriptions = {}
+
+        # Files may be loaded from several threads at once
+        self._lock = threading.Lock()
+
+    @property
+    def path(self):
+        """
+        The JSON file the cache is stored in.
+        """
+        return self._path
+
+    def _load(self):
+        if self._entries is None:
+            try:
+                with open(self._path) as f:
+                    self._entries = json.load(f)
+            except (OSError, ValueError):
+                self._entries = {}
+
+            self._entries.setdefault('files', {})
+            self._entries.setdefault('headers', {})
+
+        return self._entries
+
+    def _save(self):
+        directory = os.path.dirname(self._path)
+        temp_path = "{}.{}.tmp".format(self._path, os.getpid())
+
+        try:
+            os.makedirs(directory, exist_ok=True)
+
+            with open(temp_path, 'w') as f:
+                json.dump(self._entries, f)
+
+            os.replace(temp_path, self._path)
+        except OSError as e:
+            logging.debug("Could not save the loader cache: %s", e)
+
+    def lookup(self, file_path):
+        """
+        Retrieve the loader that read a file, or a file of the same kind.
+
+        Parameters
+        ----------
+        file_path : str
+            Path to location of the spectrum file.
+
+        Returns
+        -------
+        str or None
+            The name of the loader, or `None` if unknown.
+        """
+        try:
+            description = _describe(file_path)
+        except OSError:
+            return
+
+        signature, header_class = description
+
+        with self._lock:
+            self._descriptions[os.path.abspath(file_path)] = description
+
+            entries = self._load()
+            entry = entries['files'].get(os.path.abspath(file_path))
+
+            if entry is not None and entry['signature'] == signature:
+                return entry['format']
+
+            if header_class is not None:
+                return entries['headers'].get(header_class)
+
+    def _pop_description(self, file_path):
+        with self._lock:
+            return self._descriptions.pop(os.path.abspath(file_path), None)
+
+    def store(self, file_path, fmt, description=None):
+        """
+        Remember the loader that read a file, until the next `flush`.
+
+        Parameters
+        ----------
+        file_path : str
+            Path to location of the spectrum file.
+        fmt : str
+            The name of the loader.
+        description : tuple, optional
+            The signature and header class of the file, as computed when it
+            was looked up in another process. Files looked up in this cache
+            are not described again.
+        """
+        if description is None:
+            description = self._pop_description(file_path)
+
+        if description is None:
+            try:
+                description = _describe(file_path)
+            except OSError:
+                return
+
+        signature, header_class = description
+
+        with self._lock:
+            entries = self._load()
+            files = entries['files']
+
+            # Re-insert the entry so that it is the newest one
+            files.pop(os.path.abspath(file_path), None)
+            files[os.path.abspath(file_path)] = {'signature': signature,
+                                                 'format': fmt}
+
+            for key in list(files)[:-self._max_entries]:
+                del files[key]
+
+            if header_class is not None:
+                entries['headers'][header_class] = fmt
+
+            self._dirty = True
+
+    def flush(self):
+        """
+        Write the loaders stored since the last flush to disk.
+        """
+        with self._lock:
+            # Files looked up but never read are not stored
+            self._descriptions.clear()
+
+            if self._dirty:
+                self._save()
+                self._dirty = False
+
+    def clear(self):
+        """
+        Forget all the cached loaders.
+        """
+        with self._lock:
+            self._entries = {'files': {}, 'headers': {}}
+            self._descriptions.clear()
+            self._save()
+            self._dirty = False
+
+
+#: The loader cache shared by the application
+loader_cache = LoaderCache()
+
+
+def identify_formats(file_path):
+    """
+    List the registered `~specutils.SpectrumList` formats able to read a
+    file, in priority order.
+
+    Parameters
+    ----------
+    file_path : str
+        Path to location of the spectrum file.
+
+    Returns
+    -------
+    list
+        The names of the matching formats.
+    """
+    return io_registry.identify_format('read', SpectrumList, file_path, None,
+                                       [], {})
+
+
+def _read(file_path, fmt, progress=None):
+    """
+    Read a file with a given format, reporting the bytes read to
+    ``progress``. Readers which do not accept file objects are given the path
+    instead, without progress reports.
+    """
+    if progress is None:
+        return SpectrumList.read(file_path, format=fmt)
+
+    try:
+        with ProgressFile(file_path, progress) as file_obj:
+            return SpectrumList.read(file_obj, format=fmt)
+    except (TypeError, AttributeError):
+        logging.debug("Loader '%s' does not accept file objects, reading "
+                      "'%s' from its path.", fmt, file_path)
+
+        return SpectrumList.read(file_path, format=fmt)
+
+
+def _identify_and_read(file_path, file_loader=None, progress=None):
+    """
+    Read a file with the given loader or with the first identified loader
+    able to read it, and return the spectra read along with the loader name.
+    """
+    formats = identify_formats(file_path)
+
+    if file_loader:
+        if file_loader not in formats:
+            msg = 'Given file can not be processed as specified file format ({})'
+            raise IOError(msg.format(file_loader))
+
+        try:
+            return _read(file_path, file_loader, progress), file_loader
+        except IORegistryError:
+            pass
+
+    # In the case that the user has selected auto load, loop through every
+    # available loader and choose the one that 1) the registry identifier
+    # function allows, and 2) is the highest priority.
+    if len(formats) > 1:
+        logging.warning("Loaders for '%s' matched for this data set. "
+                        "Iterating based on priority.", ', '.join(formats))
+
+    for fmt in formats:
+        try:
+            return _read(file_path, fmt, progress), fmt
+        except IORegistryError:
+            logging.warning("Attempted load with '%s' failed, "
+                            "trying next loader.", fmt)
+
+    raise IOError('Could not find appropriate loader for given file')
+
+
+def read_spectra(file_path, file_loader=None, progress=None, cache=None):
+    """
+    Read spectral data from file given file path and loader.
+
+    Parameters
+    ----------
+    file_path : str
+        Path to location of the spectrum file.
+    file_loader : str, optional
+        Format specified for the astropy io interface. If `None`, every
+        loader identifying the file is tried in priority order.
+    progress : callable, optional
+        Function called with the number of bytes read so far. It may raise
+        `LoadCancelled` to abort the read.
+    cache : `LoaderCache`, optional
+        If given and no loader is specified, the loader cached for the file
+        is tried first, before identifying the file. The loader that read the
+        file is then stored in the cache.
+
+    Returns
+    -------
+    : :class:`~specutils.SpectrumList`
+        A `~specutils.SpectrumList` instance containing the spectra loaded
+        from the file.
+
+    Raises
+    ------
+    IOError
+        If the given loader cannot read the file, or if no loader can.
+    """
+    speclist, fmt = _read_spectra(file_path, file_loader, progress, cache)
+
+    if cache is not None:
+        cache.store(file_path, fmt)
+        cache.flush()
+
+    return speclist
+
+
+def _read_spectra(file_path, file_loader=None, progress=None, cache=None):
+    """
+    Read a file as `read_spectra` does, trying the loader found in the cache
+    first, and return the spectra read along with the loader name without
+    updating the cache.
+    """
+    fmt = None
+
+    if cache is not None and not file_loader:
+        fmt = cache.lookup(file_path)
+
+        if fmt is not None:
+            try:
+                speclist = _read(file_path, fmt, progress)
+            except LoadCancelled:
+                raise
+            except Exception:
+                logging.info("Cached loader '%s' could not read '%s', "
+                             "identifying the file again.", fmt, file_path)
+                fmt = None
+
+    if fmt is None:
+        speclist, fmt = _identify_and_read(file_path, file_loader, progress)
+
+    return speclist, fmt
+
+
+def spectrum_names(file_path, count):
+    """
+    Generate the display names of the spectra read from a file.
+
+    Parameters
+    ----------
+    file_path : str
+        Path to location of the spectrum file.
+    count : int
+        The number of spectra read from the file.
+
+    Returns
+    -------
+    list
+        The file name without extension for a single spectrum, or the file
+        name suffixed with the index of each spectrum.
+    """
+    name = os.path.basename(file_path).split('.')[0]
+
+    if count == 1:
+        return [name]
+
+    # TODO: try to use more informative metadata in the name
+    return ['{}-{}'.format(name, i) for i in range(count)]
+
+
+def expand_paths(paths):
+    """
+    Expand a list of file paths, glob patterns and directories into the list
+    of files they designate.
+
+    Parameters
+    ----------
+    paths : str or list
+        A path or a list of paths. Glob patterns are expanded and
+        directories are replaced by the files they contain (not recursively).
+
+    Returns
+    -------
+    list
+        The sorted, unique paths of the files, in the order the patterns were
+        given.
+    """
+    if isinstance(paths, str):
+        paths = [paths]
+
+    files = []
+
+    for path in paths:
+        matches = sorted(glob.glob(path)) if glob.has_magic(path) else [path]
+
+        for match in matches:
+            if os.path.isdir(match):
+                files.extend(sorted(
+                    os.path.join(match, name) for name in os.listdir(match)
+                    if os.path.isfile(os.path.join(match, name))))
+            else:
+                files.append(match)
+
+    # Drop duplicates, keeping the first occurrence
+    return list(dict.fromkeys(files))
+
+
+#: Alignment of the arrays packed in a shared memory segment, in bytes
+_SHARED_MEMORY_ALIGNMENT = 64
+
+
+def _spectrum_arrays(spectrum):
+    arrays = {'flux': spectrum.flux.value,
+              'spectral_axis': spectrum.spectral_axis.value}
+
+    if spectrum.uncertainty is not None:
+        arrays['uncertainty'] = spectrum.uncertainty.array
+
+    if spectrum.mask is not None:
+        arrays['mask'] = spectrum.mask
+
+    return {kind: np.ascontiguousarray(array)
+            for kind, array in arrays.items()}
+
+
+def _export_spectra(speclist):
+    """
+    Pack the arrays of the spectra read by a worker process in a single
+    shared memory segment, and describe how to rebuild the spectra from it.
+    """
+    if shared_memory is None:
+        return None, list(speclist)
+
+    descriptions = []
+    offset = 0
+
+    for spectrum in speclist:
+        arrays = _spectrum_arrays(spectrum)
+        layout = {}
+
+        for kind, array in arrays.items():
+            layout[kind] = (offset, array.dtype.str, array.shape)
+            offset += -(-array.nbytes // _SHARED_MEMORY_ALIGNMENT) * \
+                _SHARED_MEMORY_ALIGNMENT
+
+        uncertainty = spectrum.uncertainty
+
+        descriptions.append({
+            'arrays': arrays,
+            'layout': layout,
+            'flux_unit': spectrum.flux.unit.to_string(),
+            'spectral_axis_unit': spectrum.spectral_axis.unit.to_string(),
+            'uncertainty': None if uncertainty is None else
+            (uncertainty.__class__, None if uncertainty.unit is None else
+             uncertainty.unit.to_string()),
+            'meta': spectrum.meta})
+
+    segment = shared_memory.SharedMemory(create=True, size=max(offset, 1))
+
+    try:
+        for description in descriptions:
+            for kind, array in description.pop('arrays').items():
+                start = description['layout'][kind][0]
+                segment.buf[start:start + array.nbytes] = \
+                    array.view(np.uint8).ravel()
+    finally:
+        segment.close()
+
+    # The segment is unlinked by the process importing the spectra
+    try:
+        resource_tracker.unregister(segment._name, 'shared_memory')
+    except Exception:
+        pass
+
+    return segment.name, descriptions
+
+
+def _import_spectra(name, descriptions):
+    """
+    Rebuild the spectra exported by a worker process, copying their arrays
+    out of the shared memory segment and releasing it.
+    """
+    if name is None:
+        return SpectrumList(descriptions)
+
+    segment = shared_memory.SharedMemory(name=name)
+    speclist = SpectrumList()
+
+    try:
+        for description in descriptions:
+            arrays = {}
+
+            for kind, (offset, dtype, shape) in \
+                    description['layout'].items():
+                arrays[kind] = np.ndarray(shape, dtype=dtype,
+                                          buffer=segment.buf,
+                                          offset=offset).copy()
+
+            uncertainty = description['uncertainty']
+
+            if uncertainty is not None:
+                uncertainty_class, unit = uncertainty
+                uncertainty = uncertainty_class(arrays['uncertainty'],
+                                                unit=unit, copy=False)
+
+            speclist.append(Spectrum1D(
+                flux=u.Quantity(arrays['flux'], description['flux_unit'],
+                                copy=False),
+                spectral_axis=u.Quantity(arrays['spectral_axis'],
+                                         description['spectral_axis_unit'],
+                                         copy=False),
+                uncertainty=uncertainty, mask=arrays.get('mask'),
+                meta=description['meta']))
+    finally:
+        segment.close()
+        segment.unlink()
+
+    return speclist
+
+
+def _release_spectra(name):
+    """
+    Release the shared memory segment of spectra exported by a worker process
+    without importing them.
+    """
+    if name is None:
+        return
+
+    try:
+        segment = shared_memory.SharedMemory(name=name)
+    except FileNotFoundError:
+        return
+
+    segment.close()
+    segment.unlink()
+
+
+def _load_file(file_path, file_loader=None, cache_path=None):
+    """
+    Read a file in a worker process. The loader cache is only read here, the
+    calling process stores the loader that read the file, along with the
+    description of the file computed by the lookup, if any.
+    """
+    cache = None if cache_path is None else LoaderCache(path=cache_path)
+    speclist, fmt = _read_spectra(file_path, file_loader, cache=cache)
+    description = None if cache is None else cache._pop_description(file_path)
+
+    return fmt, description, _export_spectra(speclist)
+
+
+def read_files(file_paths, file_loader=None, max_workers=None, cache=None):
+    """
+    Read several files in parallel, in a pool of worker processes.
+
+    The arrays of the spectra read by the workers are handed back through
+    shared memory rather than pickled, where supported. The spectra are
+    rebuilt from their flux, spectral axis, uncertainty, mask and meta data,
+    so spectral axes defined by a WCS are replaced by their values.
+
+    Parameters
+    ----------
+    file_paths : list
+        The paths of the files to read.
+    file_loader : str, optional
+        Format specified for the astropy io interface. If `None`, the loader
+        of each file is identified independently.
+    max_workers : int, optional
+        The number of worker processes. Defaults to the number of processors.
+    cache : `LoaderCache`, optional
+        The loader cache used to identify the files, updated with the
+        loaders that read them.
+
+    Yields
+    ------
+    tuple
+        ``(file_path, speclist, exception)`` for each file, in the order the
+        files are read. Either the `~specutils.SpectrumList` read or the
+        exception raised while reading the file is `None`.
+    """
+    kwargs = {}
+
+    # Forking a process running a Qt application is unsafe
+    if sys.version_info >= (3, 7):
+        kwargs['mp_context'] = multiprocessing.get_context('spawn')
+
+    with ProcessPoolExecutor(max_workers=max_workers, **kwargs) as executor:
+        futures = {executor.submit(_load_file, file_path, file_loader,
+                                   None if cache is None else cache.path):
+                   file_path for file_path in file_paths}
+
+        consumed = set()
+
+        try:
+            for future in as_completed(futures):
+                file_path = futures[future]
+                consumed.add(future)
+
+                try:
+                    fmt, description, (name, descriptions) = future.result()
+                    speclist = _import_spectra(name, descriptions)
+                except Exception as e:
+                    yield file_path, None, e
+                    continue
+
+                if cache is not None:
+                    cache.store(file_path, fmt, description=description)
+
+                yield file_path, speclist, None
+        finally:
+            # Stop reading the remaining files if the caller stops iterating
+            for future in futures:
+                future.cancel()
+
+            # The spectra of the files read but not consumed, including those
+            # still being read, are never imported and must be released here
+            for future in wait(futures).done - consumed:
+                if future.cancelled() or future.exception() is not None:
+                    continue
+
+                fmt, description, (name, descriptions) = future.result()
+                _release_spectra(name)
+
+            # The loaders of all the files read are written at once
+            if cache is not None:
+                cache.flush()
@@ -1,10 +1,13 @@
 import uuid
 
+import numpy as np
 import qtawesome as qta
 from qtpy.QtCore import QSortFilterProxyModel, Qt, Signal
 from qtpy.QtGui import QStandardItemModel
 
-from .items import DataItem, PlotDataItem
+from .buffers import (ConvertedArrayStore, is_memory_mapped,
+                      share_spectral_axis, spectral_axis_buffer)
+from .items import DataItem, PlotDataItem, PlotItemDescriptor
 
 __all__ = ['DataListModel', 'PlotProxyModel']
 
@@ -12,12 +15,135 @@ __all__ = ['DataListModel', 'PlotProxyModel']
 class DataListModel(QStandardItemModel):
     """
     Base model for all data loaded into specviz.
+
+    Attributes
+    ----------
+    data_added : ``qtpy.QtCore.Signal``
+        Fired when a single data item has been added to the model.
+    data_batch_added : ``qtpy.QtCore.Signal``
+        Fired once with the list of data items added to the model through a
+        bulk insertion.
+    data_range_changed : ``qtpy.QtCore.Signal``
+        Fired with a data item and the ``start`` and ``stop`` indices of the
+        samples that changed when the data item is appended to or patched.
+        The generic item change signals are not fired in that case.
+
+    Parameters
+    ----------
+    storage : :class:`~specviz.core.storage.MemmapStorage`, optional
+        If given, the arrays of the spectra added to the model are spilled to
+        this storage backend, and the data items hold memory-mapped spectra.
     """
     data_added = Signal(DataItem)
+    data_batch_added = Signal(list)
+    data_range_changed = Signal(DataItem, int, int)
 
-    def __init__(self, *args, **kwargs):
+    def __init__(self, storage=None, *args, **kwargs):
         super(DataListModel, self).__init__(*args, **kwargs)
 
+        self._storage = storage
+
+        # Arrays converted to display units, shared by the plot data items of
+        # every plot window showing this model
+        self._converted_arrays = ConvertedArrayStore()
+
+        # Maps of data item UUIDs to the data items in this model and to their
+        # rows. These are kept in sync with the rows of the model so that
+        # identifier lookups do not need to scan every item.
+        self._id_index = {}
+        self._id_rows = {}
+
+        self.rowsInserted.connect(self._on_rows_inserted)
+        self.rowsAboutToBeRemoved.connect(self._on_rows_about_to_be_removed)
+        self.rowsRemoved.connect(self._on_rows_removed)
+        self.modelReset.connect(self._rebuild_id_index)
+        self.layoutChanged.connect(self._rebuild_id_index)
+
+    def _shift_id_rows(self, first, count):
+        # Rows at or after the first row moved by count rows
+        for identifier, row in self._id_rows.items():
+            if row >= first:
+                self._id_rows[identifier] = row + count
+
+    def _on_rows_inserted(self, parent, first, last):
+        if parent.isValid():
+            return
+
+        # Appending rows, the common case, does not move any existing row
+        if last + 1 < self.rowCount():
+            self._shift_id_rows(first, last - first + 1)
+
+        for row in range(first, last + 1):
+            item = self.item(row)
+
+            if item is not None:
+                self._id_index[item.identifier] = item
+                self._id_rows[item.identifier] = row
+
+    def _on_rows_about_to_be_removed(self, parent, first, last):
+        if parent.isValid():
+            return
+
+        for row in range(first, last + 1):
+            item = self.item(row)
+
+            if item is not None:
+                self._id_index.pop(item.identifier, None)
+                self._id_rows.pop(item.identifier, None)
+
+                if self._storage is not None:
+                    self._storage.release(item.identifier)
+
+    def _on_rows_removed(self, parent, first, last):
+        if parent.isValid():
+            return
+
+        if first < self.rowCount():
+            self._shift_id_rows(last + 1, first - last - 1)
+
+    @property
+    def storage(self):
+        """
+        The storage backend spectra are spilled to, or `None` if they are kept
+        in memory.
+        """
+        return self._storage
+
+    @property
+    def converted_arrays(self):
+        """
+        The :class:`~specviz.core.buffers.ConvertedArrayStore` shared by the
+        plot data items of all the plot windows showing this model.
+        """
+        return self._converted_arrays
+
+    def _store(self, data_item):
+        spectrum = data_item.spectrum
+
+        # Spectra restored from a session are already memory-mapped
+        if is_memory_mapped(spectrum.data):
+            return
+
+        if self._storage is not None:
+            # Replace the in-memory spectrum with one backed by the storage
+            spectrum = self._storage.store(data_item.identifier, spectrum)
+        else:
+            # Rebuild the spectrum around the pooled spectral axis, so that it
+            # does not retain a copy of its own
+            spectrum = share_spectral_axis(spectrum)
+
+        if spectrum is not data_item.spectrum:
+            data_item.setData(spectrum, data_item.DataRole)
+
+    def _rebuild_id_index(self):
+        self._id_index = {}
+        self._id_rows = {}
+
+        for row, item in enumerate(self.items):
+            if item is not None:
+                self._id_index[item.identifier] = item
+                self._id_rows[item.identifier] = row
+
     @property
     def items(self):
         """
@@ -38,6 +164,7 @@ class DataListModel(QStandardItemModel):
             Display string of this data item.
         """
         data_item = DataItem(name, identifier=uuid.uuid4(), data=spec)
+        self._store(data_item)
         self.appendRow(data_item)
 
         # Emit custom signal indicating a data item has been added to the model
@@ -45,6 +172,109 @@ class DataListModel(QStandardItemModel):
 
         return data_item
 
+    def add_data_batch(self, specs):
+        """
+        Generate and add several :class:`~specviz.core.items.DataItem` objects
+        to the internal Qt data model in a single insertion.
+
+        Parameters
+        ----------
+        specs : dict or iterable
+            Either a mapping of display names to
+            :class:`~specutils.Spectrum1D` objects, or an iterable of
+            ``(spectrum, name)`` pairs.
+
+        Returns
+        -------
+        list
+            The list of newly created :class:`~specviz.core.items.DataItem`
+            objects, in insertion order.
+        """
+        if isinstance(specs, dict):
+            specs = [(spec, name) for name, spec in specs.items()]
+
+        data_items = [DataItem(name, identifier=uuid.uuid4(), data=spec)
+                      for spec, name in specs]
+
+        return self.append_data_items(data_items)
+
+    def append_data_items(self, data_items):
+        """
+        Append already constructed :class:`~specviz.core.items.DataItem`
+        objects to the model in a single insertion. Only one ``rowsInserted``
+        and one `data_batch_added` signal are emitted, regardless of the
+        number of items.
+
+        Parameters
+        ----------
+        data_items : list
+            The :class:`~specviz.core.items.DataItem` objects to add.
+
+        Returns
+        -------
+        list
+            The data items that were added.
+        """
+        data_items = list(data_items)
+
+        if len(data_items) == 0:
+            return data_items
+
+        for data_item in data_items:
+            self._store(data_item)
+
+        # Appending to the root item inserts all rows within a single
+        # begin/end insert rows transaction
+        self.invisibleRootItem().appendRows(data_items)
+
+        self.data_batch_added.emit(data_items)
+
+        return data_items
+
+    def memory_usage(self):
+        """
+        Estimate the memory used by the arrays of the spectra in this model.
+
+        The arrays retained by each spectrum are counted, including the
+        lookup table of its spectral axis and the spectral axis it cached.
+        Buffers shared by several spectra, such as the pooled spectral axes,
+        are only counted once. Memory-mapped arrays are paged in and out by
+        the operating system and are not counted.
+
+        Returns
+        -------
+        int
+            The number of bytes used.
+        """
+        seen = set()
+        total = 0
+
+        for item in self.items:
+            spectrum = item.spectrum
+            arrays = [spectrum.data, spectral_axis_buffer(spectrum),
+                      vars(spectrum).get('spectral_axis')]
+
+            if spectrum.uncertainty is not None:
+                arrays.append(spectrum.uncertainty.array)
+
+            if spectrum.mask is not None:
+                arrays.append(spectrum.mask)
+
+            for array in arrays:
+                # Walk up to the array owning the memory, so that views of the
+                # same buffer are recognized as such
+                while isinstance(getattr(array, 'base', None), np.ndarray):
+                    array = array.base
+
+                if id(array) in seen or isinstance(array, np.memmap) or \
+                        not isinstance(array, np.ndarray):
+                    continue
+
+                seen.add(id(array))
+                total += array.nbytes
+
+        return total
+
     def remove_data(self, identifier):
         """
         Removes data given the data item's UUID.
@@ -54,10 +284,10 @@ class DataListModel(QStandardItemModel):
         identifier : :class:`~uuid.UUID`
             Assigned id of the :class:`~specviz.core.items.DataItem` object.
         """
-        item = self.item_from_id(identifier)
+        row = self.row_from_id(identifier)
 
-        if item is not None:
-            self.removeRow(item.index().row())
+        if row >= 0:
+            self.removeRow(row)
 
     def item_from_id(self, identifier):
         """
@@ -71,9 +301,27 @@ class DataListModel(QStandardItemModel):
         Returns
         -------
         `~specviz.core.items.DataItem`
-            The corresponding data item.
+            The corresponding data item, or `None` if no item in the model has
+            the given identifier.
         """
-        return next((x for x in self.items if x.identifier == identifier))
+        return self._id_index.get(identifier)
+
+    def row_from_id(self, identifier):
+        """
+        Return the row of the data item corresponding to a unique identifier.
+
+        Parameters
+        ----------
+        identifier : :class:`~uuid.UUID`
+            Assigned id of the :class:`~specviz.core.items.DataItem` object.
+
+        Returns
+        -------
+        int
+            The row of the data item in the model, or ``-1`` if no item in the
+            model has the given identifier.
+        """
+        return self._id_rows.get(identifier, -1)
 
     def data(self, index, role=Qt.DisplayRole):
         """
@@ -141,17 +389,123 @@ class PlotProxyModel(QSortFilterProxyModel):
         super(PlotProxyModel, self).__init__(*args, **kwargs)
 
         self.setSourceModel(source)
+
+        # Display state of every data item indexed so far, and the plot data
+        # items built for those that have been shown at least once
+        self._descriptors = {}
         self._items = {}
 
+        # Drop the plot data items of data items removed from the source model
+        if source is not None:
+            source.rowsRemoved.connect(self._prune_items)
+            source.data_range_changed.connect(self._on_data_range_changed)
+
+    def _on_data_range_changed(self, data_item, start, stop):
+        # Items never shown are drawn from scratch when first built
+        item = self._items.get(data_item.identifier)
+
+        if item is not None:
+            item.update_range(start, stop)
+
+    def _prune_items(self, *args):
+        source = self.sourceModel()
+
+        for identifier in list(self._descriptors):
+            if source.item_from_id(identifier) is None:
+                del self._descriptors[identifier]
+                self._items.pop(identifier, None)
+
     @property
     def items(self):
         """
-        Returns a list of :class:`~specviz.core.items.PlotDataItem` instances in
-        the proxy model.
+        Returns a list of the :class:`~specviz.core.items.PlotDataItem`
+        instances built so far in the proxy model. Data items that have never
+        been shown in the plot have no plot data item yet, see `descriptors`.
         """
         return list(self._items.values())
 
-    def item_from_index(self, index):
+    @property
+    def descriptors(self):
+        """
+        Returns a list of the :class:`~specviz.core.items.PlotItemDescriptor`
+        instances in the proxy model.
+        """
+        return list(self._descriptors.values())
+
+    def descriptor_from_index(self, index):
+        """
+        Given a ``QModelIndex`` object, retrieves the
+        `~specviz.core.items.PlotItemDescriptor` holding the display state of
+        the source `~specviz.core.items.DataItem`, without building its plot
+        data item.
+
+        Parameters
+        ----------
+        index : :class:`~qtpy.QtCore.QModelIndex`
+            The model index of the desired descriptor.
+
+        Returns
+        -------
+        :class:`~specviz.core.items.PlotItemDescriptor`
+            The descriptor corresponding to the given index.
+        """
+        index = self.mapToSource(index)
+        data_item = self.sourceModel().data(index, role=Qt.UserRole)
+
+        if data_item is None:
+            return
+
+        return self._descriptor(data_item)
+
+    def descriptor_from_id(self, identifier):
+        """
+        Retrieves the `~specviz.core.items.PlotItemDescriptor` holding the
+        display state of a `~specviz.core.items.DataItem` from its UUID,
+        without building its plot data item.
+
+        Parameters
+        ----------
+        identifier : :class:`uuid.UUID`
+            The UUID of the `~specviz.core.items.DataItem`.
+
+        Returns
+        -------
+        :class:`~specviz.core.items.PlotItemDescriptor`
+            The descriptor corresponding to the UUID.
+        """
+        descriptor = self._descriptors.get(identifier)
+
+        if descriptor is None:
+            data_item = self.sourceModel().item_from_id(identifier)
+
+            if data_item is None:
+                return
+
+            descriptor = self._descriptor(data_item)
+
+        return descriptor
+
+    def _descriptor(self, data_item):
+        descriptor = self._descriptors.get(data_item.identifier)
+
+        if descriptor is None:
+            descriptor = PlotItemDescriptor(data_item)
+            self._descriptors[data_item.identifier] = descriptor
+
+        return descriptor
+
+    def _plot_data_item(self, data_item, build=True):
+        item = self._items.get(data_item.identifier)
+
+        if item is None and build:
+            item = PlotDataItem(data_item,
+                                descriptor=self._descriptor(data_item),
+                                store=self.sourceModel().converted_arrays)
+            self._items[data_item.identifier] = item
+
+        return item
+
+    def item_from_index(self, index, build=True):
         """
         Given a ``QModelIndex`` object, retrieves the source
         `~specviz.core.items.DataItem`, and from that, the proxy model's
@@ -161,6 +515,9 @@ class PlotProxyModel(QSortFilterProxyModel):
         ----------
         index : :class:`~qtpy.QtCore.QModelIndex`
             The model index of the desired `~specviz.core.items.PlotDataItem`.
+        build : bool, optional
+            Whether to build the plot data item if it does not exist yet. If
+            `False`, `None` is returned for items that were never shown.
 
         Returns
         -------
@@ -173,14 +530,9 @@ class PlotProxyModel(QSortFilterProxyModel):
         if data_item is None:
             return
 
-        if data_item.identifier not in self._items:
-            self._items[data_item.identifier] = PlotDataItem(data_item)
-
-        item = self._items.get(data_item.identifier)
-
-        return item
+        return self._plot_data_item(data_item, build=build)
 
-    def item_from_id(self, identifier):
+    def item_from_id(self, identifier, build=True):
         """
         Retrieves a `~specviz.core.items.PlotDataItem` from the UUID of a
         `~specviz.core.items.DataItem`.
@@ -189,20 +541,50 @@ class PlotProxyModel(QSortFilterProxyModel):
         ----------
         identifier : :class:`uuid.UUID`
             The UUID of the `~specviz.core.items.DataItem`.
+        build : bool, optional
+            Whether to build the plot data item if it does not exist yet. If
+            `False`, `None` is returned for items that were never shown.
 
         Returns
         -------
         item : :class:`~specviz.core.items.PlotDataItem`
             The `~specviz.core.items.PlotDataItem` corresponding to the UUID.
         """
-        data_item = self.sourceModel().item_from_id(identifier)
+        item = self._items.get(identifier)
 
-        if data_item.identifier not in self._items:
-            self._items[data_item.identifier] = PlotDataItem(data_item)
+        if item is None:
+            data_item = self.sourceModel().item_from_id(identifier)
+
+            if data_item is None:
+                return
+
+            item = self._plot_data_item(data_item, build=build)
 
-        item = self._items.get(data_item.identifier)
         return item
 
+    def emit_rows_changed(self, identifiers):
+        """
+        Emit a single ``dataChanged`` signal spanning the rows of several data
+        items, rather than one signal per row, so that views only repaint
+        once after a batch of changes.
+
+        Parameters
+        ----------
+        identifiers : list
+            The UUIDs of the `~specviz.core.items.DataItem` objects whose rows
+            changed.
+        """
+        source = self.sourceModel()
+        # Unknown identifiers map to invalid indexes, whose row is -1
+        rows = [self.mapFromSource(
+                    source.index(source.row_from_id(x), 0)).row()
+                for x in identifiers]
+        rows = [row for row in rows if row >= 0]
+
+        if len(rows) > 0:
+            self.dataChanged.emit(self.index(min(rows), 0),
+                                  self.index(max(rows), 0))
+
     def data(self, index, role=Qt.DisplayRole):
         """
         Overrides Qt's `data` method to provide information based on the
@@ -223,7 +605,9 @@ class PlotProxyModel(QSortFilterProxyModel):
         if not index.isValid():
             return
 
-        item = self.item_from_index(index)
+        # Only the display state is needed for most roles, avoid building the
+        # plot data item until it is explicitly requested
+        item = self.descriptor_from_index(index)
 
         if role == Qt.DisplayRole:
             return item.data_item.name
@@ -232,7 +616,7 @@ class PlotProxyModel(QSortFilterProxyModel):
                             color=item.color)
             return icon
         elif role == Qt.UserRole:
-            return item
+            return self.item_from_index(index)
         elif role == Qt.CheckStateRole:
             return Qt.Checked if item.visible else ~Qt.Checked
 
@@ -259,9 +643,10 @@ class PlotProxyModel(QSortFilterProxyModel):
         if not index.isValid():
             return
 
-        item = self.item_from_index(index)
-
         if role == Qt.CheckStateRole:
+            # Hidden items never shown before do not need a plot data item
+            item = self.item_from_index(index, build=value > 0) or \
+                self.descriptor_from_index(index)
             item.visible = value > 0
 
             self.dataChanged.emit(index, index)
@@ -1,14 +1,238 @@
 import abc
+import sys
+import types
+from collections import OrderedDict
 
-__all__ = ['StackOperation', 'Operation', 'FunctionalOperation']
+import numpy as np
+
+__all__ = ['BATCH_FUNCTIONS', 'register_batch', 'estimate_nbytes',
+           'OperationHistory', 'StackOperation', 'Operation',
+           'FunctionalOperation']
+
+#: Vectorised implementations of the functions applied by
+#: `FunctionalOperation`, by function. See `register_batch`.
+BATCH_FUNCTIONS = {}
+
+# Depth up to which the objects referenced by an operation are accounted for
+_MAX_DEPTH = 6
+
+
+def register_batch(function):
+    """
+    Register a vectorised implementation of a function applied by
+    `FunctionalOperation`, used by `FunctionalOperation.batch`.
+
+    The implementation is called with a 2-D array of fluxes of shape
+    ``(n_spectra, n_pixels)``, the spectral axis they share and the
+    additional arguments of the operation, and returns the 2-D array of the
+    resulting fluxes. It is also used for the operations applying a wrapper
+    of the function, as long as the wrapper sets ``__wrapped__`` (e.g. with
+    `functools.wraps`).
+
+    Parameters
+    ----------
+    function : callable
+        The function the implementation is equivalent to.
+
+    Returns
+    -------
+    callable
+        Decorator registering the implementation.
+    """
+    def decorator(batch_function):
+        BATCH_FUNCTIONS[function] = batch_function
+
+        return batch_function
+
+    return decorator
+
+
+def estimate_nbytes(obj, _seen=None, _depth=0):
+    """
+    Estimate the memory held by an object and the objects it references.
+
+    Arrays and quantities are accounted for by the size of their data, and
+    containers, function closures and default arguments, bound methods and
+    instance attributes are followed recursively, up to a fixed depth.
+    Modules and classes are not accounted for, and objects referenced
+    several times are only counted once.
+
+    Parameters
+    ----------
+    obj : object
+        The object.
+
+    Returns
+    -------
+    int
+        The estimated size in bytes.
+    """
+    if _seen is None:
+        _seen = set()
+
+    if id(obj) in _seen or isinstance(obj, (types.ModuleType, type)):
+        return 0
+
+    _seen.add(id(obj))
+
+    # Arrays, quantities and other buffers
+    nbytes = getattr(obj, 'nbytes', None)
+
+    if isinstance(nbytes, int):
+        return nbytes
+
+    size = sys.getsizeof(obj, 0)
+
+    if _depth >= _MAX_DEPTH:
+        return size
+
+    if isinstance(obj, dict):
+        children = list(obj.keys()) + list(obj.values())
+    elif isinstance(obj, (list, tuple, set, frozenset)):
+        children = obj
+    elif isinstance(obj, types.FunctionType):
+        children = [cell.cell_contents for cell in obj.__closure__ or ()
+                    if cell.cell_contents is not None] + \
+            list(obj.__defaults__ or ()) + \
+            list((obj.__kwdefaults__ or {}).values()) + \
+            [getattr(obj, '__wrapped__', None)]
+    elif isinstance(obj, types.MethodType):
+        children = [obj.__self__, obj.__func__]
+    elif hasattr(obj, '__dict__'):
+        children = [vars(obj)]
+    else:
+        children = ()
+
+    return size + sum(estimate_nbytes(x, _seen, _depth + 1)
+                      for x in children if x is not None)
+
+
+class OperationHistory:
+    """
+    History of the operations performed, bounded by a number of entries and
+    by the estimated memory held by the operations, which keep their
+    function, closure and arguments alive. The least recently used
+    operations are evicted first, but the last one is always kept.
+
+    Parameters
+    ----------
+    max_entries : int, optional
+        The maximum number of operations kept.
+    max_bytes : int, optional
+        The maximum estimated memory held by the operations kept, in bytes.
+    """
+    def __init__(self, max_entries=50, max_bytes=64 * 1024 ** 2):
+        self._entries = OrderedDict()
+        self._nbytes = 0
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __iter__(self):
+        return (operation for operation, nbytes in self._entries.values())
+
+    def __getitem__(self, index):
+        return list(self)[index]
+
+    @property
+    def nbytes(self):
+        """The estimated memory held by the operations kept, in bytes."""
+        return self._nbytes
+
+    def entries(self):
+        """
+        List the operations kept, from the least to the most recently used.
+
+        Returns
+        -------
+        list
+            ``(operation, nbytes)`` tuples, where ``nbytes`` is the estimated
+            memory held by the operation.
+        """
+        return list(self._entries.values())
+
+    def nbytes_of(self, operation):
+        """
+        The estimated memory held by an operation of the history, in bytes,
+        or `None` if the operation is not kept.
+        """
+        entry = self._entries.get(id(operation))
+
+        return entry[1] if entry is not None else None
+
+    def append(self, operation):
+        """
+        Add an operation to the history, evicting the least recently used
+        operations beyond the limits.
+        """
+        self.remove(operation)
+
+        nbytes = estimate_nbytes(operation)
+        self._entries[id(operation)] = (operation, nbytes)
+        self._nbytes += nbytes
+
+        self._evict()
+
+    def touch(self, operation):
+        """
+        Mark an operation of the history as the most recently used.
+        """
+        if id(operation) in self._entries:
+            self._entries.move_to_end(id(operation))
+
+    def remove(self, operation):
+        """
+        Remove an operation from the history, if it is kept.
+        """
+        entry = self._entries.pop(id(operation), None)
+
+        if entry is not None:
+            self._nbytes -= entry[1]
+
+    def set_limits(self, max_entries=None, max_bytes=None):
+        """
+        Change the limits of the history, evicting the operations beyond the
+        new limits.
+
+        Parameters
+        ----------
+        max_entries : int, optional
+            The maximum number of operations kept.
+        max_bytes : int, optional
+            The maximum estimated memory held by the operations, in bytes.
+        """
+        if max_entries is not None:
+            self.max_entries = max_entries
+
+        if max_bytes is not None:
+            self.max_bytes = max_bytes
+
+        self._evict()
+
+    def clear(self):
+        """
+        Remove all the operations.
+        """
+        self._entries.clear()
+        self._nbytes = 0
+
+    def _evict(self):
+        while len(self._entries) > 1 and (
+                len(self._entries) > self.max_entries or
+                self._nbytes > self.max_bytes):
+            operation, nbytes = self._entries.popitem(last=False)[1]
+            self._nbytes -= nbytes
 
 
 class StackOperation(type):
     """
     Meta class that stores the :class:`~FunctionalOperation` instance on an
-    operation stack that can be used again in the future.
+    operation stack that can be used again in the future. The stack is an
+    `OperationHistory`, bounded by number of operations and memory.
     """
-    _operations = []
+    _operations = OperationHistory()
 
     def __call__(cls, *args, **kwargs):
         """Append operation to stack on instantiation."""
@@ -29,6 +253,11 @@ class StackOperation(type):
     @classmethod
     def operations(cls):
         """All operations currently on the stack."""
+        return list(cls._operations)
+
+    @classmethod
+    def history(cls):
+        """The `OperationHistory` holding the operation stack."""
         return cls._operations
 
 
@@ -71,3 +300,37 @@ class FunctionalOperation(Operation):
     def __call__(self, flux, spectral_axis=None):
         """Call the operation."""
         return self.function(flux, spectral_axis, *self.args, **self.kwargs)
+
+    def batch(self, flux, spectral_axis=None):
+        """
+        Call the operation on a block of spectra sharing a spectral axis.
+
+        If a vectorised implementation of the function (or of the function
+        it wraps) is registered with `register_batch`, it is called once on
+        the whole block. Otherwise, the operation is called on each spectrum.
+
+        Parameters
+        ----------
+        flux : array-like
+            The fluxes of the spectra, of shape ``(n_spectra, n_pixels)``.
+        spectral_axis : array-like, optional
+            The spectral axis shared by the spectra.
+
+        Returns
+        -------
+        `~numpy.ndarray`
+            The resulting fluxes, of shape ``(n_spectra, n_pixels)``.
+        """
+        function = self.function
+
+        while function is not None:
+            batch_function = BATCH_FUNCTIONS.get(function)
+
+            if batch_function is not None:
+                return batch_function(flux, spectral_axis, *self.args,
+                                      **self.kwargs)
+
+            function = getattr(function, '__wrapped__', None)
+
+        return np.stack([np.asarray(self(row, spectral_axis))
+                         for row in flux])
@@ -0,0 +1,535 @@
+"""
+Pipelines of operations on spectra, evaluated with caching.
+
+A `Pipeline` is a directed acyclic graph whose source nodes hold spectra or
+data items, and whose operation nodes apply an operation (smoothing,
+arithmetic, unit conversion, continuum division, model fitting or
+evaluation, or any callable) to the results of their input nodes. The result of each node is
+cached under a key derived from the content of the source spectra upstream
+of it and from the parameters of the operations in between, so that editing
+the parameters of a node only recomputes the nodes downstream of it.
+
+Pipelines are part of the programmatic API: recipes (see `specviz.core.recipe`)
+run on them, while the operations of the GUI plugins are applied directly to
+the data items they act on.
+"""
+import hashlib
+from collections import OrderedDict
+
+import astropy.units as u
+import numpy as np
+from specutils import Spectrum1D
+from specutils.fitting import fit_generic_continuum
+
+from .analysis import evaluate_expression, fit_model, smooth
+from .buffers import buffer_digest, share_spectral_axis
+from .operations import Operation
+
+__all__ = ['OPERATIONS', 'spectrum_digest', 'ResultCache', 'SourceNode',
+           'OperationNode', 'Pipeline']
+
+
+def spectrum_digest(spectrum):
+    """
+    Compute a digest of the content of a spectrum: its flux, spectral axis,
+    uncertainty and mask.
+
+    Parameters
+    ----------
+    spectrum : :class:`~specutils.Spectrum1D`
+        The spectrum to hash.
+
+    Returns
+    -------
+    str
+        The hexadecimal digest.
+    """
+    digest = hashlib.sha1()
+    digest.update(buffer_digest(spectrum.flux).encode())
+    digest.update(buffer_digest(spectrum.spectral_axis).encode())
+
+    uncertainty = spectrum.uncertainty
+
+    if uncertainty is not None:
+        digest.update(type(uncertainty).__name__.encode())
+        digest.update(str(uncertainty.unit).encode())
+        digest.update(buffer_digest(uncertainty.array).encode())
+
+    if spectrum.mask is not None:
+        digest.update(buffer_digest(spectrum.mask).encode())
+
+    return digest.hexdigest()
+
+
+def _single_input(inputs):
+    if len(inputs) != 1:
+        raise ValueError("Operation takes a single input, got "
+                         "{}.".format(len(inputs)))
+
+    return next(iter(inputs.values()))
+
+
+def _smooth(inputs, kernel='box', size=3):
+    return smooth(_single_input(inputs), kernel, size)
+
+
+def _arithmetic(inputs, expression):
+    return evaluate_expression(expression, inputs)
+
+
+def _convert_units(inputs, flux_unit=None, spectral_axis_unit=None):
+    spectrum = _single_input(inputs)
+
+    if flux_unit is not None:
+        spectrum = spectrum.new_flux_unit(u.Unit(flux_unit))
+
+    if spectral_axis_unit is not None:
+        spectrum = spectrum.with_spectral_unit(u.Unit(spectral_axis_unit))
+
+    return spectrum
+
+
+def _derived_spectrum(spectrum, flux, uncertainty=None):
+    # The results of operations keep the uncertainty, mask and meta data of
+    # their input
+    return Spectrum1D(flux=flux, spectral_axis=spectrum.spectral_axis,
+                      uncertainty=uncertainty, mask=spectrum.mask,
+                      meta=spectrum.meta,
+                      velocity_convention=spectrum.velocity_convention,
+                      rest_value=spectrum.rest_value)
+
+
+def _scaled_uncertainty(uncertainty, factor):
+    # Standard deviations scale with the flux, variances with its square
+    power = {'std': 1, 'var': 2, 'ivar': -2}.get(
+        getattr(uncertainty, 'uncertainty_type', None))
+
+    if power is None:
+        return None
+
+    return uncertainty.__class__(uncertainty.array * np.abs(factor) ** power)
+
+
+def _divide_continuum(inputs, exclude_regions=None):
+    spectrum = _single_input(inputs)
+    continuum = fit_generic_continuum(spectrum,
+                                      exclude_regions=exclude_regions)
+    continuum = u.Quantity(continuum(spectrum.spectral_axis),
+                           spectrum.flux.unit)
+
+    return _derived_spectrum(
+        spectrum, spectrum.flux / continuum,
+        uncertainty=_scaled_uncertainty(spectrum.uncertainty,
+                                        1 / continuum.value))
+
+
+def _evaluate_model(inputs, model):
+    spectrum = _single_input(inputs)
+    flux = u.Quantity(model(spectrum.spectral_axis), spectrum.flux.unit)
+
+    return _derived_spectrum(spectrum, flux, uncertainty=spectrum.uncertainty)
+
+
+def _fit_model(inputs, model, region=None, fitter='Levenberg-Marquardt'):
+    return _evaluate_model(inputs, fit_model(_single_input(inputs), model,
+                                             region=region, fitter=fitter))
+
+
+#: The operations available to pipelines by name. Each operation is called
+#: with an ordered mapping of the names of the input nodes to their spectra,
+#: and with the parameters of the node as keyword arguments, and returns a
+#: :class:`~specutils.Spectrum1D`.
+OPERATIONS = {
+    'smooth': _smooth,
+    'arithmetic': _arithmetic,
+    'convert_units': _convert_units,
+    'divide_continuum': _divide_continuum,
+    'evaluate_model': _evaluate_model,
+    'fit_model': _fit_model,
+}
+
+
+def _recorded_operation(operation):
+    """
+    Apply an `~specviz.core.operations.Operation` recorded on the operation
+    stack, which maps a flux and spectral axis to a new flux, to a single
+    input.
+    """
+    def apply(inputs):
+        spectrum = _single_input(inputs)
+        flux = operation(spectrum.flux, spectrum.spectral_axis)
+
+        return _derived_spectrum(spectrum,
+                                 u.Quantity(flux, spectrum.flux.unit))
+
+    return apply
+
+
+class ResultCache:
+    """
+    Least recently used cache of the results of pipeline nodes.
+
+    Parameters
+    ----------
+    max_entries : int, optional
+        The maximum number of results kept.
+    """
+    def __init__(self, max_entries=256):
+        self._results = OrderedDict()
+        self._max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self):
+        return len(self._results)
+
+    def get(self, key):
+        """
+        Get a cached result, or `None` if it is not cached.
+        """
+        result = self._results.get(key)
+
+        if result is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+            self._results.move_to_end(key)
+
+        return result
+
+    def put(self, key, result):
+        """
+        Cache a result, evicting the least recently used results beyond the
+        maximum number of entries.
+        """
+        self._results[key] = result
+        self._results.move_to_end(key)
+
+        while len(self._results) > self._max_entries:
+            self._results.popitem(last=False)
+
+    def clear(self):
+        """
+        Drop all the cached results.
+        """
+        self._results.clear()
+
+
+class SourceNode:
+    """
+    A node of a pipeline holding input data.
+
+    Parameters
+    ----------
+    name : str
+        The name of the node.
+    data : :class:`~specutils.Spectrum1D` or :class:`~specviz.core.items.DataItem`
+        The input spectrum, or the data item holding it. The content of a
+        data item is only hashed again when its data version changes, while
+        a spectrum modified in place must be set again with `set_data`.
+    """
+    def __init__(self, name, data):
+        self.name = name
+        self.inputs = []
+        self.set_data(data)
+
+    @property
+    def spectrum(self):
+        """The input spectrum."""
+        return getattr(self._data, 'spectrum', self._data)
+
+    def set_data(self, data):
+        """
+        Replace the input data of the node.
+        """
+        self._data = data
+        self._digest = None
+        self._digest_version = None
+
+    @property
+    def key(self):
+        """The digest of the content of the input spectrum."""
+        version = getattr(self._data, 'data_version', None)
+
+        if self._digest is None or version != self._digest_version:
+            self._digest = spectrum_digest(self.spectrum)
+            self._digest_version = version
+
+        return self._digest
+
+
+class OperationNode:
+    """
+    A node of a pipeline applying an operation to the results of other
+    nodes.
+
+    Parameters
+    ----------
+    name : str
+        The name of the node.
+    operation : str, callable or `~specviz.core.operations.Operation`
+        The name of the operation in `OPERATIONS`, a callable with the same
+        signature, or an operation recorded on the operation stack (e.g. by
+        the smoothing plugin), applied to the flux of a single input.
+    inputs : list
+        The input nodes.
+    parameters : dict
+        The keyword arguments of the operation. Their ``repr`` is part of
+        the cache key of the node, so it must identify their value (as it
+        does for numbers, strings, quantities and astropy models).
+    """
+    def __init__(self, name, operation, inputs, parameters):
+        if isinstance(operation, str):
+            if operation not in OPERATIONS:
+                raise ValueError("Unknown operation '{}', must be one of {} "
+                                 "or a callable.".format(operation,
+                                                         list(OPERATIONS)))
+
+            self.operation_name = operation
+            operation = OPERATIONS[operation]
+        elif isinstance(operation, Operation):
+            # Recorded operations hold their own parameters
+            self.operation_name = "{}({!r}, {!r}, {!r})".format(
+                getattr(operation.function, '__qualname__', operation.name),
+                operation.name, operation.args,
+                sorted(operation.kwargs.items()))
+            operation = _recorded_operation(operation)
+        else:
+            self.operation_name = "{}.{}".format(operation.__module__,
+                                                 operation.__qualname__)
+
+        self.name = name
+        self.operation = operation
+        self.inputs = list(inputs)
+        self.parameters = dict(parameters)
+
+    @property
+    def key(self):
+        """
+        The digest of the operation, its parameters and the keys of its
+        inputs, which identifies the result of the node.
+        """
+        digest = hashlib.sha1()
+        digest.update(self.operation_name.encode())
+        digest.update(repr(sorted(self.parameters.items())).encode())
+
+        for node in self.inputs:
+            digest.update(node.name.encode())
+            digest.update(node.key.encode())
+
+        return digest.hexdigest()
+
+    def __call__(self, inputs):
+        return self.operation(inputs, **self.parameters)
+
+
+class Pipeline:
+    """
+    A directed acyclic graph of operations on spectra, whose node results
+    are cached.
+
+    Nodes can only take nodes added before them as inputs, which keeps the
+    graph acyclic. Evaluating a node evaluates the nodes upstream of it whose
+    results are not cached, so that after the parameters of a node or the
+    input data of a source are edited, only the nodes downstream of it are
+    recomputed.
+
+    Parameters
+    ----------
+    cache : `ResultCache`, optional
+        The cache of the results. Pipelines can share a cache.
+
+    Examples
+    --------
+    >>> pipeline = Pipeline()  # doctest: +SKIP
+    >>> pipeline.add_source('data', spectrum)  # doctest: +SKIP
+    >>> pipeline.add_operation('smoothed', 'smooth', ['data'], size=5)  # doctest: +SKIP
+    >>> pipeline.add_operation('normalized', 'divide_continuum', ['smoothed'])  # doctest: +SKIP
+    >>> pipeline.evaluate('normalized')  # doctest: +SKIP
+    >>> pipeline.set_parameters('smoothed', size=9)  # doctest: +SKIP
+    """
+    def __init__(self, cache=None):
+        self._nodes = OrderedDict()
+        self._cache = cache if cache is not None else ResultCache()
+
+    def __len__(self):
+        return len(self._nodes)
+
+    def __contains__(self, name):
+        return name in self._nodes
+
+    def __getitem__(self, name):
+        return self._nodes[name]
+
+    @property
+    def cache(self):
+        """The `ResultCache` of the results of the nodes."""
+        return self._cache
+
+    @property
+    def names(self):
+        """The names of the nodes, in the order added."""
+        return list(self._nodes)
+
+    def _add(self, node):
+        if node.name in self._nodes:
+            raise ValueError("Pipeline already has a node named "
+                             "'{}'.".format(node.name))
+
+        self._nodes[node.name] = node
+
+        return node
+
+    def add_source(self, name, data):
+        """
+        Add a source node.
+
+        Parameters
+        ----------
+        name : str
+            The name of the node.
+        data : :class:`~specutils.Spectrum1D` or :class:`~specviz.core.items.DataItem`
+            The input spectrum, or the data item holding it.
+
+        Returns
+        -------
+        `SourceNode`
+            The new node.
+        """
+        return self._add(SourceNode(name, data))
+
+    def add_operation(self, name, operation, inputs, **parameters):
+        """
+        Add an operation node.
+
+        Parameters
+        ----------
+        name : str
+            The name of the node.
+        operation : str, callable or `~specviz.core.operations.Operation`
+            The name of the operation in `OPERATIONS`, a callable taking the
+            ordered mapping of input names to spectra and the parameters as
+            keyword arguments, or an operation recorded on the operation
+            stack.
+        inputs : list of str
+            The names of the input nodes.
+        parameters : dict
+            The parameters of the operation.
+
+        Returns
+        -------
+        `OperationNode`
+            The new node.
+        """
+        missing = [x for x in inputs if x not in self._nodes]
+
+        if missing:
+            raise KeyError("Unknown input nodes {}.".format(missing))
+
+        return self._add(OperationNode(name, operation,
+                                       [self._nodes[x] for x in inputs],
+                                       parameters))
+
+    def set_parameters(self, name, **parameters):
+        """
+        Update the parameters of an operation node. The nodes downstream of
+        it are recomputed when next evaluated.
+
+        Parameters
+        ----------
+        name : str
+            The name of the node.
+        parameters : dict
+            The parameters to update.
+        """
+        self._nodes[name].parameters.update(parameters)
+
+    def set_data(self, name, data):
+        """
+        Replace the input data of a source node. The nodes downstream of it
+        are recomputed when next evaluated.
+
+        Parameters
+        ----------
+        name : str
+            The name of the source node.
+        data : :class:`~specutils.Spectrum1D` or :class:`~specviz.core.items.DataItem`
+            The input spectrum, or the data item holding it.
+        """
+        self._nodes[name].set_data(data)
+
+    def downstream(self, name):
+        """
+        The names of the nodes depending, directly or not, on a node.
+
+        Parameters
+        ----------
+        name : str
+            The name of the node.
+
+        Returns
+        -------
+        list
+            The names of the dependent nodes, in the order added.
+        """
+        affected = {self._nodes[name]}
+        names = []
+
+        for node in self._nodes.values():
+            if any(x in affected for x in node.inputs):
+                affected.add(node)
+                names.append(node.name)
+
+        return names
+
+    def remove(self, name):
+        """
+        Remove a node that no other node depends on.
+
+        Parameters
+        ----------
+        name : str
+            The name of the node.
+        """
+        dependents = self.downstream(name)
+
+        if dependents:
+            raise ValueError("Cannot remove node '{}', nodes {} depend on "
+                             "it.".format(name, dependents))
+
+        del self._nodes[name]
+
+    def evaluate(self, name):
+        """
+        Compute the result of a node, reusing the cached results of the node
+        and of the nodes upstream of it whenever their inputs and parameters
+        did not change.
+
+        Parameters
+        ----------
+        name : str
+            The name of the node.
+
+        Returns
+        -------
+        :class:`~specutils.Spectrum1D`
+            The result of the node.
+        """
+        node = self._nodes[name]
+
+        if isinstance(node, SourceNode):
+            return node.spectrum
+
+        key = node.key
+        result = self._cache.get(key)
+
+        if result is None:
+            inputs = OrderedDict((x.name, self.evaluate(x.name))
+                                 for x in node.inputs)
+
+            # Results on the same grid as their inputs share its axis
+            result = share_spectral_axis(node(inputs))
+
+            self._cache.put(key, result)
+
+        return result
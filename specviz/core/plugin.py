@@ -1,13 +1,145 @@
 from qtpy.QtGui import QIcon
-from qtpy.QtWidgets import QAction, QApplication, QWidget, QMenu, QToolButton, QToolBar
+from qtpy.QtWidgets import (QAction, QApplication, QWidget, QMenu, QToolButton,
+                            QToolBar, QVBoxLayout)
 from qtpy.QtCore import Signal
+from collections import OrderedDict
 from functools import wraps
+import importlib
 import inspect
 import logging
 
 from .hub import Hub
 
-__all__ = ['DecoratorRegistry', 'Plugin', 'plugin']
+__all__ = ['DecoratorRegistry', 'Plugin', 'PluginAction', 'PluginEntry',
+           'PluginInstances', 'plugin']
+
+
+def _instantiate(cls, workspace):
+    """
+    Instantiate a plugin class in a workspace. The hub of the workspace is set
+    on the instance, before it is initialized since plugins use it in their
+    ``__init__``, rather than on the class shared by all the workspaces.
+    """
+    instance = cls.__new__(cls)
+    instance.hub = Hub(workspace)
+    instance.__init__()
+
+    return instance
+
+
+class PluginAction:
+    """
+    Description of a tool bar or plot bar action of a declared plugin, used to
+    add the action before the plugin is imported.
+
+    Parameters
+    ----------
+    name : str
+        The text of the action.
+    method : str
+        The name of the method of the plugin class called when the action is
+        triggered, as decorated with `Plugin.tool_bar` or `Plugin.plot_bar`.
+    type : {'tool_bar', 'plot_bar'}, optional
+        The tool bar the action is added to.
+    icon : str, optional
+        The resource path of the icon of the action.
+    location : int or str, optional
+        The position of the action in the tool bar, or the ``/`` separated
+        path of the menu the action is added to.
+    """
+    def __init__(self, name, method, type='tool_bar', icon=None,
+                 location=None):
+        self.name = name
+        self.method = method
+        self.type = type
+        self.icon = icon
+        self.location = location
+
+
+class PluginEntry:
+    """
+    Description of a plugin, declared with `Plugin.declare` so that its tool
+    bar, plot bar and plugin bar entries are added to the workspaces without
+    importing the plugin. The module defining the plugin is imported, and the
+    plugin instantiated, the first time it is used.
+
+    Parameters
+    ----------
+    name : str
+        Name of the plugin, as given to its decorator.
+    module : str
+        The absolute name of the module defining the plugin.
+    attribute : str
+        The name of the decorated plugin class in the module.
+    type : {`None`, 'plugin_bar'}, optional
+        'plugin_bar' for plugins displayed as a tab of the plugin bar.
+    icon : str, optional
+        The resource path of the icon of the plugin bar tab.
+    priority : int, optional
+        The priority of the plugin, as given to its decorator.
+    actions : list of `PluginAction`, optional
+        The actions triggering the plugin.
+    """
+    def __init__(self, name, module, attribute, type=None, icon=None,
+                 priority=0, actions=()):
+        self.name = name
+        self.module = module
+        self.attribute = attribute
+        self.type = type
+        self.icon = icon
+        self.priority = priority
+        self.actions = list(actions)
+
+
+class PluginInstances(dict):
+    """
+    The plugins instantiated in a workspace by name. Accessing a declared
+    plugin that is not instantiated yet instantiates it.
+
+    Parameters
+    ----------
+    workspace : `~specviz.widgets.workspace.Workspace`
+        The workspace of the plugins.
+    plugin_bar : bool, optional
+        Whether the mapping holds the plugin bar plugins, rather than the
+        other plugins.
+    """
+    def __init__(self, workspace, plugin_bar=False):
+        super().__init__()
+
+        self._workspace = workspace
+        self._type = 'plugin_bar' if plugin_bar else None
+
+    def __missing__(self, name):
+        entry = plugin.entries.get(name)
+
+        if entry is None or entry.type != self._type:
+            raise KeyError(name)
+
+        return plugin.instance(self._workspace, name)
+
+    def get(self, name, default=None):
+        """
+        Get the instance of a plugin, instantiating declared plugins on first
+        access, or ``default`` if no plugin has the given name.
+        """
+        try:
+            return self[name]
+        except KeyError:
+            return default
+
+
+class _PluginBarPlaceholder(QWidget):
+    """
+    Tab of the plugin bar holding a declared plugin, once instantiated.
+    """
+    def __init__(self, entry, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+
+        self.entry = entry
+
+        layout = QVBoxLayout(self)
+        layout.setContentsMargins(0, 0, 0, 0)
 
 
 class DecoratorRegistry:
@@ -75,9 +207,35 @@ class Plugin(DecoratorRegistry):
 
             @plugin.tool_bar("Open Custom Dialog", icon=...)
             def open_dialog(self):
+
+    Plugins whose entries are also declared with `Plugin.declare` are only
+    imported and instantiated when first used.
     """
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+
+        self._entries = OrderedDict()
 
-    def __call__(self, name, priority=0):
+    @property
+    def entries(self):
+        """
+        The declared plugins, as a mapping of names to `PluginEntry` objects.
+        """
+        return self._entries
+
+    def declare(self, entry):
+        """
+        Declare a plugin, so that its entries are added to the workspaces
+        without importing it.
+
+        Parameters
+        ----------
+        entry : `PluginEntry`
+            The description of the plugin.
+        """
+        self._entries[entry.name] = entry
+
+    def __call__(self, name, priority=None):
         """
         Wraps the class and adds the decorated class to the registry.
 
@@ -85,8 +243,10 @@ class Plugin(DecoratorRegistry):
         ----------
         name : str
             Name of plugin.
-        priority : int
+        priority : int, optional
             The priority of when this plugin is loaded. Lower == sooner.
+            Defaults to the priority of the declared plugin (see
+            `Plugin.declare`), or to 0.
 
         Returns
         -------
@@ -104,7 +264,8 @@ class Plugin(DecoratorRegistry):
 
             cls.wrapped = True
             cls.type = None
-            cls.priority = priority
+            cls.priority = self._declared(name, 'priority', priority, 0)
+            cls.plugin_name = name
 
             @wraps(cls)
             def cls_wrapper(workspace, filt=None, *args, **kwargs):
@@ -116,8 +277,7 @@ class Plugin(DecoratorRegistry):
                 if workspace is None:
                     return
 
-                cls.hub = Hub(workspace)
-                plugin = cls()
+                plugin = _instantiate(cls, workspace)
 
                 workspace._plugins[name] = plugin
 
@@ -130,11 +290,44 @@ class Plugin(DecoratorRegistry):
 
                 return plugin
 
+            cls_wrapper.plugin_name = name
+
             self._registry.append(cls_wrapper)
 
             return cls_wrapper
         return plugin_decorator
 
+    def _declared(self, name, attribute, value, default=None):
+        """
+        Return the value of a decorator argument, defaulting to the attribute
+        of the plugin declared with the given name.
+        """
+        if value is None:
+            value = getattr(self._entries.get(name), attribute, None)
+
+        return default if value is None else value
+
+    def _action_options(self, instance, func, name, icon, location):
+        """
+        Complete the arguments of a tool or plot bar decorator with those of
+        the action declared for the decorated method, if any.
+        """
+        entry = self._entries.get(getattr(instance, 'plugin_name', None))
+        action = next((x for x in getattr(entry, 'actions', [])
+                       if x.method == func.__name__), None)
+
+        if action is not None:
+            name = name if name is not None else action.name
+            icon = icon if icon is not None else self._icon(action.icon)
+            location = location if location is not None else action.location
+
+        return name, icon, location
+
+    @staticmethod
+    def _icon(icon):
+        # Declarations give the resource paths of the icons
+        return QIcon(icon) if isinstance(icon, str) else icon
+
     def mount(self, workspace, filt=None):
         """
         Load all the plugins in the registry into the specified workspace.
@@ -147,10 +340,157 @@ class Plugin(DecoratorRegistry):
             The type of plugin to load. If not specified, all plugins are
             loaded.
         """
-        for plugin in sorted(self.registry, key=lambda x: -x.priority):
-            plugin(workspace, filt=filt)
+        # Plugins imported at startup are mounted by calling their decorator
+        # wrappers, declared plugins from their entries
+        mounts = [(x.priority, lambda x=x: x(workspace, filt=filt))
+                  for x in self.registry if x.plugin_name not in self._entries]
+        mounts += [(x.priority,
+                    lambda x=x: self._mount_entry(workspace, x, filt=filt))
+                   for x in self._entries.values()]
+
+        if filt is None:
+            workspace.plugin_tab_widget.currentChanged.connect(
+                lambda index: self._on_plugin_tab_changed(workspace, index))
+
+        for priority, mount in sorted(mounts, key=lambda x: -x[0]):
+            mount()
+
+    def _mount_entry(self, workspace, entry, filt=None):
+        """
+        Add the tab and the actions of a declared plugin to a workspace.
+        """
+        if filt is None and entry.type == 'plugin_bar':
+            icon = QIcon(entry.icon) if entry.icon is not None else QIcon()
+
+            workspace.plugin_tab_widget.addTab(
+                _PluginBarPlaceholder(entry), icon, entry.name)
+
+        for action in entry.actions:
+            if filt is not None and action.type != filt:
+                continue
+
+            icon = QIcon(action.icon) if action.icon is not None else None
+            callback = (lambda entry=entry, action=action:
+                        self._trigger(workspace, entry, action))
+
+            if action.type == 'plot_bar':
+                self._add_plot_bar_action(workspace, action.name, icon,
+                                          action.location, callback)
+            else:
+                self._add_tool_bar_action(workspace, action.name, icon,
+                                          action.location, callback)
+
+    def _trigger(self, workspace, entry, action):
+        """
+        Call the method of a declared plugin triggered by an action,
+        instantiating the plugin if needed.
+        """
+        instance = self.instance(workspace, entry.name)
+        method = getattr(type(instance), action.method)
+
+        # Call the decorated method rather than its wrapper adding the action
+        getattr(method, '__wrapped__', method)(instance)
+
+    def _on_plugin_tab_changed(self, workspace, index):
+        widget = workspace.plugin_tab_widget.widget(index)
+
+        if isinstance(widget, _PluginBarPlaceholder):
+            self.instance(workspace, widget.entry.name)
+
+    def instance(self, workspace, name):
+        """
+        Get the instance of a declared plugin in a workspace, importing and
+        instantiating the plugin if it is used for the first time.
 
-    def plugin_bar(self, name, icon, priority=0):
+        Parameters
+        ----------
+        workspace : `~specviz.widgets.workspace.Workspace`
+            The workspace the plugin is used in.
+        name : str
+            The name of the declared plugin.
+
+        Returns
+        -------
+        object
+            The plugin instance.
+        """
+        entry = self._entries[name]
+        instances = (workspace._plugin_bars if entry.type == 'plugin_bar'
+                     else workspace._plugins)
+
+        if name in instances:
+            return instances[name]
+
+        logging.info("Loading plugin '%s'.", name)
+
+        cls = getattr(importlib.import_module(entry.module), entry.attribute)
+        cls = getattr(cls, '__wrapped__', cls)
+
+        instance = _instantiate(cls, workspace)
+
+        instances[name] = instance
+
+        if entry.type == 'plugin_bar':
+            tab_widget = workspace.plugin_tab_widget
+
+            for i in range(tab_widget.count()):
+                placeholder = tab_widget.widget(i)
+
+                if isinstance(placeholder, _PluginBarPlaceholder) and \
+                        placeholder.entry is entry:
+                    placeholder.layout().addWidget(instance)
+                    break
+
+        return instance
+
+    def _add_tool_bar_action(self, workspace, name, icon, location, callback):
+        """
+        Add an action to the tool bar of a workspace.
+        """
+        parent = workspace.main_tool_bar
+        action = QAction(parent)
+        action.setText(name)
+
+        if icon is not None:
+            action.setIcon(icon)
+
+        if location is not None and isinstance(location, str):
+            for level in location.split('/'):
+                parent = self.get_action(parent, level)
+
+        if isinstance(location, int):
+            parent.insertAction(parent.actions()[location], action)
+        else:
+            parent.addAction(action)
+
+        action.triggered.connect(callback)
+
+    def _add_plot_bar_action(self, workspace, name, icon, location, callback):
+        """
+        Add an action to the tool bar of the current plot window of a
+        workspace, if any.
+        """
+        if workspace.current_plot_window is None:
+            return
+
+        parent = workspace.current_plot_window.tool_bar
+        action = QAction(parent)
+
+        action.setText(name)
+
+        if icon is not None:
+            action.setIcon(icon)
+
+        if location is not None and isinstance(location, str):
+            for level in location.split('/'):
+                parent = self.get_action(parent, level)
+
+        before_action = [x for x in parent.actions()
+                         if x.isSeparator()].pop()
+        parent.insertAction(before_action, action)
+        action.triggered.connect(callback)
+
+    def plugin_bar(self, name, icon=None, priority=None):
         """
         Generate a decorator for a callback method that can be triggered by a
         tab on the right of the window.
@@ -160,11 +500,15 @@ class Plugin(DecoratorRegistry):
         name : str
             The name of the tab
         icon : `~PyQt5.QtGui.QIcon`, optional
-            The icon for the tab
+            The icon for the tab. Defaults to the icon of the declared
+            plugin (see `Plugin.declare`).
         priority : int, optional
             The priority to use to load in the plugins - a higher value means
-            the plugin will be loaded sooner.
+            the plugin will be loaded sooner. Defaults to the priority of the
+            declared plugin, or to 0.
         """
+        icon = self._icon(self._declared(name, 'icon', icon, QIcon()))
+        priority = self._declared(name, 'priority', priority, 0)
 
         def plugin_bar_decorator(cls):
             """
@@ -175,6 +519,7 @@ class Plugin(DecoratorRegistry):
             cls.wrapped = True
             cls.type = 'plugin_bar'
             cls.priority = priority
+            cls.plugin_name = name
 
             @wraps(cls)
             def cls_wrapper(workspace, *args, **kwargs):
@@ -185,8 +530,7 @@ class Plugin(DecoratorRegistry):
                 if workspace is None:
                     return
 
-                cls.hub = Hub(workspace)
-                plugin = cls()
+                plugin = _instantiate(cls, workspace)
 
                 workspace._plugin_bars[name] = plugin
 
@@ -219,23 +563,28 @@ class Plugin(DecoratorRegistry):
                         [meth(workspace) for meth_name, meth in members
                          if hasattr(meth, 'wrapped')]
 
+            cls_wrapper.plugin_name = name
+
             self.registry.append(cls_wrapper)
 
             return cls_wrapper
         return plugin_bar_decorator
 
-    def tool_bar(self, name, icon=None, location=None, priority=0):
+    def tool_bar(self, name=None, icon=None, location=None, priority=0):
         """
         Generate a decorator for a callback method that can be triggered by a
         button in the application tool bar.
 
+        The arguments not given default to those of the action declared for
+        the decorated method (see `Plugin.declare`), if any.
+
         Parameters
         ----------
-        name : str
+        name : str, optional
             The name of the tool to add
-        icon : `~PyQt5.QtGui.QIcon`
+        icon : `~PyQt5.QtGui.QIcon`, optional
             The icon for the tool
-        location : int
+        location : int, optional
             If specified, can be used to customize the position of the icon in
             the tool bar.
         priority : int, optional
@@ -263,41 +612,31 @@ class Plugin(DecoratorRegistry):
                 if workspace is None:
                     return
 
-                parent = workspace.main_tool_bar
-                action = QAction(parent)
-                action.setText(name)
-
-                if icon is not None:
-                    action.setIcon(icon)
-
-                if location is not None and isinstance(location, str):
-                    for level in location.split('/'):
-                        parent = self.get_action(parent, level)
-
-                if isinstance(location, int):
-                    parent.insertAction(parent.actions()[location], action)
-                else:
-                    parent.addAction(action)
-
-                action.triggered.connect(lambda: func(plugin, *args, **kwargs))
+                self._add_tool_bar_action(
+                    workspace, *self._action_options(plugin, func, name, icon,
+                                                     location),
+                    lambda: func(plugin, *args, **kwargs))
 
             # self.registry.append(func_wrapper)
 
             return func_wrapper
         return tool_bar_decorator
 
-    def plot_bar(self, name, icon=None, location=None, priority=0):
+    def plot_bar(self, name=None, icon=None, location=None, priority=0):
         """
         Generate a decorator for a callback method that can be triggered by a
         button in the plot tool bar.
 
+        The arguments not given default to those of the action declared for
+        the decorated method (see `Plugin.declare`), if any.
+
         Parameters
         ----------
-        name : str
+        name : str, optional
             The name of the tool to add
-        icon : `~PyQt5.QtGui.QIcon`
+        icon : `~PyQt5.QtGui.QIcon`, optional
             The icon for the tool
-        location : int
+        location : int, optional
             If specified, can be used to customize the position of the icon in
             the tool bar.
         priority : int, optional
@@ -325,25 +664,10 @@ class Plugin(DecoratorRegistry):
                 if workspace is None:
                     return
 
-                if workspace.current_plot_window is None:
-                    return
-
-                parent = workspace.current_plot_window.tool_bar
-                action = QAction(parent)
-
-                action.setText(name)
-
-                if icon is not None:
-                    action.setIcon(icon)
-
-                if location is not None and isinstance(location, str):
-                    for level in location.split('/'):
-                        parent = self.get_action(parent, level)
-
-                before_action = [x for x in parent.actions()
-                                 if x.isSeparator()].pop()
-                parent.insertAction(before_action, action)
-                action.triggered.connect(lambda: func(plugin, *args, **kwargs))
+                self._add_plot_bar_action(
+                    workspace, *self._action_options(plugin, func, name, icon,
+                                                     location),
+                    lambda: func(plugin, *args, **kwargs))
 
             # self.registry.append(func_wrapper)
 
@@ -0,0 +1,269 @@
+"""
+Recipes of operations on spectra, saved to files and replayed in batch.
+
+A `Recipe` is a sequence of steps, each naming an operation of
+:data:`~specviz.core.pipeline.OPERATIONS` and its parameters, applied in turn
+to a spectrum. Recipes are written to JSON files, e.g.::
+
+    {
+        "version": 1,
+        "steps": [
+            {"operation": "smooth", "kernel": "box", "size": 5},
+            {"operation": "convert_units", "spectral_axis_unit": "um"},
+            {"operation": "arithmetic", "expression": "{step 2} * 2"},
+            {"operation": "fit_model", "model": "lines.smf",
+             "region": [6500, 6600, "Angstrom"]}
+        ]
+    }
+
+The arithmetic expressions refer to the input spectrum as ``{input}`` and to
+the result of the n-th step as ``{step n}``. The models of the ``fit_model``
+and ``evaluate_model`` steps are read from the files saved by the model
+editor, whose paths are relative to the recipe file, and are summed.
+"""
+import json
+import os
+import pickle
+from functools import reduce
+
+import astropy.units as u
+from specutils import SpectralRegion
+
+from .analysis import KERNEL_REGISTRY
+from .operations import FunctionalOperation
+from .pipeline import OPERATIONS, Pipeline
+
+__all__ = ['RECIPE_VERSION', 'Recipe']
+
+#: Version of the recipe format written by `Recipe.save`
+RECIPE_VERSION = 1
+
+_INPUT = 'input'
+
+
+def _step_name(index):
+    return "step {}".format(index + 1)
+
+
+def _smoothing_step(operation):
+    """
+    Find the smoothing kernel applied by an operation recorded by the
+    smoothing plugin, through the wrappers of the smoothing function.
+    """
+    function = operation.function
+
+    while function is not None:
+        for kernel, entry in KERNEL_REGISTRY.items():
+            if entry["function"] is function:
+                return {'operation': 'smooth', 'kernel': kernel,
+                        'size': operation.args[0]}
+
+        function = getattr(function, '__wrapped__', None)
+
+
+class Recipe:
+    """
+    A sequence of operations applied to a spectrum.
+
+    Parameters
+    ----------
+    steps : list of dict
+        The steps, each holding the name of the operation in
+        :data:`~specviz.core.pipeline.OPERATIONS` under ``'operation'`` and
+        the parameters of the operation.
+    base_path : str, optional
+        The directory the paths of the model files are relative to.
+
+    Raises
+    ------
+    ValueError
+        If a step names an unknown operation.
+    """
+    def __init__(self, steps, base_path=None):
+        self.steps = [dict(step) for step in steps]
+        self.base_path = base_path or os.curdir
+        self._models = {}
+
+        for step in self.steps:
+            if step.get('operation') not in OPERATIONS:
+                raise ValueError("Unknown operation '{}' in recipe, must be "
+                                 "one of {}.".format(step.get('operation'),
+                                                     list(OPERATIONS)))
+
+    def __len__(self):
+        return len(self.steps)
+
+    @classmethod
+    def from_operations(cls, operations=None):
+        """
+        Create a recipe replaying the operations recorded on the operation
+        stack.
+
+        Parameters
+        ----------
+        operations : list, optional
+            The `~specviz.core.operations.FunctionalOperation` objects, in
+            the order applied. Defaults to the operations on the stack.
+
+        Returns
+        -------
+        `Recipe`
+            The recipe.
+
+        Raises
+        ------
+        ValueError
+            If an operation cannot be written to a recipe.
+        """
+        if operations is None:
+            operations = FunctionalOperation.operations()
+
+        steps = []
+
+        for operation in operations:
+            step = _smoothing_step(operation)
+
+            if step is None:
+                raise ValueError("Operation '{}' cannot be written to a "
+                                 "recipe.".format(operation.name))
+
+            steps.append(step)
+
+        return cls(steps)
+
+    def to_dict(self):
+        """
+        The JSON-serialisable representation of the recipe.
+        """
+        return {'version': RECIPE_VERSION, 'steps': self.steps}
+
+    @classmethod
+    def from_dict(cls, state, base_path=None):
+        """
+        Create a recipe from its representation.
+
+        Parameters
+        ----------
+        state : dict
+            The representation returned by `Recipe.to_dict`.
+        base_path : str, optional
+            The directory the paths of the model files are relative to.
+
+        Returns
+        -------
+        `Recipe`
+            The recipe.
+        """
+        version = state.get('version', RECIPE_VERSION)
+
+        if version > RECIPE_VERSION:
+            raise ValueError("Recipe version {} is not supported by this "
+                             "version of specviz.".format(version))
+
+        return cls(state['steps'], base_path=base_path)
+
+    def save(self, path):
+        """
+        Write the recipe to a JSON file.
+
+        Parameters
+        ----------
+        path : str
+            The path of the file, overwritten if it exists.
+        """
+        with open(path, 'w') as f:
+            json.dump(self.to_dict(), f, indent=4)
+
+    @classmethod
+    def load(cls, path):
+        """
+        Read a recipe from a JSON file.
+
+        Parameters
+        ----------
+        path : str
+            The path of the file.
+
+        Returns
+        -------
+        `Recipe`
+            The recipe, whose model file paths are relative to the directory
+            of the file.
+        """
+        with open(path) as f:
+            state = json.load(f)
+
+        return cls.from_dict(state,
+                             base_path=os.path.dirname(os.path.abspath(path)))
+
+    def _model(self, path):
+        path = os.path.join(self.base_path, path)
+
+        if path not in self._models:
+            with open(path, 'rb') as handle:
+                models = pickle.load(handle)
+
+            self._models[path] = reduce(lambda x, y: x + y, models.values())
+
+        return self._models[path]
+
+    def _parameters(self, step):
+        parameters = {k: v for k, v in step.items() if k != 'operation'}
+
+        if isinstance(parameters.get('model'), str):
+            parameters['model'] = self._model(parameters['model'])
+
+        if isinstance(parameters.get('region'), list):
+            lower, upper, unit = parameters['region']
+            parameters['region'] = SpectralRegion(lower * u.Unit(unit),
+                                                  upper * u.Unit(unit))
+
+        return parameters
+
+    def pipeline(self, spectrum):
+        """
+        Build the pipeline applying the recipe to a spectrum.
+
+        Parameters
+        ----------
+        spectrum : :class:`~specutils.Spectrum1D`
+            The input spectrum, held by the ``input`` source node.
+
+        Returns
+        -------
+        `~specviz.core.pipeline.Pipeline`
+            The pipeline, whose last node holds the result of the recipe.
+        """
+        pipeline = Pipeline()
+        pipeline.add_source(_INPUT, spectrum)
+
+        for i, step in enumerate(self.steps):
+            # Expressions may refer to the input and to any previous result
+            if step['operation'] == 'arithmetic':
+                inputs = pipeline.names
+            else:
+                inputs = [pipeline.names[-1]]
+
+            pipeline.add_operation(_step_name(i), step['operation'], inputs,
+                                   **self._parameters(step))
+
+        return pipeline
+
+    def apply(self, spectrum):
+        """
+        Apply the recipe to a spectrum.
+
+        Parameters
+        ----------
+        spectrum : :class:`~specutils.Spectrum1D`
+            The input spectrum.
+
+        Returns
+        -------
+        :class:`~specutils.Spectrum1D`
+            The result of the last step, or the input spectrum if the recipe
+            has no steps.
+        """
+        pipeline = self.pipeline(spectrum)
+
+        return pipeline.evaluate(pipeline.names[-1])
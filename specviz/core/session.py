@@ -0,0 +1,265 @@
+import importlib
+import json
+import os
+import pickle
+import uuid
+
+import astropy.units as u
+import numpy as np
+from specutils import Spectrum1D
+
+from .buffers import buffer_digest
+
+__all__ = ['SESSION_VERSION', 'save_session', 'load_session']
+
+#: Version of the session format written by `save_session`
+SESSION_VERSION = 1
+
+_MANIFEST = 'session.json'
+_STATE = 'state.pkl'
+_ARRAYS = 'arrays'
+
+
+def _qualified_name(cls):
+    return "{}.{}".format(cls.__module__, cls.__qualname__)
+
+
+def _import_object(name):
+    module, _, attribute = name.rpartition('.')
+
+    return getattr(importlib.import_module(module), attribute)
+
+
+def _mapped_file(array):
+    """
+    Return the path of the file an array is read-only memory-mapped from, if
+    the array covers the whole file.
+    """
+    root = array
+
+    while isinstance(getattr(root, 'base', None), np.ndarray):
+        root = root.base
+
+    if isinstance(root, np.memmap) and root.filename is not None and \
+            root.mode == 'r' and array.dtype == root.dtype and \
+            array.shape == root.shape and array.flags.c_contiguous and \
+            array.__array_interface__['data'][0] == \
+            root.__array_interface__['data'][0]:
+        return os.path.abspath(root.filename)
+
+
+def _replace(path, write):
+    """
+    Write a file through a temporary file, so that readers never see a
+    partially written file.
+    """
+    temp_path = "{}.{}.tmp".format(path, os.getpid())
+
+    try:
+        write(temp_path)
+        os.replace(temp_path, path)
+    finally:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+
+
+class _ArrayWriter:
+    """
+    Write arrays to content-addressed ``.npy`` files, so that identical
+    arrays (e.g. shared spectral axes) are stored once, and arrays already
+    stored by a previous save of the session are not written again.
+    """
+    def __init__(self, directory):
+        self._directory = os.path.abspath(directory)
+        self.names = set()
+
+        os.makedirs(self._directory, exist_ok=True)
+
+    def __call__(self, array):
+        array = np.asarray(array)
+        path = _mapped_file(array)
+
+        # Arrays restored from this session are mapped from their file
+        if path is None or os.path.dirname(path) != self._directory:
+            path = os.path.join(self._directory,
+                                buffer_digest(array) + '.npy')
+
+            if not os.path.exists(path):
+                def write(temp_path):
+                    # Saving to a path would append the .npy extension
+                    with open(temp_path, 'wb') as f:
+                        np.save(f, array)
+
+                _replace(path, write)
+
+        name = os.path.basename(path)
+        self.names.add(name)
+
+        return name
+
+
+def save_session(path, model, windows=None):
+    """
+    Save the data items of a model, along with the display state of the plot
+    windows, to a session directory.
+
+    The arrays of the spectra are written to ``.npy`` files named after their
+    content, the structure of the session to a JSON manifest, and the meta
+    data of the spectra and the additional state of derived data items (see
+    `~specviz.core.items.DataItem.session_state`) to a pickle file. Saving
+    over an existing session only writes the arrays that changed.
+
+    Parameters
+    ----------
+    path : str
+        The session directory, created if it does not exist.
+    model : :class:`~specviz.core.models.DataListModel`
+        The model whose data items are saved.
+    windows : list, optional
+        The JSON-serializable display state of each plot window, restored
+        as is by `load_session`.
+    """
+    write = _ArrayWriter(os.path.join(path, _ARRAYS))
+
+    items = []
+    state = {}
+
+    for data_item in model.items:
+        spectrum = data_item.spectrum
+        identifier = str(data_item.identifier)
+
+        entry = {
+            'identifier': identifier,
+            'name': data_item.name,
+            'class': _qualified_name(type(data_item)),
+            'flux': write(spectrum.flux.value),
+            'flux_unit': spectrum.flux.unit.to_string(),
+            'spectral_axis': write(data_item.spectral_axis.value),
+            'spectral_axis_unit': data_item.spectral_axis.unit.to_string(),
+            'uncertainty': None,
+            'mask': None
+        }
+
+        uncertainty = spectrum.uncertainty
+
+        if uncertainty is not None:
+            entry['uncertainty'] = {
+                'array': write(uncertainty.array),
+                'class': _qualified_name(type(uncertainty)),
+                'unit': None if uncertainty.unit is None else
+                uncertainty.unit.to_string()
+            }
+
+        if spectrum.mask is not None:
+            entry['mask'] = write(spectrum.mask)
+
+        items.append(entry)
+        state[identifier] = {'meta': spectrum.meta,
+                             'state': data_item.session_state()}
+
+    manifest = {'version': SESSION_VERSION, 'items': items,
+                'windows': windows or []}
+
+    def write_state(temp_path):
+        with open(temp_path, 'wb') as f:
+            pickle.dump(state, f, protocol=pickle.HIGHEST_PROTOCOL)
+
+    def write_manifest(temp_path):
+        with open(temp_path, 'w') as f:
+            json.dump(manifest, f, indent=1)
+
+    _replace(os.path.join(path, _STATE), write_state)
+    _replace(os.path.join(path, _MANIFEST), write_manifest)
+
+    # Drop the arrays of data items removed since the session was last saved
+    for name in os.listdir(os.path.join(path, _ARRAYS)):
+        if name.endswith('.npy') and name not in write.names:
+            try:
+                os.remove(os.path.join(path, _ARRAYS, name))
+            except OSError:
+                pass
+
+
+def load_session(path):
+    """
+    Load the data items and plot window state saved to a session directory.
+
+    The arrays of the spectra are memory-mapped read-only from the session
+    files, so that opening a session is independent of its size and only
+    the spectra actually plotted or analysed are paged in.
+
+    Parameters
+    ----------
+    path : str
+        The session directory.
+
+    Returns
+    -------
+    data_items : list
+        The restored :class:`~specviz.core.items.DataItem` objects, in model
+        order, not yet added to a model.
+    windows : list
+        The display state of each plot window, as given to `save_session`.
+
+    Raises
+    ------
+    IOError
+        If the directory is not a session, or was written by a newer version
+        of specviz.
+    """
+    manifest_path = os.path.join(path, _MANIFEST)
+
+    if not os.path.isfile(manifest_path):
+        raise IOError("'{}' is not a specviz session.".format(path))
+
+    with open(manifest_path) as f:
+        manifest = json.load(f)
+
+    if manifest.get('version', 0) > SESSION_VERSION:
+        raise IOError("Session '{}' was saved by a newer version of "
+                      "specviz.".format(path))
+
+    with open(os.path.join(path, _STATE), 'rb') as f:
+        state = pickle.load(f)
+
+    arrays = {}
+
+    def read(name):
+        # Arrays stored once, such as shared spectral axes, are mapped once
+        if name not in arrays:
+            array_path = os.path.join(path, _ARRAYS, name)
+
+            try:
+                arrays[name] = np.load(array_path, mmap_mode='r')
+            except ValueError:
+                # Empty arrays cannot be memory-mapped
+                arrays[name] = np.load(array_path)
+
+        return arrays[name]
+
+    data_items = []
+
+    for entry in manifest['items']:
+        uncertainty = entry['uncertainty']
+
+        if uncertainty is not None:
+            uncertainty = _import_object(uncertainty['class'])(
+                read(uncertainty['array']), unit=uncertainty['unit'],
+                copy=False)
+
+        item_state = state[entry['identifier']]
+
+        spectrum = Spectrum1D(
+            flux=u.Quantity(read(entry['flux']), entry['flux_unit'],
+                            copy=False),
+            spectral_axis=u.Quantity(read(entry['spectral_axis']),
+                                     entry['spectral_axis_unit'], copy=False),
+            uncertainty=uncertainty,
+            mask=None if entry['mask'] is None else read(entry['mask']),
+            meta=item_state['meta'])
+
+        data_items.append(_import_object(entry['class']).from_session_state(
+            entry['name'], uuid.UUID(entry['identifier']), spectrum,
+            item_state['state']))
+
+    return data_items, manifest['windows']
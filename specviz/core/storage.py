@@ -0,0 +1,206 @@
+import os
+import shutil
+import tempfile
+import weakref
+
+import astropy.units as u
+import numpy as np
+
+from .buffers import buffer_digest, build_spectrum
+
+__all__ = ['MemmapStorage']
+
+
+class MemmapStorage:
+    """
+    Storage backend spilling the arrays of spectra to memory-mapped files in
+    a scratch directory.
+
+    Spectra returned by `MemmapStorage.store` are backed by the files rather
+    than by memory, so that the operating system only pages in the data of the
+    spectra that are actually plotted or analysed. The flux, uncertainty and
+    mask of a spectrum are packed into a single file mapped once, so that
+    each stored spectrum only holds one open file descriptor. The arrays are
+    mapped copy-on-write: modifying them in place is allowed but never
+    written back to disk. Identical spectral axes are only written and mapped
+    once, and are shared by the spectra referencing them.
+
+    Parameters
+    ----------
+    directory : str, optional
+        The scratch directory to store the files in. If not given, a new
+        temporary directory is created within ``root`` and deleted along with
+        the storage object.
+    root : str, optional
+        The directory in which to create the temporary scratch directory.
+        Defaults to the system temporary directory.
+    """
+    #: Alignment in bytes of the arrays packed in a file
+    alignment = 64
+
+    def __init__(self, directory=None, root=None):
+        if directory is None:
+            directory = tempfile.mkdtemp(prefix='specviz-', dir=root)
+
+            # Remove the scratch directory when this object is garbage
+            # collected or at interpreter exit, whichever comes first
+            self._finalizer = weakref.finalize(
+                self, shutil.rmtree, directory, ignore_errors=True)
+        else:
+            os.makedirs(directory, exist_ok=True)
+            self._finalizer = None
+
+        self._directory = directory
+
+        # Spectral axes are stored once per content digest and shared by all
+        # the spectra referencing them
+        self._axes = {}
+        self._axis_references = {}
+
+    @property
+    def directory(self):
+        """
+        The scratch directory holding the memory-mapped files.
+        """
+        return self._directory
+
+    def _path(self, name):
+        return os.path.join(self._directory, "{}.dat".format(name))
+
+    def _write(self, name, arrays):
+        """
+        Pack arrays into a new file and return copy-on-write memory-mapped
+        views of them, all backed by a single mapping of the file.
+        """
+        arrays = [np.ascontiguousarray(array) for array in arrays]
+        offsets = []
+        size = 0
+
+        for array in arrays:
+            size = -(-size // self.alignment) * self.alignment
+            offsets.append(size)
+            size += array.nbytes
+
+        path = self._path(name)
+
+        with open(path, 'wb') as f:
+            for array, offset in zip(arrays, offsets):
+                f.seek(offset)
+                f.write(array.tobytes())
+
+        # Empty files cannot be memory-mapped
+        if size == 0:
+            return [array.copy() for array in arrays]
+
+        mapped = np.memmap(path, dtype=np.uint8, mode='c', shape=(size,))
+
+        return [mapped[offset:offset + array.nbytes].view(
+                    array.dtype).reshape(array.shape)
+                for array, offset in zip(arrays, offsets)]
+
+    def _write_spectral_axis(self, identifier, spectral_axis):
+        """
+        Write a spectral axis unless an identical one was already stored, and
+        return a memory-mapped quantity of it.
+        """
+        digest = buffer_digest(spectral_axis)
+        mapped = self._axes.get(digest)
+
+        if mapped is None:
+            values, = self._write(digest, [spectral_axis.value])
+
+            # Shared by several spectra, the axis must not be changed in place
+            values.flags.writeable = False
+
+            mapped = u.Quantity(values, spectral_axis.unit, copy=False)
+            self._axes[digest] = mapped
+
+        self._axis_references.setdefault(digest, set()).add(identifier)
+
+        return mapped
+
+    def store(self, identifier, spectrum):
+        """
+        Spill the flux, spectral axis, uncertainty and mask arrays of a
+        spectrum to disk.
+
+        Parameters
+        ----------
+        identifier : :class:`uuid.UUID`
+            The identifier of the data item the spectrum belongs to, used to
+            name the files.
+        spectrum : :class:`~specutils.Spectrum1D`
+            The spectrum to store.
+
+        Returns
+        -------
+        :class:`~specutils.Spectrum1D`
+            A new spectrum whose arrays, including its spectral axis, are
+            memory-mapped from the stored files.
+        """
+        uncertainty = spectrum.uncertainty
+        mask = spectrum.mask
+
+        arrays = [spectrum.flux.value]
+
+        if uncertainty is not None:
+            arrays.append(uncertainty.array)
+
+        if mask is not None:
+            arrays.append(mask)
+
+        arrays = self._write(identifier, arrays)
+
+        flux = u.Quantity(arrays.pop(0), spectrum.flux.unit, copy=False)
+
+        if uncertainty is not None:
+            uncertainty = uncertainty.__class__(
+                arrays.pop(0), unit=uncertainty.unit, copy=False)
+
+        if mask is not None:
+            mask = arrays.pop(0)
+
+        spectral_axis = self._write_spectral_axis(identifier,
+                                                  spectrum.spectral_axis)
+
+        # Built around the map rather than a copy of the spectral axis
+        return build_spectrum(flux, spectral_axis, uncertainty=uncertainty,
+                              mask=mask, meta=spectrum.meta,
+                              velocity_convention=spectrum.velocity_convention,
+                              rest_value=spectrum.rest_value)
+
+    def release(self, identifier):
+        """
+        Delete the files written for a stored spectrum. Spectra still
+        referencing the memory maps remain valid until they are garbage
+        collected on platforms allowing open files to be deleted.
+
+        Parameters
+        ----------
+        identifier : :class:`uuid.UUID`
+            The identifier the spectrum was stored with.
+        """
+        paths = [self._path(identifier)]
+
+        # Only delete spectral axes no longer referenced by any spectrum
+        for digest, references in list(self._axis_references.items()):
+            references.discard(identifier)
+
+            if len(references) == 0:
+                del self._axis_references[digest]
+                del self._axes[digest]
+                paths.append(self._path(digest))
+
+        for path in paths:
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+    def nbytes(self):
+        """
+        The total size in bytes of the files in the scratch directory.
+        """
+        return sum(entry.stat().st_size
+                   for entry in os.scandir(self._directory)
+                   if entry.is_file())
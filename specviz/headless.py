@@ -0,0 +1,367 @@
+"""
+Scripting interface running specviz analyses without a display.
+
+`HeadlessSession` offers the operations of the :class:`~specviz.core.hub.Hub`
+of a workspace (loading, adding data, smoothing, arithmetic, model fitting,
+region statistics, line lists and export) on spectra held by name. It only
+uses the Qt-free modules of specviz, so that it can run on nodes without a
+display server, whether or not Qt is installed (on the ``offscreen`` Qt
+platform, or without Qt at all), and batch-process many spectra through the
+same code paths as the GUI.
+"""
+import logging
+import uuid
+from collections import OrderedDict
+
+import astropy.units as u
+from specutils import Spectrum1D
+
+from .core import linelist
+from .core.analysis import (evaluate_expression, fit_model, region_statistics,
+                            smooth, smoothed_name)
+from .core.buffers import share_spectral_axis
+from .core.export import export_spectra, export_spectrum
+from .core.loading import (expand_paths, read_files, read_spectra,
+                           spectrum_names)
+
+__all__ = ['HeadlessSession']
+
+
+class HeadlessSession:
+    """
+    A set of named spectra and the specviz operations on them, without any
+    GUI.
+
+    Parameters
+    ----------
+    storage : :class:`~specviz.core.storage.MemmapStorage`, optional
+        If given, the spectra added to the session are spilled to
+        memory-mapped files, so that sessions holding many spectra are not
+        limited by memory.
+
+    Examples
+    --------
+    >>> session = HeadlessSession()  # doctest: +SKIP
+    >>> names = session.load('spectrum.fits')  # doctest: +SKIP
+    >>> smoothed = session.smooth(names[0], 'box', 5)  # doctest: +SKIP
+    >>> session.statistics(smoothed)['mean']  # doctest: +SKIP
+    """
+    def __init__(self, storage=None):
+        self._spectra = OrderedDict()
+        self._identifiers = {}
+        self._storage = storage
+
+    def __len__(self):
+        return len(self._spectra)
+
+    def __contains__(self, name):
+        return name in self._spectra
+
+    def __getitem__(self, name):
+        return self._spectra[name]
+
+    @property
+    def names(self):
+        """The names of the spectra of the session, in the order added."""
+        return list(self._spectra)
+
+    def _unique_name(self, name):
+        unique_name = name
+        count = 1
+
+        while unique_name in self._spectra:
+            unique_name = "{} ({})".format(name, count)
+            count += 1
+
+        return unique_name
+
+    def add_data(self, spectrum, name):
+        """
+        Add a spectrum to the session.
+
+        Parameters
+        ----------
+        spectrum : :class:`~specutils.Spectrum1D`
+            The spectrum to add.
+        name : str
+            The name of the spectrum, made unique if it is already used.
+
+        Returns
+        -------
+        str
+            The name of the added spectrum.
+        """
+        name = self._unique_name(name)
+        spectrum = share_spectral_axis(spectrum)
+
+        if self._storage is not None:
+            identifier = uuid.uuid4()
+            spectrum = self._storage.store(identifier, spectrum)
+            self._identifiers[name] = identifier
+
+        self._spectra[name] = spectrum
+
+        return name
+
+    def remove_data(self, name):
+        """
+        Remove a spectrum from the session.
+
+        Parameters
+        ----------
+        name : str
+            The name of the spectrum.
+        """
+        del self._spectra[name]
+
+        identifier = self._identifiers.pop(name, None)
+
+        if identifier is not None:
+            self._storage.release(identifier)
+
+    def load(self, file_path, file_loader=None):
+        """
+        Load the spectra of a file.
+
+        Parameters
+        ----------
+        file_path : str
+            Path to location of the spectrum file.
+        file_loader : str, optional
+            Format specified for the astropy io interface. If `None`, the
+            format is identified from the file.
+
+        Returns
+        -------
+        list
+            The names of the added spectra.
+        """
+        speclist = read_spectra(file_path, file_loader=file_loader)
+
+        return [self.add_data(spectrum, name) for name, spectrum in
+                zip(spectrum_names(file_path, len(speclist)), speclist)]
+
+    def load_files(self, paths, file_loader=None, max_workers=None):
+        """
+        Load the spectra of many files in parallel, in a pool of processes.
+
+        Parameters
+        ----------
+        paths : list of str
+            Paths, glob patterns or directories of the files to load.
+        file_loader : str, optional
+            Format specified for the astropy io interface, used for all the
+            files.
+        max_workers : int, optional
+            The number of processes. Defaults to the number of processors.
+
+        Returns
+        -------
+        names : list
+            The names of the added spectra.
+        errors : dict
+            The exceptions raised while reading files, by file path.
+        """
+        names = []
+        errors = {}
+
+        for file_path, speclist, exception in read_files(
+                expand_paths(paths), file_loader=file_loader,
+                max_workers=max_workers):
+            if exception is not None:
+                logging.warning("Could not load '%s': %s", file_path,
+                                exception)
+                errors[file_path] = exception
+                continue
+
+            names += [self.add_data(spectrum, name) for name, spectrum in
+                      zip(spectrum_names(file_path, len(speclist)),
+                          speclist)]
+
+        return names, errors
+
+    def smooth(self, name, kernel, size, result_name=None):
+        """
+        Smooth a spectrum, and add the result to the session.
+
+        Parameters
+        ----------
+        name : str
+            The name of the spectrum.
+        kernel : str
+            The key of the kernel in
+            :data:`~specviz.core.analysis.KERNEL_REGISTRY`.
+        size : float
+            The size of the kernel, in pixels.
+        result_name : str, optional
+            The name of the smoothed spectrum. Defaults to the name used by
+            the smoothing plugin.
+
+        Returns
+        -------
+        str
+            The name of the smoothed spectrum.
+        """
+        spectrum = smooth(self._spectra[name], kernel, size)
+
+        return self.add_data(spectrum,
+                             result_name or smoothed_name(name, kernel, size))
+
+    def arithmetic(self, expression, result_name):
+        """
+        Evaluate an arithmetic expression between the spectra of the session,
+        and add the result to the session.
+
+        Parameters
+        ----------
+        expression : str
+            The expression, where the names of the spectra are surrounded by
+            ``{}`` brackets, e.g. ``{Spectrum 1} * 2 - {Spectrum 2}``.
+        result_name : str
+            The name of the resulting spectrum.
+
+        Returns
+        -------
+        str
+            The name of the resulting spectrum.
+        """
+        return self.add_data(evaluate_expression(expression, self._spectra),
+                             result_name)
+
+    def fit(self, name, model, region=None, fitter='Levenberg-Marquardt',
+            result_name=None, **kwargs):
+        """
+        Fit a model to a spectrum, and add the fitted model evaluated on the
+        spectral axis of the spectrum to the session.
+
+        Parameters
+        ----------
+        name : str
+            The name of the spectrum.
+        model : :class:`~astropy.modeling.Model`
+            The model to fit, with initial parameter values.
+        region : :class:`~specutils.SpectralRegion`, optional
+            The region of the spectrum to fit. Defaults to the whole spectrum.
+        fitter : str, optional
+            The key of the fitter in :data:`~specviz.core.analysis.FITTERS`.
+        result_name : str, optional
+            The name of the model spectrum. Defaults to the name of the
+            spectrum suffixed with ``Model``. If the empty string, the model
+            spectrum is not added.
+        kwargs : dict
+            Additional keyword arguments given to the fitter.
+
+        Returns
+        -------
+        :class:`~astropy.modeling.Model`
+            The fitted model.
+        """
+        spectrum = self._spectra[name]
+        fitted = fit_model(spectrum, model, region=region, fitter=fitter,
+                           **kwargs)
+
+        if result_name is None:
+            result_name = "{} Model".format(name)
+
+        if result_name:
+            flux = u.Quantity(fitted(spectrum.spectral_axis),
+                              spectrum.flux.unit)
+            self.add_data(Spectrum1D(flux=flux,
+                                     spectral_axis=spectrum.spectral_axis),
+                          result_name)
+
+        return fitted
+
+    def statistics(self, name, region=None):
+        """
+        Compute the statistics of a spectrum, as displayed by the statistics
+        plugin.
+
+        Parameters
+        ----------
+        name : str
+            The name of the spectrum.
+        region : :class:`~specutils.SpectralRegion`, optional
+            The region to compute the statistics over. Defaults to the whole
+            spectrum.
+
+        Returns
+        -------
+        dict
+            The statistics.
+
+        Raises
+        ------
+        ValueError
+            If the statistics cannot be computed over the region.
+        """
+        return region_statistics(self._spectra[name], region)
+
+    def line_lists(self, name):
+        """
+        Find the lines of the line lists shipped with specviz within the
+        spectral range of a spectrum.
+
+        Parameters
+        ----------
+        name : str
+            The name of the spectrum.
+
+        Returns
+        -------
+        list
+            The :class:`~specviz.core.linelist.LineList` objects, stripped of
+            the lines outside of the spectral range.
+        """
+        linelist.populate_linelists_cache()
+
+        spectral_axis = self._spectra[name].spectral_axis
+
+        return linelist.ingest((spectral_axis.min(), spectral_axis.max()))
+
+    def export(self, name, path, fmt=None):
+        """
+        Write a spectrum to a file.
+
+        Parameters
+        ----------
+        name : str
+            The name of the spectrum.
+        path : str
+            The path of the file, overwritten if it exists.
+        fmt : str, optional
+            The key of the format in
+            :data:`~specviz.core.export.EXPORT_FORMATS`. Defaults to the
+            format matching the extension of the path.
+        """
+        export_spectrum(self._spectra[name], path, fmt=fmt)
+
+    def export_all(self, directory, fmt, names=None, max_workers=None):
+        """
+        Write many spectra to a directory in parallel.
+
+        Parameters
+        ----------
+        directory : str
+            The directory to write the files to, created if it does not
+            exist.
+        fmt : str
+            The key of the format in
+            :data:`~specviz.core.export.EXPORT_FORMATS`.
+        names : list, optional
+            The names of the spectra to write. Defaults to all the spectra.
+        max_workers : int, optional
+            The number of threads.
+
+        Returns
+        -------
+        dict
+            The exceptions raised while writing files, by file path.
+        """
+        names = self.names if names is None else names
+        specs_by_name = [(name, self._spectra[name]) for name in names]
+
+        return {path: exception for path, exception in
+                export_spectra(specs_by_name, directory, fmt,
+                               max_workers=max_workers)
+                if exception is not None}
@@ -0,0 +1,45 @@
+"""
+Declarations of the plugins shipped with specviz.
+
+The tool bar, plot bar and plugin bar entries of these plugins are added to
+each workspace from the declarations below, so that the plugin modules are
+only imported, and the plugins instantiated, when first used. The declarations
+are the only description of these entries: the decorators of the plugin
+classes and methods read their priority, icons and action options from them.
+"""
+from ..core.plugin import PluginAction, PluginEntry, plugin
+
+_ICON = ":/icons/012-file.svg"
+
+for _entry in [
+        PluginEntry("Statistics", __name__ + ".statistics", "StatisticsWidget",
+                    type='plugin_bar', icon=_ICON, priority=1),
+        PluginEntry("Line labels", __name__ + ".line_labels",
+                    "LineListsPlugin", type='plugin_bar',
+                    icon=":/icons/price.svg"),
+        PluginEntry("Model Editor", __name__ + ".model_editor", "ModelEditor",
+                    type='plugin_bar', icon=_ICON, actions=[
+                        PluginAction("New Model", "on_new_model_triggered",
+                                     icon=_ICON)]),
+        PluginEntry("Continuum Generator", __name__ + ".model_editor",
+                    "ContinuumGenerator", actions=[
+                        PluginAction("Generate continuum model",
+                                     "on_action_triggered",
+                                     location="Operations")]),
+        PluginEntry("Loader Wizard", __name__ + ".loader_wizard",
+                    "LoaderWizard", actions=[
+                        PluginAction("Loader Wizard", "open_wizard",
+                                     icon=_ICON, location=0)]),
+        PluginEntry("Arithmetic", __name__ + ".arithmetic", "Arithmetic",
+                    actions=[
+                        PluginAction("Arithmetic", "on_action_triggered",
+                                     icon=":/icons/014-calculator.svg")]),
+        PluginEntry("Smoothing", __name__ + ".smoothing", "SmoothingDialog",
+                    actions=[
+                        PluginAction("Smoothing", "on_action_triggered",
+                                     location="Operations")]),
+        PluginEntry("Unit Change Plugin", __name__ + ".unit_change",
+                    "UnitChangeDialog", actions=[
+                        PluginAction("Change Units", "on_action_triggered",
+                                     type='plot_bar', icon=_ICON)])]:
+    plugin.declare(_entry)
@@ -5,7 +5,6 @@ import numpy as np
 import os
 from PyQt5.uic import loadUi
 from PyQt5.QtCore import Qt
-from qtpy.QtGui import QIcon
 from qtpy.QtWidgets import (QMainWindow,QInputDialog,QApplication, QDialog,
                             QComboBox, QPushButton, QTreeWidget, QTreeWidgetItem,
                             QMessageBox)
@@ -13,6 +12,8 @@ import specutils
 from specutils import Spectrum1D
 import uuid
 
+from ...core.analysis import evaluate_expression
+from ...core.buffers import share_spectral_axis
 from ...core.plugin import plugin
 
 
@@ -40,7 +41,7 @@ class Arithmetic(QDialog):
 
         self.setModal(True)
 
-    @plugin.tool_bar(name="Arithmetic", icon=QIcon(":/icons/014-calculator.svg"))
+    @plugin.tool_bar()
     def on_action_triggered(self):
         """Trigger the arithmetic UI when button is clicked."""
         self.show()
@@ -187,8 +188,9 @@ class EquationEditor(QDialog):
 
         self._equation_editor.set_equation(self.eq_name, self.eq_expression)
 
+        # Results of arithmetic between spectra share their spectral axis
         self._equation_editor.hub.workspace.model.add_data(
-            spec=self.evaluated_arith, name=self.eq_name)
+            spec=share_spectral_axis(self.evaluated_arith), name=self.eq_name)
 
         self._close_dialog()
 
@@ -231,16 +233,10 @@ class EquationEditor(QDialog):
 
         else:
             try:
-                dict_map = {x.name: "self._item_from_name('{}')".format(x.name)
-                            for x in self._equation_editor.hub.data_items}
-                raw_str = self._get_raw_command()
-                self.evaluated_arith = eval(raw_str.format(**dict_map))
-                if not isinstance(self.evaluated_arith,
-                                  specutils.spectra.spectrum1d.Spectrum1D):
-
-                    raise ValueError("Arithmetic Editor must return ",
-                                     "Spectrum1D object not {}".\
-                                     format(type(self.evaluated_arith)))
+                spectra = {x.name: x.spectrum
+                           for x in self._equation_editor.hub.data_items}
+                self.evaluated_arith = evaluate_expression(
+                    self._get_raw_command(), spectra)
             except SyntaxError:
                 self.label_status.setStyleSheet('color: red')
                 self.label_status.setText("Incomplete or invalid syntax")
@@ -8,7 +8,7 @@ from qtpy.QtWidgets import (QWidget, QTabWidget, QVBoxLayout, QTabBar,
                             QTableView, QMainWindow, QAbstractItemView, QStackedLayout,
                             QLayout, QGridLayout, QBoxLayout, QTextBrowser, QComboBox,
                             QDialog, QErrorMessage, QSizePolicy)
-from qtpy.QtGui import QColor, QStandardItem, QDoubleValidator, QFont, QIcon
+from qtpy.QtGui import QColor, QStandardItem, QDoubleValidator, QFont
 from qtpy.QtCore import (Qt, Signal, QAbstractTableModel, QVariant, QSortFilterProxyModel)
 from qtpy import compat
 from qtpy.uic import loadUi
@@ -20,11 +20,12 @@ from astropy.units import Quantity
 from astropy.units.core import UnitConversionError
 from astropy.io import ascii
 
+from ...core.events import WorkspaceChange
 from ...core.plugin import plugin
 
-from . import linelist
-from .linelist import WAVELENGTH_COLUMN, ERROR_COLUMN, DEFAULT_HEIGHT
-from .linelist import columns_to_remove
+from ...core import linelist
+from ...core.linelist import WAVELENGTH_COLUMN, ERROR_COLUMN, DEFAULT_HEIGHT
+from ...core.linelist import columns_to_remove
 from .line_labels_plotter import LineLabelsPlotter
 
 __all__ = ['LineListsPlugin', 'LineListsWindow', 'LineListPane', 'PlottedLinesPane', 'LineListTableModel', 'SortModel']
@@ -102,7 +103,7 @@ def _create_line_list_pane(linelist, table_model, caller):
 # line list widget storage.
 linelists_windows = {}
 
-@plugin.plugin_bar("Line labels", icon=QIcon(":/icons/price.svg"))
+@plugin.plugin_bar("Line labels")
 class LineListsPlugin(QWidget):
     """
     Top class for the line labels plugin. This is the class that handles
@@ -124,7 +125,11 @@ class LineListsPlugin(QWidget):
         # cache the line lists for speedier access
         linelist.populate_linelists_cache()
 
-        self.hub.workspace.mdi_area.subWindowActivated.connect(self._plot_selected)
+        self.hub.event_bus.state_changed.connect(self._on_state_changed)
+
+    def _on_state_changed(self, changes):
+        if changes & WorkspaceChange.PLOT_WINDOW:
+            self._plot_selected()
 
     # line list widgets for the plugin bar are associated with their corresponding
     # plot widget via a key built from the plot widget instance hash. References are
@@ -20,7 +20,7 @@ from astropy.io import registry
 from astropy.wcs import WCS
 from qtpy import compat
 from qtpy.QtCore import Qt
-from qtpy.QtGui import QFont, QIcon
+from qtpy.QtGui import QFont
 from qtpy.QtWidgets import (QApplication, QDialog, QMessageBox, QPlainTextEdit,
                             QPushButton, QVBoxLayout, QWidget)
 from qtpy.uic import loadUi
@@ -770,7 +770,7 @@ class LoaderWizard(QDialog):
     Loader wizard dialog. Handles the rendering and parsing of user input
     through the SpecViz gui.
     """
-    @plugin.tool_bar("Loader Wizard", icon=QIcon(":/icons/012-file.svg"), location=0)
+    @plugin.tool_bar()
     def open_wizard(self):
         """
         Opens loader wizard plugin interface.
@@ -14,14 +14,15 @@ class ContinuumGenerator:
     Auto-generates a continuum using the specutils
     :func:`~specutils.fitting.fit_generic_continuum` function.
     """
-    @plugin.tool_bar("Generate continuum model", location="Operations")
+    @plugin.tool_bar()
     def on_action_triggered(self):
         """
         The action triggered via interaction with the UI. Generates the
         continuum for the selected regions on the spectrum.
         """
         # Get the currently selected data item
-        spec = self.hub.data_item.spectrum
+        data_item = self.hub.data_item
+        spec = data_item.spectrum
 
         # Retrieve any rois to be used for exclusion in the continuum fit.
         inc_regs = self.hub.spectral_regions
@@ -32,8 +33,10 @@ class ContinuumGenerator:
         cont_mod = fit_generic_continuum(spec, exclude_regions=exc_regs)
         y_cont = cont_mod(spec.spectral_axis)
 
-        # Construct the new spectrum object containing the array
-        new_spec = Spectrum1D(flux=y_cont, spectral_axis=spec.spectral_axis)
+        # Construct the new spectrum object containing the array. The data
+        # model replaces the copy of the spectral axis by the pooled one
+        new_spec = Spectrum1D(flux=y_cont,
+                              spectral_axis=data_item.spectral_axis)
 
         # Add the continuum model to the model data item's fitting model
         model_fitting_model = ModelFittingModel()
@@ -45,5 +48,9 @@ class ContinuumGenerator:
                                         identifier=uuid.uuid4(),
                                         data=new_spec)
 
+        # The model editor plots the model data items added to the model, so
+        # make sure it is loaded
+        plugin.instance(self.hub.workspace, "Model Editor")
+
         # Add the model data item to the internal qt model
         self.hub.append_data_item(model_data_item)
@@ -1,5 +1,6 @@
 import numpy as np
 
+from .models import ModelFittingModel
 from ...core.items import DataItem
 
 
@@ -17,11 +18,20 @@ class ModelDataItem(DataItem):
         arithmetic.
     """
     def __init__(self, model, *args, **kwargs):
-        self._model_editor_model = model
+        self._model_editor_model = None
         self._selected_data = None
 
         super().__init__(*args, **kwargs)
 
+        self.model_editor_model = model
+
+    def _on_model_changed(self, *args):
+        """
+        The evaluated flux depends on the model editor model, so any change to
+        it invalidates values derived from this item's data.
+        """
+        self._data_version += 1
+
     @property
     def flux(self):
         """
@@ -48,6 +58,31 @@ class ModelDataItem(DataItem):
         """
         return super().spectrum
 
+    def session_state(self):
+        """
+        The models of the model editor model and the equation combining them.
+        """
+        if self.model_editor_model is None:
+            return {}
+
+        return {'models': self.model_editor_model.fittable_models,
+                'equation': self.model_editor_model.equation}
+
+    @classmethod
+    def from_session_state(cls, name, identifier, data, state):
+        """
+        Rebuild the model editor model from the saved models and equation.
+        """
+        model = ModelFittingModel()
+
+        for fittable_model in state.get('models', {}).values():
+            model.add_model(fittable_model)
+
+        if 'equation' in state:
+            model.equation = state['equation']
+
+        return cls(model, name=name, identifier=identifier, data=data)
+
     @property
     def model_editor_model(self):
         """
@@ -57,4 +92,22 @@ class ModelDataItem(DataItem):
 
     @model_editor_model.setter
     def model_editor_model(self, value):
+        if self._model_editor_model is not None:
+            self._connect_model_signals(self._model_editor_model, False)
+
         self._model_editor_model = value
+
+        if self._model_editor_model is not None:
+            self._connect_model_signals(self._model_editor_model, True)
+
+        self._on_model_changed()
+
+    def _connect_model_signals(self, model, connect):
+        signals = [model.itemChanged, model.rowsInserted, model.rowsRemoved,
+                   model.modelReset, model.equation_changed]
+
+        for signal in signals:
+            if connect:
+                signal.connect(self._on_model_changed)
+            else:
+                signal.disconnect(self._on_model_changed)
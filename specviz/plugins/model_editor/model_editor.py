@@ -5,11 +5,9 @@ import uuid
 import numpy as np
 from astropy.modeling import fitting, models, optimizers
 from qtpy.QtCore import Qt
-from qtpy.QtGui import QIcon
 from qtpy.QtWidgets import (QAction, QDialog, QFileDialog, QInputDialog, QMenu,
                             QMessageBox, QToolButton, QWidget)
 from qtpy.uic import loadUi
-from specutils.fitting import fit_lines
 from specutils.manipulation.utils import excise_regions
 from specutils.spectra import Spectrum1D
 
@@ -17,6 +15,8 @@ from .equation_editor_dialog import ModelEquationEditorDialog
 from .initializers import initialize
 from .items import ModelDataItem
 from .models import ModelFittingModel
+from ...core.analysis import FITTERS, fit_model
+from ...core.events import WorkspaceChange
 from ...core.plugin import plugin
 
 MODELS = {
@@ -28,16 +28,10 @@ MODELS = {
     'Lorentzian1D': models.Lorentz1D,
 }
 
-FITTERS = {
-    'Levenberg-Marquardt': fitting.LevMarLSQFitter,
-    'Simplex Least Squares': fitting.SimplexLSQFitter,
-    # Disabled # 'SLSQP Optimization': fitting.SLSQPLSQFitter,
-}
-
 SPECVIZ_MODEL_FILE_FILTER = 'Specviz Model Files (*.smf)'
 
 
-@plugin.plugin_bar("Model Editor", icon=QIcon(":/icons/012-file.svg"))
+@plugin.plugin_bar("Model Editor")
 class ModelEditor(QWidget):
     """
     Qt widget for interacting with the model editor functionality in SpecViz.
@@ -93,21 +87,28 @@ class ModelEditor(QWidget):
         self.data_selection_combo.setModel(self.hub.model)
         self.data_selection_combo.currentIndexChanged.connect(self._redraw_model)
 
-        # When a plot data item is select, get its model editor model
-        # representation
-        self.hub.workspace.current_selected_changed.connect(
-            self._on_plot_item_selected)
-
-        # When the plot window changes, reset model editor
-        self.hub.workspace.mdi_area.subWindowActivated.connect(self._on_new_plot_activated)
+        # When a plot data item is selected, get its model editor model
+        # representation, and when the plot window changes, reset the model
+        # editor, once per user action
+        self.hub.event_bus.state_changed.connect(self._on_state_changed)
 
         # Listen for when data items are added to internal model
         self.hub.model.data_added.connect(self._on_data_item_added)
+        self.hub.model.data_batch_added.connect(
+            lambda data_items: [self._on_data_item_added(x) for x in data_items])
+
+        # The editor is only created when first used, so pick up the model
+        # data items added before, and the current selection
+        for data_item in self.hub.data_items:
+            if isinstance(data_item, ModelDataItem):
+                self._connect_model_data_item(data_item)
+
+        self._on_new_plot_activated()
 
         # Connect the fit model button
         self.fit_button.clicked.connect(self._on_fit_clicked)
 
-    @plugin.tool_bar(name="New Model", icon=QIcon(":/icons/012-file.svg"))
+    @plugin.tool_bar()
     def on_new_model_triggered(self):
         """
         Create a new model based on user choice and add it to the display of
@@ -122,10 +123,7 @@ class ModelEditor(QWidget):
         model_data_item = data_item
         plot_data_item = self.hub.plot_data_item_from_data_item(model_data_item)
 
-        # Connect data change signals so that the plot updates when the user
-        # changes a parameter in the model view model
-        model_data_item.model_editor_model.itemChanged.connect(
-            lambda item: self._on_model_item_changed(item))
+        self._connect_model_data_item(model_data_item)
 
         # plot_data_item = self.hub.workspace.proxy_model.item_from_id(model_data_item.identifier)
         plot_data_item.visible = True
@@ -134,6 +132,12 @@ class ModelEditor(QWidget):
             model_data_item)
         self.hub.workspace._on_item_changed(item=plot_data_item.data_item)
 
+    def _connect_model_data_item(self, model_data_item):
+        # Connect data change signals so that the plot updates when the user
+        # changes a parameter in the model view model
+        model_data_item.model_editor_model.itemChanged.connect(
+            lambda item: self._on_model_item_changed(item))
+
     def _on_create_new_model(self):
         if self.hub.data_item is None:
             QMessageBox.warning(self,
@@ -374,6 +378,11 @@ class ModelEditor(QWidget):
         self.editor_holder_widget.setHidden(True)
         self.setup_holder_widget.setHidden(False)
 
+    def _on_state_changed(self, changes):
+        if changes & (WorkspaceChange.SELECTION |
+                      WorkspaceChange.PLOT_WINDOW):
+            self._on_new_plot_activated()
+
     def _on_new_plot_activated(self):
         plot_data_item = self.hub.plot_item
         if plot_data_item is not None:
@@ -459,11 +468,11 @@ class ModelEditor(QWidget):
             return
 
         # Load options
-        fitter = FITTERS[self.fitting_options["fitter"]]
+        fitter = self.fitting_options["fitter"]
         output_formatter = "{:0.%sg}" % self.fitting_options['displayed_digits']
 
         kwargs = {}
-        if fitter is fitting.LevMarLSQFitter:
+        if FITTERS[fitter] is fitting.LevMarLSQFitter:
             kwargs['maxiter'] = self.fitting_options['max_iterations']
             kwargs['acc'] = self.fitting_options['relative_error']
             kwargs['epsilon'] = self.fitting_options['epsilon']
@@ -476,8 +485,8 @@ class ModelEditor(QWidget):
             plot_data_item.spectral_axis_unit)
         spectrum = spectrum.new_flux_unit(plot_data_item.data_unit)
 
-        fit_mod = fit_lines(spectrum, result, fitter=fitter(),
-                            window=spectral_region, **kwargs)
+        fit_mod = fit_model(spectrum, result, region=spectral_region,
+                            fitter=fitter, **kwargs)
 
         if fit_mod is None:
             return
@@ -18,8 +18,11 @@ class ModelFittingModel(QStandardItemModel):
     ----------
     status_changed : :class:`qtpy.QtCore.Signal`
         Signal raised when the validator state changes.
+    equation_changed : :class:`qtpy.QtCore.Signal`
+        Signal raised when the equation is explicitly set.
     """
     status_changed = Signal(QValidator.State, str)
+    equation_changed = Signal(str)
 
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
@@ -47,6 +50,7 @@ class ModelFittingModel(QStandardItemModel):
     def equation(self, value):
         self._equation = value
         self.evaluate()
+        self.equation_changed.emit(self._equation)
 
     def compose_fittable_models(self):
         """
@@ -1,47 +1,19 @@
 import os
-
+from collections import OrderedDict
 from functools import wraps
 from qtpy.QtCore import QThread, Signal
 from qtpy.QtWidgets import QDialog, QMessageBox
 from qtpy.uic import loadUi
 import astropy.units as u
+import numpy as np
 from specutils import Spectrum1D
-from specutils.manipulation.smoothing import (box_smooth, gaussian_smooth,
-                                              median_smooth, trapezoid_smooth)
 
+from ...core.analysis import KERNEL_REGISTRY, smoothed_name
+from ...core.buffers import build_spectrum
 from ...core.items import PlotDataItem
 from ...core.plugin import plugin
 from ...core.operations import FunctionalOperation
 
-KERNEL_REGISTRY = {
-    """
-    Dictionary to store available kernel options.
-
-    KERNEL_REGISTRY:
-        kernel_type: Type of kernel
-            name: Display name
-            unit_label: Display units of kernel size (singular)
-            size_dimension: Dimension of kernel (width, radius, etc..)
-            function: Smoothing function
-    """
-    "box": {"name": "Box",
-            "unit_label": "Pixel",
-            "size_dimension": "Width",
-            "function": box_smooth},
-    "gaussian": {"name": "Gaussian",
-                 "unit_label": "Pixel",
-                 "size_dimension": "Std Dev",
-                 "function": gaussian_smooth},
-    "trapezoid": {"name": "Trapezoid",
-                  "unit_label": "Pixel",
-                  "size_dimension": "Width",
-                  "function": trapezoid_smooth},
-    "median": {"name": "Median",
-               "unit_label": "Pixel",
-               "size_dimension": "Width",
-               "function": median_smooth}
-}
-
 
 @plugin("Smoothing")
 class SmoothingDialog(QDialog):
@@ -49,7 +21,9 @@ class SmoothingDialog(QDialog):
     Widget to handle user interactions with smoothing operations.
     Allows the user to select spectra, kernel type and kernel size.
     It utilizes smoothing functions in `~specutils.manipulation`.
-    Assigns the smoothing workload to a QTread instance.
+    Assigns the smoothing workload to a QTread instance, which smooths the
+    spectra sharing a spectral axis as one block when all the visible spectra
+    are smoothed at once.
     """
     def __init__(self, parent=None, *args, **kwargs):
         super().__init__(parent=parent, *args, **kwargs)
@@ -61,6 +35,7 @@ class SmoothingDialog(QDialog):
         self.kernel = None  # One of the sub-dicts in KERNEL_REGISTRY
         self.function = None  # function from `~specutils.manipulation.smoothing`
         self.data = None  # Current `~specviz.core.items.DataItem`
+        self.data_items = []  # Data items being smoothed
         self.size = None  # Current kernel size
         self._already_loaded = False
 
@@ -74,13 +49,15 @@ class SmoothingDialog(QDialog):
         self.smooth_button.clicked.connect(self.accept)
         self.cancel_button.clicked.connect(self.close)
         self.data_combo.currentIndexChanged.connect(self._on_data_change)
+        self.all_visible_check.toggled.connect(self.data_combo.setDisabled)
+        self.progress_bar.hide()
 
         for key in KERNEL_REGISTRY:
             kernel = KERNEL_REGISTRY[key]
             self.kernel_combo.addItem(kernel["name"], key)
         self.kernel_combo.currentIndexChanged.connect(self._on_kernel_change)
 
-    @plugin.tool_bar("Smoothing", location="Operations")
+    @plugin.tool_bar()
     def on_action_triggered(self):
         """
         Triggers the display of the dialog where users may enter smoothing
@@ -104,6 +81,8 @@ class SmoothingDialog(QDialog):
         self._on_kernel_change(0)
 
         self.set_to_current_selection()
+        self.all_visible_check.setChecked(False)
+        self.progress_bar.hide()
         self.smooth_button.setEnabled(True)
         self.cancel_button.setEnabled(True)
 
@@ -133,13 +112,22 @@ class SmoothingDialog(QDialog):
         if data_index is not None and len(self.model_items) > 0:
             self.data = self.model_items[data_index]
 
-    def _generate_output_name(self):
+    def _generate_output_name(self, data_item=None):
         """Generate a name for output spectra"""
-        unit_label = self.kernel["unit_label"].lower()
-        unit_format = "{0} {1}" if self.size == 1. else "{0} {1}s"
-        size_text = unit_format.format(self.size, unit_label)
+        data_item = data_item or self.data
 
-        return "{0} Smoothed({1}, {2})".format(self.data.name, self.kernel["name"], size_text)
+        return smoothed_name(data_item.name, self.kernel_combo.currentData(),
+                             self.size)
+
+    def _selected_data_items(self):
+        """
+        The data items to smooth: all the data items visible in the current
+        plot if requested, or the data item selected in the combo box.
+        """
+        if self.all_visible_check.isChecked():
+            return [x.data_item for x in self.hub.visible_plot_items or []]
+
+        return [self.data] if self.data is not None else []
 
     def is_size_valid(self):
         """
@@ -171,48 +159,70 @@ class SmoothingDialog(QDialog):
         if not self.is_size_valid():
             return
 
+        self.data_items = self._selected_data_items()
+
+        if len(self.data_items) == 0:
+            return
+
         self.smooth_button.setEnabled(False)
         self.cancel_button.setEnabled(False)
 
         self.size = float(self.size_input.text())
 
-        if self.data is not None:
-            # This wrapper function is necessary for cases where the specutils
-            # functions expect a spectrum1d, but the data provided is a simple
-            # array or quantity.
-            def func_convert(func):
-                @wraps(func)
-                def wrapper(data, spectral_axis, *args, **kwargs):
-                    spec = Spectrum1D(flux=u.Quantity(data),
-                                      spectral_axis=spectral_axis)
-                    return func(spec, *args, **kwargs).flux.value
-                return wrapper
-
-            # Generate a smoothing operation to place on the operation stack.
-            # This allows for playback via stack singleton.
-            smoothing_operation = FunctionalOperation(
-                func_convert(self.function), self.size,
-                name="Smoothing Operation ({}, size={})".format(
-                    self.function.__name__, self.size))
-
-            self._smoothing_thread = SmoothingThread(self.data.spectrum, self.size, self.function)
-            self._smoothing_thread.finished.connect(self.on_finished)
-            self._smoothing_thread.exception.connect(self.on_exception)
-
-            self._smoothing_thread.start()
-
-    def on_finished(self, spec):
+        # This wrapper function is necessary for cases where the specutils
+        # functions expect a spectrum1d, but the data provided is a simple
+        # array or quantity.
+        def func_convert(func):
+            @wraps(func)
+            def wrapper(data, spectral_axis, *args, **kwargs):
+                spec = Spectrum1D(flux=u.Quantity(data),
+                                  spectral_axis=spectral_axis)
+                return func(spec, *args, **kwargs).flux.value
+            return wrapper
+
+        # The operation smooths the flux of each spectrum, or of a block of
+        # spectra sharing a spectral axis at once
+        smoothing_operation = FunctionalOperation(
+            func_convert(self.function), self.size,
+            name="Smoothing Operation ({}, size={})".format(
+                self.function.__name__, self.size))
+
+        self.progress_bar.setRange(0, len(self.data_items))
+        self.progress_bar.setValue(0)
+        self.progress_bar.setVisible(len(self.data_items) > 1)
+
+        self._smoothing_thread = SmoothingThread(
+            [x.spectrum for x in self.data_items], smoothing_operation,
+            spectral_axes=[x.spectral_axis for x in self.data_items])
+        self._smoothing_thread.progress.connect(
+            self.progress_bar.setValue)
+        self._smoothing_thread.finished.connect(self.on_finished)
+        self._smoothing_thread.exception.connect(self.on_exception)
+
+        self._smoothing_thread.start()
+
+    def on_finished(self, specs):
         """
         Called when the `QThread` has finished performing
         the smoothing operation.
         Parameters
         ----------
-        spec : `~specutils.Spectrum1D`
-            The result of the smoothing operation.
+        specs : list
+            The `~specutils.Spectrum1D` results of the smoothing operation,
+            in the order of the data items smoothed.
         """
-        name = self._generate_output_name()
-        data_item = self.hub.workspace.model.add_data(spec=spec, name=name)
-        self.hub.workspace.force_plot(data_item)
+        names = [self._generate_output_name(x) for x in self.data_items]
+
+        if len(specs) == 1:
+            data_item = self.hub.workspace.model.add_data(spec=specs[0],
+                                                          name=names[0])
+            self.hub.workspace.force_plot(data_item)
+        else:
+            # Insert and plot the results in a single model update
+            data_items = self.hub.workspace.model.add_data_batch(
+                zip(specs, names))
+            self.hub.workspace.force_plot_batch(data_items)
+
         self.close()
 
     def on_exception(self, exception):
@@ -225,6 +235,7 @@ class SmoothingDialog(QDialog):
         """
         self.smooth_button.setEnabled(True)
         self.cancel_button.setEnabled(True)
+        self.progress_bar.hide()
 
         info_box = QMessageBox(parent=self)
         info_box.setWindowTitle("Smoothing Error")
@@ -236,41 +247,86 @@ class SmoothingDialog(QDialog):
 
 class SmoothingThread(QThread):
     """
-    Thread in which a single smoothing operation
-    is performed to ensure that the UI does not
-    freeze while the operation is running.
+    Thread in which a smoothing operation is performed
+    to ensure that the UI does not freeze while the
+    operation is running. Spectra sharing a spectral
+    axis are smoothed as one block, with
+    `~specviz.core.operations.FunctionalOperation.batch`.
 
     Parameters
     ----------
-    data : `~specutils.Spectrum1D`
-    size : Number
-        Smoothing kernel size.
-    func : function
-        Smoothing function from `~specutils.manipulation.smoothing`.
+    data : list
+        The `~specutils.Spectrum1D` objects to smooth.
+    operation : `~specviz.core.operations.FunctionalOperation`
+        The smoothing operation, applied to the flux and the spectral axis
+        of the spectra.
+    spectral_axes : list, optional
+        The spectral axis of each spectrum. Spectra whose spectral axes are
+        the same object, such as the pooled spectral axes of data items, are
+        smoothed as one block. Defaults to the spectral axes of the spectra.
     parent : `~specviz.widgets.smoothing.SmoothingDialog`
 
     Signals
     -------
+    progress : Signal
+        Sends the number of spectra smoothed so far.
     finished : Signal
         Notifies parent UI that smoothing is complete and is used to
-        communicate the resulting data.
+        communicate the list of resulting data, in the order of the input.
     exception : Signal
         Sends exceptions to parent UI where they are raised.
     """
+    progress = Signal(int)
     finished = Signal(object)
     exception = Signal(Exception)
 
-    def __init__(self, data, size, func, parent=None):
+    def __init__(self, data, operation, spectral_axes=None, parent=None):
         super(SmoothingThread, self).__init__(parent)
         self._data = data
-        self._size = size
-        self._function = func
-        self._tracker = None
+        self._operation = operation
+        self._spectral_axes = spectral_axes or [x.spectral_axis
+                                                for x in data]
 
     def run(self):
         """Run the thread."""
         try:
-            new_spec = self._function(self._data, self._size)
-            self.finished.emit(new_spec)
+            new_specs = [None] * len(self._data)
+            blocks = OrderedDict()
+
+            for index, spectral_axis in enumerate(self._spectral_axes):
+                blocks.setdefault(id(spectral_axis), []).append(index)
+
+            count = 0
+
+            for indices in blocks.values():
+                for index, spec in zip(indices, self._smooth_block(indices)):
+                    new_specs[index] = spec
+
+                count += len(indices)
+                self.progress.emit(count)
+
+            self.finished.emit(new_specs)
         except Exception as e:
             self.exception.emit(e)
+
+    def _smooth_block(self, indices):
+        specs = [self._data[index] for index in indices]
+        spectral_axis = self._spectral_axes[indices[0]]
+
+        if len(specs) == 1:
+            fluxes = [self._operation(specs[0].flux, spectral_axis)]
+        else:
+            # The fluxes of each row keep the unit of their own spectrum
+            fluxes = self._operation.batch(
+                np.stack([spec.flux.value for spec in specs]), spectral_axis)
+
+        new_specs = []
+
+        for spec, flux in zip(specs, fluxes):
+            # The smoothed spectra share the spectral axis of their source
+            new_specs.append(build_spectrum(
+                u.Quantity(flux, spec.flux.unit), spectral_axis,
+                velocity_convention=spec.velocity_convention,
+                rest_value=spec.rest_value))
+
+        return new_specs
@@ -0,0 +1,39 @@
+import astropy.units as u
+import numpy as np
+from specutils import Spectrum1D
+
+
+def test_smooth_all_visible(specviz_gui, qtbot):
+    workspace = specviz_gui.add_workspace()
+    workspace.add_plot_window()
+
+    model = workspace.model
+    data_items = model.add_data_batch(
+        [(Spectrum1D(flux=np.random.sample(100) * u.Jy,
+                     spectral_axis=np.arange(100) * u.AA),
+          "Spectrum {}".format(i)) for i in range(3)] +
+        [(Spectrum1D(flux=np.random.sample(50) * u.mJy,
+                     spectral_axis=np.arange(50) * u.um), "Other spectrum")])
+    workspace.force_plot_batch(data_items)
+
+    batches = []
+    model.data_batch_added.connect(batches.append)
+
+    dialog = workspace._plugins['Smoothing']
+    dialog.model_items = dialog.hub.data_items
+    dialog._display_ui()
+    dialog.all_visible_check.setChecked(True)
+    dialog.size_input.setText("3")
+    dialog.accept()
+
+    qtbot.waitUntil(lambda: len(batches) == 1)
+
+    results = batches[0]
+
+    assert [x.name for x in results] == [
+        "{} Smoothed(Box, 3.0 pixels)".format(x.name) for x in data_items]
+
+    for result, data_item in zip(results, data_items):
+        assert result.flux.unit == data_item.flux.unit
+        assert np.all(result.spectral_axis == data_item.spectral_axis)
+        assert result.spectral_axis is data_item.spectral_axis
@@ -6,132 +6,18 @@ from astropy import units as u
 
 from specutils.spectra.spectrum1d import Spectrum1D
 from specutils.spectra.spectral_region import SpectralRegion
-from specutils.manipulation import extract_region
-from specutils.analysis import snr, equivalent_width, fwhm, centroid, line_flux
 
 from qtpy.QtWidgets import QWidget
 from qtpy.uic import loadUi
-from qtpy.QtGui import QIcon
 
+from ...core.analysis import region_statistics
+from ...core.events import WorkspaceChange
 from ...core.items import PlotDataItem
 from ...utils.helper_functions import format_float_text
 from ...core.plugin import plugin
 
 
-# The next three functions are place holders while specutils is updated to handle
-# these computations internally. They will be moved into the StatisticsWidget
-# once they are updated.
-
-def check_unit_compatibility(spec, region):
-    """
-    Checks if the unit of a region is compatible with the unit of the spectral
-    axis of the spectrum object.
-
-    Parameters
-    ----------
-    spec : :class:`specutils.Spectrum1D`
-        The spectrum object with which to check compatibility.
-    region : :class:`specutils.SpectralRegion`
-        The region object with which to check compatibility.
-
-    Returns
-    -------
-    bool
-        Whether or not units are compatible.
-    """
-    spec_unit = spec.spectral_axis.unit
-    if region.lower is not None:
-        region_unit = region.lower.unit
-    elif region.upper is not None:
-        region_unit = region.upper.unit
-    else:
-        return False
-    return spec_unit.is_equivalent(region_unit)
-
-
-def clip_region(spectrum, region):
-    """
-    Given a region, clips the lower and upper bounds to the limits of the
-    spectrum's spectral axis.
-
-    Parameters
-    ----------
-    spec : :class:`specutils.Spectrum1D`
-        The spectrum whose bounds will be used in clipping.
-    region : :class:`specutils.SpectralRegion`
-        The region object whose bounds will change.
-
-    Returns
-    -------
-    :class:`specutils.SpectralRegion`
-        New spectral region object with correct bounds.
-    """
-    # If the region is out of data range return None:
-    if region.lower > spectrum.spectral_axis.max() or \
-            region.upper < spectrum.spectral_axis.min():
-        return None
-
-    # Clip region. There is currently no way to update
-    # SpectralRegion lower and upper so we have to create
-    # a new object here.
-    lower = max(region.lower, spectrum.spectral_axis.min())
-    upper = min(region.upper, spectrum.spectral_axis.max())
-
-    return SpectralRegion(lower, upper)
-
-
-def compute_stats(spectrum):
-    """
-    Compute basic statistics for a spectral region.
-    Parameters
-    ----------
-    spectrum : `~specutils.spectra.spectrum1d.Spectrum1D`
-    region: `~specutils.utils.SpectralRegion`
-    """
-
-    try:
-        cent = centroid(spectrum, region=None) # we may want to adjust this for continuum subtraction
-    except Exception as e:
-        logging.debug(e)
-        cent = "Error"
-
-    try:
-        snr_val = snr(spectrum)
-    except Exception as e:
-        logging.debug(e)
-        snr_val = "N/A"
-
-    try:
-        fwhm_val = fwhm(spectrum)
-    except Exception as e:
-        logging.debug(e)
-        fwhm_val = "Error"
-
-    try:
-        ew = equivalent_width(spectrum)
-    except Exception as e:
-        logging.debug(e)
-        ew = "Error"
-
-    try:
-        total = line_flux(spectrum)
-    except Exception as e:
-        logging.debug(e)
-        total = "Error"
-
-    return {'mean': spectrum.flux.mean(),
-            'median': np.median(spectrum.flux),
-            'stddev': spectrum.flux.std(),
-            'centroid': cent,
-            'snr': snr_val,
-            'fwhm': fwhm_val,
-            'ew': ew,
-            'total': total,
-            'maxval': spectrum.flux.max(),
-            'minval': spectrum.flux.min()}
-
-
-@plugin.plugin_bar("Statistics", icon=QIcon(":/icons/012-file.svg"), priority=1)
+@plugin.plugin_bar("Statistics")
 class StatisticsWidget(QWidget):
     """
     This widget controls the statistics box. It is responsible for calling
@@ -140,29 +26,28 @@ class StatisticsWidget(QWidget):
     computations. The stats box can be updated by calling the update_statistics
     function.
     """
+    #: The workspace changes which may affect the statistics of the current
+    #: item. Plots added to or removed from the plot only do if they show or
+    #: hide the current item.
+    _STATISTICS_CHANGES = (WorkspaceChange.DATA | WorkspaceChange.SELECTION |
+                           WorkspaceChange.PLOT_WINDOW | WorkspaceChange.ROI |
+                           WorkspaceChange.UNITS)
+
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
         self._current_spectrum = None  # Current `Spectrum1D`
         self._current_plot_item = None  # Current plot item
+        self._current_visible = False  # Whether the stats item was visible
         self.stats = None  # dict with stats
 
         self._init_ui()
 
-        self.hub.workspace.current_item_changed.connect(self.update_statistics)
-        # When the current subwindow changes, update the stat widget
-        self.hub.workspace.plot_window_activated.connect(self.update_statistics)
-        # When current item changes, update the stat widget
-        self.hub.workspace.current_item_changed.connect(self.update_statistics)
-        # When selection changes, update the stat widget
-        self.hub.workspace.current_selected_changed.connect(self.update_statistics)
-        # When new plot window is added, connect signals
-        self.hub.workspace.plot_window_added.connect(self._connect_plot_window)
-        # When an item in the workspace model changes, update the stat widget
-        self.hub.model.itemChanged.connect(self.update_statistics)
-
-        # Connect any currently open plot windows
-        for plot_window in self.hub.plot_windows:
-            self._connect_plot_window(plot_window)
+        # Update the stat widget once per user action changing the current
+        # item, the plot window, the plotted items, the regions or the units
+        self.hub.event_bus.state_changed.connect(self._on_state_changed)
+        # When a data item is appended to or patched, update the stat widget
+        # only if the changed samples can affect the statistics
+        self.hub.model.data_range_changed.connect(self._on_data_range_changed)
 
     def _init_ui(self):
         loadUi(os.path.abspath(
@@ -207,11 +92,21 @@ class StatisticsWidget(QWidget):
         self.comboBox.currentIndexChanged.connect(self._on_set_statistics_type)
         self._on_set_statistics_type()
 
-    def _connect_plot_window(self, plot_window):
-        plot_window.plot_widget.plot_added.connect(self.update_statistics)
-        plot_window.plot_widget.plot_removed.connect(self.update_statistics)
-        plot_window.plot_widget.roi_moved.connect(self.update_statistics)
-        plot_window.plot_widget.roi_removed.connect(self.update_statistics)
+    def _is_plot_item_visible(self):
+        plot_item = self.hub.plot_item
+
+        return plot_item is not None and plot_item.visible
+
+    def _on_state_changed(self, changes):
+        if not changes & self._STATISTICS_CHANGES and not (
+                changes & WorkspaceChange.PLOTS and
+                self._is_plot_item_visible() != self._current_visible):
+            return
+
+        self.update_statistics()
+
+    def _on_units_changed(self, *args):
+        self.hub.event_bus.notify(WorkspaceChange.UNITS)
 
     def set_status(self, message):
         """
@@ -343,14 +238,14 @@ class StatisticsWidget(QWidget):
             return
 
         if isinstance(self._current_plot_item, PlotDataItem):
-            self._current_plot_item.spectral_axis_unit_changed.disconnect(self.update_statistics)
-            self._current_plot_item.data_unit_changed.disconnect(self.update_statistics)
+            self._current_plot_item.spectral_axis_unit_changed.disconnect(self._on_units_changed)
+            self._current_plot_item.data_unit_changed.disconnect(self._on_units_changed)
 
         self._current_plot_item = self.hub.plot_item
 
         if isinstance(self._current_plot_item, PlotDataItem):
-            self._current_plot_item.spectral_axis_unit_changed.connect(self.update_statistics)
-            self._current_plot_item.data_unit_changed.connect(self.update_statistics)
+            self._current_plot_item.spectral_axis_unit_changed.connect(self._on_units_changed)
+            self._current_plot_item.data_unit_changed.connect(self._on_units_changed)
 
     def _spectrum_with_plot_units(self, spec):
         """
@@ -370,11 +265,38 @@ class StatisticsWidget(QWidget):
         new_spec = new_spec.with_spectral_unit(u.Unit(spectral_axis_unit))
         return new_spec
 
+    def _on_data_range_changed(self, data_item, start, stop):
+        """
+        Update the statistics after samples of a data item were appended or
+        patched, unless they are not the current data item's or are outside
+        of the selected region.
+        """
+        if data_item is not self.hub.data_item:
+            return
+
+        region = self._get_workspace_region()
+
+        if region is not None:
+            try:
+                changed = data_item.spectral_axis[start:stop].to(
+                    region.lower.unit, equivalencies=u.spectral())
+            except u.UnitConversionError:
+                changed = None
+
+            if changed is not None and len(changed) > 0 and \
+                    (changed.max() < region.lower or
+                     changed.min() > region.upper):
+                return
+
+        self.update_statistics()
+
     def update_statistics(self):
         """
         Retrieves the current data item in the workspace and calculates the
         set of statistics on its information.
         """
+        self._current_visible = self._is_plot_item_visible()
+
         if self.hub.workspace is None or self.hub.plot_item is None:
             return self.clear_statistics()
 
@@ -399,34 +321,17 @@ class StatisticsWidget(QWidget):
         else:
             spec = self._spectrum_with_plot_units(spec)
 
-        if spectral_region is not None:
-            if not check_unit_compatibility(spec, spectral_region):
-                self.set_status("Region units are not compatible with "
-                                "selected data's spectral axis units.")
-                return self.clear_statistics()
-            spectral_region = clip_region(spec, spectral_region)
-            if spectral_region is None:
-                self.set_status("Region out of bound.")
-                return self.clear_statistics()
-            try:
-                idx1, idx2 = spectral_region.bounds
-                if idx1 == idx2:
-                    self.set_status("Region over single value.")
-                    return self.clear_statistics()
-                spec = extract_region(spec, spectral_region)
-                if not len(spec.flux) > 0:
-                    self.set_status("Regione range is too small.")
-                    return self.clear_statistics()
-            except ValueError as e:
-                self.set_status("Region could not be extracted "
-                                "from target data.")
-                return self.clear_statistics()
-        elif self._workspace_has_region():
+        if spectral_region is None and self._workspace_has_region():
             self.set_status("Region has no units")
             return self.clear_statistics()
 
         # Compute stats and update widget:
-        self.stats = compute_stats(spec)
+        try:
+            self.stats = region_statistics(spec, spectral_region)
+        except ValueError as e:
+            self.set_status(str(e))
+            return self.clear_statistics()
+
         self._update_stat_widgets(self.stats)
         self.set_status(self._get_target_name())
 
@@ -7,7 +7,6 @@ from qtpy.QtWidgets import (QAction, QColorDialog, QDialog, QDialogButtonBox,
                             QListWidget, QMainWindow, QMdiSubWindow, QMenu,
                             QMessageBox, QSizePolicy, QToolButton, QWidget,
                             QWidgetAction)
-from qtpy.QtGui import QIcon
 from qtpy.uic import loadUi
 
 from ...core.plugin import plugin
@@ -130,7 +129,7 @@ class UnitChangeDialog(QDialog):
 
         super().show()
 
-    @plugin.plot_bar("Change Units", icon=QIcon(":/icons/012-file.svg"))
+    @plugin.plot_bar()
     def on_action_triggered(self):
         """
         Called when the user interacts with the ui button. Shows the dialog.
@@ -353,11 +352,9 @@ class UnitChangeDialog(QDialog):
         data_unit : str
             Formatted data axis unit.
         """
-        # Set new units
-        self.hub.plot_widget.set_spectral_axis_unit(spectral_axis_unit)
-
-        # Set new units
-        self.hub.plot_widget.set_data_unit(data_unit)
+        # Set new units in a single transaction
+        self.hub.plot_widget.set_units(data_unit=data_unit,
+                                       spectral_axis_unit=spectral_axis_unit)
 
 
     def on_canceled(self):
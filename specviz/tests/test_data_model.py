@@ -0,0 +1,260 @@
+import uuid
+
+import astropy.units as u
+import numpy as np
+from qtpy.QtCore import Qt
+from specutils import Spectrum1D
+
+from specviz.core.buffers import spectral_axis_buffer
+from specviz.core.items import DataItem
+from specviz.core.models import DataListModel, PlotProxyModel
+
+
+def _spectrum(size=10):
+    return Spectrum1D(flux=np.random.sample(size) * u.Jy,
+                      spectral_axis=np.arange(size) * u.AA)
+
+
+def test_item_from_id(specviz_gui):
+    model = DataListModel()
+
+    data_items = [model.add_data(_spectrum(), "Spectrum {}".format(i))
+                  for i in range(5)]
+
+    for row, data_item in enumerate(data_items):
+        assert model.item_from_id(data_item.identifier) is data_item
+        assert model.row_from_id(data_item.identifier) == row
+
+    assert model.item_from_id(uuid.uuid4()) is None
+    assert model.row_from_id(uuid.uuid4()) == -1
+
+
+def test_item_from_id_after_removal(specviz_gui):
+    model = DataListModel()
+
+    data_items = [model.add_data(_spectrum(), "Spectrum {}".format(i))
+                  for i in range(5)]
+
+    model.remove_data(data_items[1].identifier)
+
+    assert model.item_from_id(data_items[1].identifier) is None
+    assert model.row_from_id(data_items[4].identifier) == 3
+
+    model.clear()
+
+    assert all(model.item_from_id(x.identifier) is None for x in data_items)
+
+
+def test_row_from_id_after_insertion(specviz_gui):
+    model = DataListModel()
+
+    data_items = [model.add_data(_spectrum(), "Spectrum {}".format(i))
+                  for i in range(3)]
+
+    data_item = DataItem("Inserted", identifier=uuid.uuid4(),
+                         data=_spectrum())
+    model.insertRow(1, data_item)
+    data_items.insert(1, data_item)
+
+    for row, data_item in enumerate(data_items):
+        assert model.row_from_id(data_item.identifier) == row
+
+    model.sort(0, Qt.DescendingOrder)
+
+    for data_item in data_items:
+        assert model.row_from_id(data_item.identifier) == data_item.row()
+
+
+def test_add_data_batch(specviz_gui):
+    model = DataListModel()
+
+    inserted = []
+    batches = []
+    model.rowsInserted.connect(lambda parent, first, last:
+                               inserted.append((first, last)))
+    model.data_batch_added.connect(batches.append)
+
+    specs = {"Spectrum {}".format(i): _spectrum() for i in range(4)}
+    data_items = model.add_data_batch(specs)
+
+    assert inserted == [(0, 3)]
+    assert len(batches) == 1 and batches[0] == data_items
+    assert [x.name for x in model.items] == list(specs.keys())
+
+    for data_item in data_items:
+        assert model.item_from_id(data_item.identifier) is data_item
+
+
+def test_plot_items_built_lazily(specviz_gui):
+    model = DataListModel()
+    proxy_model = PlotProxyModel(model)
+
+    data_items = model.add_data_batch(
+        {"Spectrum {}".format(i): _spectrum() for i in range(4)})
+
+    for row in range(proxy_model.rowCount()):
+        index = proxy_model.index(row, 0)
+
+        assert proxy_model.data(index) == data_items[row].name
+        assert proxy_model.data(index, Qt.CheckStateRole) != Qt.Checked
+
+    assert len(proxy_model.descriptors) == 4
+    assert proxy_model.items == []
+
+    proxy_model.setData(proxy_model.index(1, 0), Qt.Checked,
+                        Qt.CheckStateRole)
+
+    plot_data_item = proxy_model.item_from_id(data_items[1].identifier,
+                                              build=False)
+
+    assert proxy_model.items == [plot_data_item]
+    assert plot_data_item.visible
+    assert plot_data_item.descriptor is \
+        proxy_model.descriptor_from_id(data_items[1].identifier)
+
+
+def test_unit_compatibility(specviz_gui):
+    model = DataListModel()
+    proxy_model = PlotProxyModel(model)
+
+    data_items = model.add_data_batch(
+        {"Spectrum {}".format(i): _spectrum() for i in range(3)})
+    descriptors = [proxy_model.descriptor_from_id(x.identifier)
+                   for x in data_items]
+
+    for descriptor in descriptors:
+        assert descriptor.are_units_compatible(u.Hz, u.Unit('erg/(s cm2 AA)'))
+        assert not descriptor.are_units_compatible(u.Hz, u.s)
+        assert not descriptor.are_units_compatible(u.kg, u.Jy)
+
+
+def test_shared_spectral_axis(specviz_gui):
+    model = DataListModel()
+
+    spectral_axis = np.arange(1000) * u.AA
+    data_items = [
+        model.add_data(Spectrum1D(flux=np.random.sample(1000) * u.Jy,
+                                  spectral_axis=spectral_axis.copy()),
+                       "Spectrum {}".format(i)) for i in range(3)]
+
+    assert data_items[0].spectral_axis is data_items[1].spectral_axis
+    assert data_items[0].spectral_axis is data_items[2].spectral_axis
+    assert not data_items[0].spectral_axis.flags.writeable
+
+    # The stored spectra retain the pooled buffer rather than their own copy
+    for data_item in data_items:
+        assert np.shares_memory(spectral_axis_buffer(data_item.spectrum),
+                                data_items[0].spectral_axis)
+
+    # Three flux arrays and a single shared spectral axis
+    assert model.memory_usage() == 4 * spectral_axis.nbytes
+
+    # Edits keeping the spectral axis keep sharing it
+    data_items[1].set_data(Spectrum1D(flux=data_items[1].flux,
+                                      spectral_axis=spectral_axis.copy()))
+
+    assert data_items[1].spectral_axis is data_items[0].spectral_axis
+    assert model.memory_usage() == 4 * spectral_axis.nbytes
+
+
+def test_spectral_axis_leaves_spectrum_unchanged(specviz_gui):
+    model = DataListModel()
+    spectrum = _spectrum()
+    buffer = spectral_axis_buffer(spectrum)
+
+    data_item = model.add_data(spectrum, "Spectrum")
+    spectral_axis = data_item.spectral_axis
+
+    # The model stores a new spectrum built around the pooled spectral axis,
+    # and the spectrum of the caller keeps its own
+    assert data_item.spectrum is not spectrum
+    assert spectral_axis_buffer(spectrum) is buffer
+    assert buffer.flags.writeable
+    assert not np.shares_memory(buffer, spectral_axis)
+    assert np.all(spectral_axis == spectrum.spectral_axis)
+
+    # Reading the spectral axis does not modify the stored spectrum either
+    stored_buffer = spectral_axis_buffer(data_item.spectrum)
+
+    assert data_item.spectral_axis is spectral_axis
+    assert spectral_axis_buffer(data_item.spectrum) is stored_buffer
+    assert 'spectral_axis' not in vars(data_item.spectrum)
+
+
+def test_append_and_patch(specviz_gui):
+    model = DataListModel()
+    data_item = model.add_data(_spectrum(), "Spectrum")
+
+    ranges = []
+    changed = []
+    model.data_range_changed.connect(
+        lambda item, start, stop: ranges.append((item, start, stop)))
+    model.itemChanged.connect(changed.append)
+
+    version = data_item.data_version
+    data_item.append(np.ones(5) * u.Jy, np.arange(10, 15) * u.AA)
+    data_item.patch(slice(2, 4), flux=[5, 6])
+
+    assert ranges == [(data_item, 10, 15), (data_item, 2, 4)]
+    assert changed == []
+    assert data_item.data_version == version + 2
+    assert len(data_item.flux) == 15
+    assert np.all(data_item.flux[10:] == 1 * u.Jy)
+    assert np.all(data_item.flux[2:4] == [5, 6] * u.Jy)
+    assert np.all(data_item.spectral_axis == np.arange(15) * u.AA)
+
+
+def test_converted_arrays_shared(specviz_gui):
+    model = DataListModel()
+    data_item = model.add_data(_spectrum(), "Spectrum")
+
+    proxy_models = [PlotProxyModel(model) for _ in range(4)]
+    items = [x.item_from_id(data_item.identifier) for x in proxy_models]
+
+    for item in items:
+        item.set_units('mJy', 'nm')
+        item.visible = True
+
+    # The arrays are converted once, whatever the number of plot windows
+    assert all(item.flux is items[0].flux for item in items)
+    assert all(item.spectral_axis is items[0].spectral_axis for item in items)
+    assert np.all(items[0].flux == data_item.flux.to_value(u.mJy))
+
+    # Windows displaying other units hold their own arrays
+    items[0].set_units('Jy')
+
+    assert items[0].flux is not items[1].flux
+    assert items[1].flux is items[2].flux
+
+
+def test_converted_arrays_cached(specviz_gui):
+    model = DataListModel()
+    proxy_model = PlotProxyModel(model)
+    data_item = model.add_data(_spectrum(), "Spectrum")
+
+    item = proxy_model.item_from_id(data_item.identifier)
+    item.visible = True
+
+    flux, spectral_axis = item.flux, item.spectral_axis
+
+    # Changing the display state keeps the converted arrays
+    item.color = '#ff0000'
+    item.width = 3
+    item.zorder = 5
+
+    assert item.flux is flux
+    assert item.spectral_axis is spectral_axis
+
+    # Changing the unit converts the arrays again
+    item.set_units('mJy')
+
+    assert item.flux is not flux
+    assert item.spectral_axis is spectral_axis
+    assert np.allclose(item.flux, data_item.flux.to_value(u.mJy))
+
+    # Changing the data converts the arrays again
+    flux = item.flux
+    data_item.set_data(_spectrum())
+
+    assert item.flux is not flux
+    assert np.allclose(item.flux, data_item.flux.to_value(u.mJy))
@@ -0,0 +1,81 @@
+import numpy as np
+
+from specviz.core.decimation import EnvelopePyramid
+
+
+def test_envelope_levels():
+    values = np.random.sample(10000)
+    edges = np.arange(values.size + 1, dtype=float)
+
+    envelope = EnvelopePyramid(edges, values, factor=4, min_size=100)
+
+    assert envelope.levels > 1
+    assert envelope.bounds(0) == (0, values.size)
+    assert envelope.bounds(1) == (values.min(), values.max())
+
+    level, start, stop = envelope.window(max_bins=500)
+    x, y = envelope.data(level, start, stop)
+
+    assert level > 0
+    assert len(x) == len(y) + 1
+    assert y.min() == values.min() and y.max() == values.max()
+
+
+def test_envelope_window_clipping():
+    values = np.random.sample(10000)
+    edges = np.arange(values.size + 1, dtype=float)
+
+    # Decreasing edges, e.g. frequencies converted from wavelengths
+    for edges in (edges, edges[::-1]):
+        envelope = EnvelopePyramid(edges, values)
+
+        level, start, stop = envelope.window((2000, 2100), max_bins=1000,
+                                             pad=False)
+        x, y = envelope.data(level, start, stop)
+
+        assert level == 0
+        assert x.min() <= 2000 and x.max() >= 2100
+        assert len(y) < 110
+
+
+def test_envelope_band():
+    values = np.random.sample(10000)
+    edges = np.arange(values.size + 1, dtype=float)
+
+    envelope = EnvelopePyramid(edges, values - 0.1, upper=values + 0.1,
+                               min_size=100)
+
+    level, start, stop = envelope.window(max_bins=500)
+    edges, lower, upper = envelope.band(level, start, stop)
+
+    assert len(edges) == len(lower) + 1 == len(upper) + 1
+    assert np.all(lower <= upper)
+    assert lower.min() == (values - 0.1).min()
+    assert upper.max() == (values + 0.1).max()
+
+
+def test_envelope_update():
+    values = np.random.sample(10000)
+    edges = np.arange(values.size + 1, dtype=float)
+
+    envelope = EnvelopePyramid(edges[:5001], values[:5000], min_size=100)
+
+    # Append the remaining samples and patch a few existing ones
+    envelope.update(edges, values, 5000, values.size)
+    values[10:20] = 2
+    envelope.update(edges, values, 10, 20)
+
+    expected = EnvelopePyramid(edges, values, min_size=100)
+
+    assert envelope.levels == expected.levels
+    assert envelope.bounds(0) == expected.bounds(0)
+    assert envelope.bounds(1) == expected.bounds(1)
+
+    for max_bins in (100, 1000, 20000):
+        window = expected.window(max_bins=max_bins)
+
+        assert envelope.window(max_bins=max_bins) == window
+
+        for actual, reference in zip(envelope.data(*window),
+                                     expected.data(*window)):
+            assert np.all(actual == reference)
@@ -0,0 +1,21 @@
+from specviz.core.events import WorkspaceChange, WorkspaceEventBus
+
+
+def test_event_bus_coalesces(specviz_gui):
+    bus = WorkspaceEventBus()
+    received = []
+    bus.state_changed.connect(received.append)
+
+    bus.notify(WorkspaceChange.SELECTION)
+    bus.notifier(WorkspaceChange.PLOTS)(object())
+    bus.notify(WorkspaceChange.SELECTION)
+
+    # Nothing is delivered until control returns to the event loop
+    assert received == []
+    assert bus.pending == WorkspaceChange.SELECTION | WorkspaceChange.PLOTS
+
+    bus.flush()
+    bus.flush()
+
+    assert received == [WorkspaceChange.SELECTION | WorkspaceChange.PLOTS]
+    assert not bus.pending
@@ -0,0 +1,61 @@
+import os
+
+import astropy.units as u
+import numpy as np
+from astropy.io import fits
+from astropy.nddata import StdDevUncertainty
+from specutils import Spectrum1D
+
+from specviz.core.export import export_spectra, export_spectrum
+
+
+def _spectrum(size=100):
+    flux = np.random.sample(size)
+
+    return Spectrum1D(flux=flux * u.Jy, spectral_axis=np.arange(size) * u.AA,
+                      uncertainty=StdDevUncertainty(flux * 0.1),
+                      meta={'header': {'OBJECT': 'M31'}})
+
+
+def test_export_fits(tmpdir):
+    spectrum = _spectrum()
+    path = str(tmpdir.join('spectrum.fits'))
+
+    export_spectrum(spectrum, path)
+
+    with fits.open(path) as hdulist:
+        assert hdulist[0].header['OBJECT'] == 'M31'
+
+        table = hdulist[1]
+
+        # Missing masks are not written
+        assert table.columns.names == ['spectral_axis', 'flux',
+                                       'uncertainty']
+        assert table.columns['flux'].unit == 'Jy'
+        assert np.all(table.data['flux'] == spectrum.flux.value)
+        assert np.all(table.data['spectral_axis'] ==
+                      spectrum.spectral_axis.value)
+
+
+def test_export_spectra(tmpdir):
+    directory = str(tmpdir.join('export'))
+    specs = [('Spectrum 1', _spectrum()), ('Spectrum 1', _spectrum()),
+             ('a/b', _spectrum())]
+
+    results = list(export_spectra(specs, directory, '*.ecsv', max_workers=2))
+
+    assert all(exception is None for path, exception in results)
+    assert sorted(os.listdir(directory)) == [
+        'Spectrum_1-1.ecsv', 'Spectrum_1.ecsv', 'a_b.ecsv']
+
+
+def test_export_spectra_from_generators(tmpdir):
+    directory = str(tmpdir.join('export'))
+
+    assert list(export_spectra((x for x in ()), directory, '*.ecsv')) == []
+
+    results = list(export_spectra(((name, _spectrum()) for name in 'ab'),
+                                  directory, '*.ecsv'))
+
+    assert all(exception is None for path, exception in results)
+    assert sorted(os.listdir(directory)) == ['a.ecsv', 'b.ecsv']
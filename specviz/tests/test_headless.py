@@ -0,0 +1,51 @@
+import astropy.units as u
+import numpy as np
+from astropy.modeling.models import Gaussian1D
+from specutils import SpectralRegion, Spectrum1D
+
+from specviz.core.analysis import KERNEL_REGISTRY
+from specviz.core.buffers import spectral_axis_buffer
+from specviz.headless import HeadlessSession
+
+
+def _spectrum():
+    y = Gaussian1D(amplitude=1, mean=50, stddev=5)(np.arange(100))
+
+    return Spectrum1D(flux=y * u.Jy, spectral_axis=np.arange(100) * u.AA)
+
+
+def test_kernel_registry():
+    assert set(KERNEL_REGISTRY) == {'box', 'gaussian', 'trapezoid', 'median'}
+
+
+def test_headless_session(tmpdir):
+    session = HeadlessSession()
+
+    name = session.add_data(_spectrum(), "Spectrum")
+
+    assert session.add_data(_spectrum(), "Spectrum") == "Spectrum (1)"
+
+    smoothed = session.smooth(name, 'box', 3)
+
+    assert smoothed == "Spectrum Smoothed(Box, 3 pixels)"
+    assert np.shares_memory(spectral_axis_buffer(session[smoothed]),
+                            spectral_axis_buffer(session[name]))
+
+    doubled = session.arithmetic("{Spectrum} * 2", "Doubled")
+
+    assert np.allclose(session[doubled].flux, session[name].flux * 2)
+
+    stats = session.statistics(name, SpectralRegion(40 * u.AA, 60 * u.AA))
+
+    assert np.isclose(stats['maxval'], 1 * u.Jy)
+
+    fitted = session.fit(name, Gaussian1D(amplitude=0.8 * u.Jy,
+                                          mean=48 * u.AA, stddev=4 * u.AA))
+
+    assert np.isclose(fitted.mean.value, 50)
+    assert "Spectrum Model" in session
+
+    errors = session.export_all(str(tmpdir), '*.ecsv')
+
+    assert errors == {}
+    assert len(tmpdir.listdir()) == len(session)
@@ -0,0 +1,155 @@
+import os
+
+import astropy.units as u
+import numpy as np
+import pytest
+from astropy.io import fits
+from astropy.nddata import StdDevUncertainty
+from specutils import Spectrum1D, SpectrumList
+
+from specviz.core.export import export_spectrum
+from specviz.core.loading import (LoadCancelled, LoaderCache, ProgressFile,
+                                  _export_spectra, _import_spectra,
+                                  _release_spectra, expand_paths,
+                                  shared_memory, spectrum_names)
+
+
+def test_progress_file(tmpdir):
+    path = str(tmpdir.join('data.bin'))
+
+    with open(path, 'wb') as f:
+        f.write(b'x' * 1000)
+
+    positions = []
+
+    with ProgressFile(path, positions.append) as f:
+        f.read(100)
+        f.read()
+
+    assert positions == [100, 1000]
+
+    def cancel(position):
+        raise LoadCancelled()
+
+    with pytest.raises(LoadCancelled):
+        with ProgressFile(path, cancel) as f:
+            f.read(100)
+
+
+def test_spectrum_names():
+    assert spectrum_names('/data/jw001_x1d.fits', 1) == ['jw001_x1d']
+    assert spectrum_names('/data/jw001_x1dints.fits', 2) == [
+        'jw001_x1dints-0', 'jw001_x1dints-1']
+
+
+def test_loader_cache(tmpdir):
+    def write(name, instrument, size=10):
+        path = str(tmpdir.join(name))
+        header = fits.Header({'TELESCOP': 'JWST', 'INSTRUME': instrument})
+        fits.PrimaryHDU(np.zeros(size), header=header).writeto(path)
+        return path
+
+    cache_path = str(tmpdir.join('cache', 'loader_cache.json'))
+    cache = LoaderCache(path=cache_path)
+
+    first = write('first.fits', 'NIRSPEC')
+    cache.store(first, 'JWST x1d')
+
+    # Stored loaders are only written when flushed
+    assert not os.path.exists(cache_path)
+    cache.flush()
+    assert os.path.exists(cache_path)
+    assert LoaderCache(path=cache_path).lookup(first) == 'JWST x1d'
+
+    # Products of the same kind are identified from their primary header
+    assert cache.lookup(write('second.fits', 'NIRSPEC', size=20)) == \
+        'JWST x1d'
+    assert cache.lookup(write('third.fits', 'MIRI')) is None
+
+    # Non-FITS files are only identified once seen, and until they change
+    other = str(tmpdir.join('spectrum.ecsv'))
+
+    with open(other, 'w') as f:
+        f.write('# %ECSV 0.9')
+
+    assert cache.lookup(other) is None
+    cache.store(other, 'ECSV')
+    assert cache.lookup(other) == 'ECSV'
+
+    with open(other, 'a') as f:
+        f.write('\n')
+
+    assert cache.lookup(other) is None
+
+
+def test_expand_paths(tmpdir):
+    for name in ('b.fits', 'a.fits', 'c.txt'):
+        tmpdir.join(name).write('')
+
+    tmpdir.mkdir('sub').join('d.fits').write('')
+
+    def path(name):
+        return str(tmpdir.join(name))
+
+    assert expand_paths(str(tmpdir)) == [path('a.fits'), path('b.fits'),
+                                         path('c.txt')]
+    assert expand_paths([path('*.fits'), path('a.fits'), path('sub')]) == [
+        path('a.fits'), path('b.fits'), path('sub/d.fits')]
+
+
+def test_shared_memory_round_trip():
+    speclist = SpectrumList([
+        Spectrum1D(flux=np.random.sample(100) * u.Jy,
+                   spectral_axis=np.arange(100) * u.AA,
+                   uncertainty=StdDevUncertainty(np.random.sample(100)),
+                   mask=np.zeros(100, dtype=bool)),
+        Spectrum1D(flux=np.random.sample(7).astype(np.float32) * u.mJy,
+                   spectral_axis=np.arange(7) * u.um)])
+
+    result = _import_spectra(*_export_spectra(speclist))
+
+    assert len(result) == 2
+
+    for spectrum, expected in zip(result, speclist):
+        assert np.all(spectrum.flux == expected.flux)
+        assert spectrum.flux.dtype == expected.flux.dtype
+        assert np.all(spectrum.spectral_axis == expected.spectral_axis)
+
+    assert isinstance(result[0].uncertainty, StdDevUncertainty)
+    assert np.all(result[0].uncertainty.array ==
+                  speclist[0].uncertainty.array)
+    assert np.all(result[0].mask == speclist[0].mask)
+    assert result[1].uncertainty is None
+
+
+@pytest.mark.skipif(shared_memory is None,
+                    reason="Shared memory requires Python 3.8")
+def test_release_shared_memory():
+    name, descriptions = _export_spectra(SpectrumList([
+        Spectrum1D(flux=np.random.sample(10) * u.Jy,
+                   spectral_axis=np.arange(10) * u.AA)]))
+
+    _release_spectra(name)
+
+    with pytest.raises(FileNotFoundError):
+        shared_memory.SharedMemory(name=name)
+
+
+def test_load_files_sharing_a_name(specviz_gui, tmpdir):
+    workspace = specviz_gui.current_workspace
+    paths = []
+
+    # Files of different directories are loaded under the same name
+    for directory in ('a', 'b'):
+        path = str(tmpdir.mkdir(directory).join('foo.ecsv'))
+        export_spectrum(Spectrum1D(flux=np.random.sample(10) * u.Jy,
+                                   spectral_axis=np.arange(10) * u.AA),
+                        path, '*.ecsv')
+        paths.append(path)
+
+    data_items = workspace.load_data_from_files(paths, file_loader='ECSV',
+                                                max_workers=1)
+
+    assert [x.name for x in data_items] == ['foo', 'foo']
+    assert all(workspace.model.item_from_id(x.identifier) is x
+               for x in data_items)
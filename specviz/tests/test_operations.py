@@ -0,0 +1,122 @@
+import numpy as np
+
+from specviz.core.operations import (FunctionalOperation, OperationHistory,
+                                     estimate_nbytes)
+
+
+def test_estimate_nbytes_follows_closures():
+    array = np.zeros(1000)
+
+    def function(flux, spectral_axis):
+        return flux + array
+
+    assert estimate_nbytes(function) >= array.nbytes
+
+    # Objects referenced twice are counted once
+    assert estimate_nbytes([array, array]) < 2 * array.nbytes
+
+
+def test_operation_history_limits():
+    history = OperationHistory(max_entries=3, max_bytes=10 ** 5)
+    operations = [[np.zeros(1000)] for i in range(4)]
+
+    for operation in operations:
+        history.append(operation)
+
+    # Bounded by count, least recently used first
+    assert list(history) == operations[1:]
+
+    history.touch(operations[1])
+    history.set_limits(max_bytes=2 * 8000 + 1000)
+
+    # Bounded by memory, the touched operation is kept
+    assert list(history) == [operations[3], operations[1]]
+    assert history.nbytes == sum(nbytes for op, nbytes in history.entries())
+    assert history.nbytes_of(operations[0]) is None
+
+    # The last operation is kept even if it exceeds the limit
+    history.set_limits(max_bytes=0)
+
+    assert list(history) == [operations[1]]
+
+
+def test_operation_stack_is_bounded():
+    history = FunctionalOperation.history()
+    max_entries = history.max_entries
+
+    try:
+        history.set_limits(max_entries=2)
+
+        for i in range(5):
+            operation = FunctionalOperation(np.add, i)
+
+        assert FunctionalOperation.operations()[-1] is operation
+        assert len(FunctionalOperation.operations()) == 2
+    finally:
+        history.set_limits(max_entries=max_entries)
+
+
+def test_batch_matches_spectra():
+    from functools import wraps
+
+    import astropy.units as u
+    from specutils import Spectrum1D
+    from specutils.manipulation.smoothing import box_smooth
+
+    # Registers the vectorised smoothing kernels
+    import specviz.core.analysis  # noqa
+
+    def func_convert(func):
+        @wraps(func)
+        def wrapper(data, spectral_axis, *args, **kwargs):
+            spec = Spectrum1D(flux=u.Quantity(data),
+                              spectral_axis=spectral_axis)
+            return func(spec, *args, **kwargs).flux.value
+        return wrapper
+
+    flux = np.random.sample((4, 50)) * u.Jy
+    spectral_axis = np.arange(50) * u.AA
+
+    for operation in (FunctionalOperation(func_convert(box_smooth), 5),
+                      FunctionalOperation(lambda data, axis, scale:
+                                          data.value * scale, 2)):
+        expected = [operation(row, spectral_axis) for row in flux]
+
+        assert np.allclose(operation.batch(flux, spectral_axis), expected)
+
+
+def test_median_batch_matches_median_smooth():
+    import astropy.units as u
+    import pytest
+    from specutils import Spectrum1D
+    from specutils.manipulation.smoothing import median_smooth
+
+    # Registers the vectorised smoothing kernels
+    import specviz.core.analysis  # noqa
+
+    def smooth(data, spectral_axis, width):
+        spec = Spectrum1D(flux=u.Quantity(data), spectral_axis=spectral_axis)
+        return median_smooth(spec, width).flux.value
+
+    smooth.__wrapped__ = median_smooth
+
+    flux = np.random.sample((4, 50)) * u.Jy
+    spectral_axis = np.arange(50) * u.AA
+
+    for width in (3, 5):
+        operation = FunctionalOperation(smooth, width)
+        expected = [median_smooth(Spectrum1D(flux=row,
+                                             spectral_axis=spectral_axis),
+                                  width).flux.value for row in flux]
+
+        assert np.allclose(operation.batch(flux, spectral_axis), expected)
+
+    # Widths rejected for a single spectrum are rejected for several
+    for width in (4, 3.5):
+        operation = FunctionalOperation(smooth, width)
+
+        with pytest.raises(ValueError):
+            operation(flux[0], spectral_axis)
+
+        with pytest.raises(ValueError):
+            operation.batch(flux, spectral_axis)
@@ -0,0 +1,84 @@
+import astropy.units as u
+import numpy as np
+from astropy.nddata import StdDevUncertainty
+from specutils import Spectrum1D
+
+from specviz.core.pipeline import Pipeline
+
+
+def _spectrum():
+    return Spectrum1D(flux=np.random.sample(100) * u.Jy,
+                      spectral_axis=np.arange(1, 101) * u.AA)
+
+
+def test_pipeline_recomputes_downstream_only():
+    calls = []
+
+    def scale(inputs, factor=1):
+        calls.append(factor)
+        spectrum = next(iter(inputs.values()))
+
+        return Spectrum1D(flux=spectrum.flux * factor,
+                          spectral_axis=spectrum.spectral_axis)
+
+    spectrum = _spectrum()
+
+    pipeline = Pipeline()
+    pipeline.add_source('data', spectrum)
+    pipeline.add_operation('smoothed', 'smooth', ['data'], kernel='box',
+                           size=3)
+    pipeline.add_operation('scaled', scale, ['smoothed'], factor=2)
+    pipeline.add_operation('difference', 'arithmetic', ['scaled', 'data'],
+                           expression="{scaled} - {data}")
+
+    result = pipeline.evaluate('difference')
+
+    assert calls == [2]
+    assert pipeline.downstream('smoothed') == ['scaled', 'difference']
+
+    # Nothing changed, so every node is cached
+    assert pipeline.evaluate('difference') is result
+
+    # Only the scaled node and the nodes downstream of it are recomputed
+    misses = pipeline.cache.misses
+    pipeline.set_parameters('scaled', factor=3)
+    pipeline.evaluate('difference')
+
+    assert calls == [2, 3]
+    assert pipeline.cache.misses == misses + 2
+
+    # Reverting the parameter reuses the cached results
+    pipeline.set_parameters('scaled', factor=2)
+
+    assert pipeline.evaluate('difference') is result
+    assert calls == [2, 3]
+
+    # New input data recomputes the whole chain
+    pipeline.set_data('data', _spectrum())
+    pipeline.evaluate('difference')
+
+    assert calls == [2, 3, 2]
+
+
+def _constant(spectral_axis):
+    return np.full(len(spectral_axis), 2.)
+
+
+def test_operations_keep_uncertainty_mask_and_meta():
+    flux = np.random.sample(100)
+    spectrum = Spectrum1D(flux=flux * u.Jy,
+                          spectral_axis=np.arange(1, 101) * u.AA,
+                          uncertainty=StdDevUncertainty(flux * 0.1),
+                          mask=flux > 0.5, meta={'header': {'OBJECT': 'M31'}})
+
+    pipeline = Pipeline()
+    pipeline.add_source('data', spectrum)
+    pipeline.add_operation('model', 'evaluate_model', ['data'],
+                           model=_constant)
+
+    result = pipeline.evaluate('model')
+
+    assert np.all(result.flux == 2 * u.Jy)
+    assert np.all(result.uncertainty.array == spectrum.uncertainty.array)
+    assert np.all(result.mask == spectrum.mask)
+    assert result.meta == spectrum.meta
@@ -0,0 +1,51 @@
+import astropy.units as u
+import numpy as np
+from specutils import Spectrum1D
+
+from specviz.core.models import DataListModel
+from specviz.widgets.plotting import PlotWidget
+
+
+def test_set_units(specviz_gui):
+    model = DataListModel()
+    plot_widget = PlotWidget(model=model)
+
+    model.add_data_batch({
+        "Spectrum {}".format(i): Spectrum1D(
+            flux=np.random.sample(10) * u.Jy,
+            spectral_axis=np.arange(1, 11) * u.AA) for i in range(5)})
+    plot_widget.add_plots(plot_widget.proxy_model.descriptors)
+
+    emitted = []
+    plot_widget.data_unit_changed.connect(emitted.append)
+    plot_widget.spectral_axis_unit_changed.connect(emitted.append)
+
+    plot_widget.set_units(data_unit='mJy', spectral_axis_unit='nm')
+
+    assert emitted == ['mJy', 'nm']
+    assert plot_widget.data_unit == 'mJy'
+    assert plot_widget.spectral_axis_unit == 'nm'
+
+    for item in plot_widget.proxy_model.items:
+        np.testing.assert_allclose(item.flux, item.data_item.flux.value * 1e3)
+        np.testing.assert_allclose(item.spectral_axis,
+                                   item.data_item.spectral_axis.value / 10)
+
+
+def test_add_plots_data_changed(specviz_gui):
+    model = DataListModel()
+    plot_widget = PlotWidget(model=model)
+
+    model.add_data_batch({
+        "Spectrum {}".format(i): Spectrum1D(
+            flux=np.random.sample(10) * u.Jy,
+            spectral_axis=np.arange(1, 11) * u.AA) for i in range(5)})
+
+    changed = []
+    plot_widget.proxy_model.dataChanged.connect(
+        lambda first, last, *args: changed.append((first.row(), last.row())))
+
+    plot_widget.add_plots(plot_widget.proxy_model.descriptors)
+
+    assert changed == [(0, 4)]
+    assert all(x.visible for x in plot_widget.proxy_model.items)
@@ -0,0 +1,62 @@
+import astropy.units as u
+import numpy as np
+from specutils import Spectrum1D
+
+from specviz import batch
+from specviz.batch import run_recipe
+from specviz.core.analysis import smooth
+from specviz.core.recipe import Recipe
+
+
+def _spectrum():
+    return Spectrum1D(flux=np.random.sample(100) * u.Jy,
+                      spectral_axis=np.arange(100) * u.AA)
+
+
+def test_recipe_round_trip(tmpdir):
+    path = str(tmpdir.join('recipe.json'))
+    recipe = Recipe([{'operation': 'smooth', 'kernel': 'box', 'size': 3},
+                     {'operation': 'arithmetic',
+                      'expression': "{step 1} - {input}"}])
+
+    recipe.save(path)
+    recipe = Recipe.load(path)
+
+    spectrum = _spectrum()
+    result = recipe.apply(spectrum)
+
+    assert np.allclose(result.flux,
+                       smooth(spectrum, 'box', 3).flux - spectrum.flux)
+
+
+def test_run_recipe_reports_failures(tmpdir):
+    path = tmpdir.join('not_a_spectrum.txt')
+    path.write("not a spectrum")
+
+    reports = list(run_recipe(Recipe([]), [str(path)],
+                              str(tmpdir.join('output')), max_workers=1))
+
+    assert len(reports) == 1
+    assert reports[0].error is not None
+    assert 'read' in reports[0].times
+
+
+def test_multi_spectrum_outputs_do_not_collide(tmpdir, monkeypatch):
+    output = tmpdir.join('output')
+    output.ensure(dir=True)
+
+    monkeypatch.setattr(batch, 'read_spectra', lambda file_path, **kwargs:
+                        [_spectrum(), _spectrum()])
+    multi = batch._process_file(Recipe([]), 'foo.ecsv',
+                                str(output.join('foo')), '*.ecsv')
+
+    monkeypatch.setattr(batch, 'read_spectra', lambda file_path, **kwargs:
+                        [_spectrum()])
+    single = batch._process_file(Recipe([]), 'foo-0.ecsv',
+                                 str(output.join('foo-0')), '*.ecsv')
+
+    assert multi.error is None and single.error is None
+    assert single.outputs == [str(output.join('foo-0.ecsv'))]
+    assert multi.outputs == [str(output.join('foo', 'foo-0.ecsv')),
+                             str(output.join('foo', 'foo-1.ecsv'))]
+    assert len(set(multi.outputs + single.outputs)) == 3
@@ -0,0 +1,69 @@
+import os
+
+import astropy.units as u
+import numpy as np
+from astropy.nddata import StdDevUncertainty
+from specutils import Spectrum1D
+
+from specviz.core.models import DataListModel
+from specviz.core.session import load_session, save_session
+
+
+def _is_memmap(array):
+    while array is not None:
+        if isinstance(array, np.memmap):
+            return True
+
+        array = array.base
+
+    return False
+
+
+def test_session_round_trip(specviz_gui, tmpdir):
+    model = DataListModel()
+
+    spectral_axis = np.arange(100) * u.AA
+    flux = np.random.sample(100)
+
+    data_items = [
+        model.add_data(Spectrum1D(flux=flux * u.Jy,
+                                  spectral_axis=spectral_axis,
+                                  uncertainty=StdDevUncertainty(flux * 0.1),
+                                  meta={'header': {'OBJECT': 'M31'}}),
+                       "Spectrum"),
+        model.add_data(Spectrum1D(flux=2 * flux * u.mJy,
+                                  spectral_axis=spectral_axis),
+                       "Derived Spectrum")]
+
+    path = str(tmpdir.join('session.specviz'))
+    windows = [{'title': 'Plot'}]
+
+    save_session(path, model, windows=windows)
+
+    # The shared spectral axis is only stored once
+    assert len(os.listdir(os.path.join(path, 'arrays'))) == 4
+
+    restored, restored_windows = load_session(path)
+
+    assert restored_windows == windows
+    assert [x.name for x in restored] == [x.name for x in data_items]
+    assert [x.identifier for x in restored] == \
+        [x.identifier for x in data_items]
+
+    for data_item, expected in zip(restored, data_items):
+        assert _is_memmap(data_item.spectrum.data)
+        assert np.all(data_item.flux == expected.flux)
+        assert np.all(data_item.spectral_axis == expected.spectral_axis)
+
+    assert isinstance(restored[0].uncertainty, StdDevUncertainty)
+    assert np.all(restored[0].uncertainty.array == flux * 0.1)
+    assert restored[0].spectrum.meta['header']['OBJECT'] == 'M31'
+    assert restored[1].uncertainty is None
+
+    # Saving the restored items again reuses the mapped files
+    restored_model = DataListModel()
+    restored_model.append_data_items(restored[:1])
+
+    save_session(path, restored_model)
+
+    assert len(os.listdir(os.path.join(path, 'arrays'))) == 3
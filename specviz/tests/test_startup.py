@@ -1,5 +1,8 @@
+import importlib
+
 from qtpy import QtCore
 from specviz.app import Application
+from specviz.core.plugin import plugin
 
 
 def test_specviz_startup(qtbot):
@@ -7,3 +10,44 @@ def test_specviz_startup(qtbot):
     app = Application([], dev=True)
     qtbot.addWidget(app.current_workspace)
     qtbot.mouseClick(app.current_workspace, QtCore.Qt.LeftButton)
+
+    assert list(app.startup_times) == ["Loading plugins", "Creating workspace",
+                                       "Adding example data"]
+
+
+def test_declared_plugins_loaded_on_first_use(specviz_gui):
+    workspace = specviz_gui.current_workspace
+
+    assert 'Smoothing' not in workspace._plugins
+
+    smoothing = workspace._plugins['Smoothing']
+
+    assert workspace._plugins['Smoothing'] is smoothing
+    assert workspace._plugins.get('Unknown') is None
+
+
+def test_declared_plugins_match_decorators():
+    for entry in plugin.entries.values():
+        wrapper = getattr(importlib.import_module(entry.module),
+                          entry.attribute)
+        cls = wrapper.__wrapped__
+
+        assert wrapper.plugin_name == entry.name
+        assert cls.plugin_name == entry.name
+        assert cls.type == entry.type
+        assert cls.priority == entry.priority
+
+        for action in entry.actions:
+            method = getattr(cls, action.method)
+
+            assert method.plugin_type == action.type
+            assert plugin._action_options(cls, method.__wrapped__, None, None,
+                                          None)[0] == action.name
+
+
+def test_plugin_hub_per_workspace(specviz_gui):
+    workspaces = [specviz_gui.add_workspace() for _ in range(2)]
+    plugins = [x._plugins['Smoothing'] for x in workspaces]
+
+    for workspace, instance in zip(workspaces, plugins):
+        assert instance.hub.workspace is workspace
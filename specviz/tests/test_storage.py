@@ -0,0 +1,50 @@
+import os
+
+import astropy.units as u
+import numpy as np
+from astropy.nddata import StdDevUncertainty
+from specutils import Spectrum1D
+
+from specviz.core.buffers import spectral_axis_buffer
+from specviz.core.models import DataListModel
+from specviz.core.storage import MemmapStorage
+
+
+def _is_memmap(array):
+    while array is not None:
+        if isinstance(array, np.memmap):
+            return True
+
+        array = array.base
+
+    return False
+
+
+def test_memmap_storage(specviz_gui, tmpdir):
+    storage = MemmapStorage(root=str(tmpdir))
+    model = DataListModel(storage=storage)
+
+    flux = np.random.sample(100)
+    spec = Spectrum1D(flux=flux * u.Jy, spectral_axis=np.arange(100) * u.AA,
+                      uncertainty=StdDevUncertainty(flux * 0.1))
+
+    data_item = model.add_data(spec, "Spectrum")
+    other_item = model.add_data(spec, "Other spectrum")
+
+    assert _is_memmap(data_item.spectrum.data)
+    assert _is_memmap(spectral_axis_buffer(data_item.spectrum))
+    assert np.all(data_item.flux == spec.flux)
+    assert np.all(data_item.spectral_axis == spec.spectral_axis)
+    assert np.all(data_item.uncertainty.array == spec.uncertainty.array)
+    assert np.shares_memory(data_item.spectral_axis, other_item.spectral_axis)
+
+    # One file per spectrum, and one for the shared spectral axis
+    assert len(os.listdir(storage.directory)) == 3
+
+    model.remove_data(data_item.identifier)
+
+    assert len(os.listdir(storage.directory)) == 2
+
+    model.remove_data(other_item.identifier)
+
+    assert len(os.listdir(storage.directory)) == 0
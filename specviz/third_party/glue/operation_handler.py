@@ -6,6 +6,8 @@ from qtpy.uic import loadUi
 from spectral_cube import BooleanArrayMask, SpectralCube
 from glue.core import Subset, Data, Component
 
+from ...core.operations import StackOperation
+from ...utils.helper_functions import format_bytes
 from .threads import OperationThread
 
 
@@ -70,8 +72,16 @@ class SpectralOperationHandler(QDialog):
                                                           str(v)) > 15 else str(
                                                           v)))
 
-                operation_stack.append("{}({})".format(oper.function.__name__,
-                                                       ", ".join(func_params)))
+                label = "{}({})".format(oper.function.__name__,
+                                        ", ".join(func_params))
+
+                # Show the memory held by the operation kept in the history
+                nbytes = StackOperation.history().nbytes_of(oper)
+
+                if nbytes is not None:
+                    label += " [{}]".format(format_bytes(nbytes))
+
+                operation_stack.append(label)
 
             self.operation_combo_box.addItems(operation_stack)
         else:
@@ -134,6 +144,9 @@ class SpectralOperationHandler(QDialog):
         self.button_box.button(QDialogButtonBox.Ok).setEnabled(False)
         self.button_box.button(QDialogButtonBox.Cancel).setEnabled(False)
 
+        # Keep the operation being replayed in the operation history
+        StackOperation.history().touch(self._function)
+
         if self._func_proxy is not None:
             op_func = lambda *args, **kwargs: self._func_proxy(self._function, *args, **kwargs)
         else:
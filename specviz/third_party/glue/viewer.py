@@ -549,11 +549,12 @@ class SpecvizDataViewer(DataViewer):
         def threadable_function(func, data, tracker, **kwargs):
             out = np.empty(shape=data.shape)
 
+            # Smooth the spectra of each row of spaxels as one block, which
+            # runs once for the kernels with a vectorised implementation
             for x in range(data.shape[1]):
-                for y in range(data.shape[2]):
-                    out[:, x, y] = func(data[:, x, y],
-                                        data.spectral_axis)
-                    tracker()
+                out[:, x, :] = func.batch(data.filled_data[:, x, :].T,
+                                          data.spectral_axis).T
+                tracker((x + 1) * data.shape[2])
 
             return out, data.meta.get('unit')
 
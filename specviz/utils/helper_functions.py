@@ -26,3 +26,29 @@ def format_float_text(value):
         return "{0:.3f}".format(value)
     else:
         return "{0:.3e}".format(value)
+
+
+def format_bytes(nbytes):
+    """
+    Format a size in bytes as text, with a binary prefix.
+
+    Parameters
+    ----------
+    nbytes : int
+        The size in bytes.
+
+    Returns
+    -------
+    str
+        The formatted string, e.g. ``"1.5 MiB"``.
+    """
+    for prefix in ("", "Ki", "Mi", "Gi"):
+        if abs(nbytes) < 1024 or prefix == "Gi":
+            break
+
+        nbytes /= 1024
+
+    if prefix == "":
+        return "{0:d} B".format(int(nbytes))
+
+    return "{0:.1f} {1}B".format(nbytes, prefix)
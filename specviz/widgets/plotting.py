@@ -1,6 +1,7 @@
 import sys
 import os
 import logging
+import uuid
 
 import astropy.units as u
 import numpy as np
@@ -62,6 +63,12 @@ class PlotWindow(QMdiSubWindow):
         self._central_widget.reset_view_action.triggered.connect(
             lambda: self._on_reset_view())
 
+        self._central_widget.uncertainty_band_action.setIcon(
+            qta.icon('fa.area-chart'))
+        self._central_widget.uncertainty_band_action.toggled.connect(
+            lambda checked: self.plot_widget.set_uncertainty_mode(
+                'band' if checked else 'bars'))
+
     @property
     def tool_bar(self):
         """
@@ -91,6 +98,88 @@ class PlotWindow(QMdiSubWindow):
         """
         return self.plot_widget.proxy_model
 
+    def display_state(self):
+        """
+        The display state of this plot window, saved in workspace sessions:
+        the plot units, the uncertainty mode, the color, width and visibility
+        of each data item, the regions of interest and the view range.
+
+        Returns
+        -------
+        dict
+            A JSON-serializable mapping.
+        """
+        plot_widget = self.plot_widget
+
+        def unit_string(unit):
+            return None if unit is None else u.Unit(unit).to_string()
+
+        items = {}
+
+        for descriptor in self.proxy_model.descriptors:
+            items[str(descriptor.data_item.identifier)] = {
+                'color': QColor(descriptor.color).name(QColor.HexArgb),
+                'width': descriptor.width,
+                'visible': descriptor.visible
+            }
+
+        return {
+            'title': self.windowTitle(),
+            'data_unit': unit_string(plot_widget.data_unit),
+            'spectral_axis_unit': unit_string(plot_widget.spectral_axis_unit),
+            'uncertainty_mode': plot_widget.uncertainty_mode,
+            'items': items,
+            'regions': [[float(x) for x in region.getRegion()]
+                        for region in plot_widget.list_all_regions()],
+            'view_range': [[float(x) for x in axis_range]
+                           for axis_range in plot_widget.viewRange()]
+        }
+
+    def restore_display_state(self, state):
+        """
+        Restore the display state saved by `PlotWindow.display_state`. The
+        data items must have been added to the model beforehand; items no
+        longer in the model are ignored.
+
+        Parameters
+        ----------
+        state : dict
+            The saved display state.
+        """
+        plot_widget = self.plot_widget
+
+        self.setWindowTitle(state['title'])
+        self._central_widget.uncertainty_band_action.setChecked(
+            state['uncertainty_mode'] == 'band')
+
+        if state['data_unit'] is not None or \
+                state['spectral_axis_unit'] is not None:
+            plot_widget.initialize_plot(state['data_unit'],
+                                        state['spectral_axis_unit'])
+
+        visible = []
+
+        for identifier, item_state in state['items'].items():
+            descriptor = self.proxy_model.descriptor_from_id(
+                uuid.UUID(identifier))
+
+            if descriptor is None:
+                continue
+
+            descriptor.color = QColor(item_state['color']).toRgb()
+            descriptor.width = item_state['width']
+
+            if item_state['visible']:
+                visible.append(descriptor)
+
+        plot_widget.add_plots(visible)
+
+        for min_bound, max_bound in state['regions']:
+            plot_widget._on_add_linear_region(min_bound, max_bound)
+
+        x_range, y_range = state['view_range']
+        plot_widget.setRange(xRange=x_range, yRange=y_range, padding=0)
+
     def closeEvent(self, event):
         """
         Called by qt when window closes, upon which
@@ -189,9 +278,9 @@ class PlotWidget(pg.PlotWidget):
         self._plot_item = self.getPlotItem()
         self._visible = visible
 
-        # Performance enhancements
-        # self.setDownsampling(auto=False)
-        # self.setClipToView(True)
+        # PyQtGraph's downsampling and clipping do not support step mode.
+        # Long spectra are instead decimated by each `PlotDataItem`, which
+        # draws the level of its envelope pyramid matching the view width.
 
         # Define labels for axes
         self._plot_item.setLabel('bottom', text='')
@@ -218,6 +307,13 @@ class PlotWidget(pg.PlotWidget):
         # Cache a reference to the model object that's attached to the parent
         self._proxy_model = PlotProxyModel(model)
 
+        # Set while plots are being added in bulk, during which the per-item
+        # compatibility re-evaluation is deferred
+        self._compatibility_checks_suspended = False
+
+        # How the uncertainties of all plotted items are drawn
+        self._uncertainty_mode = 'bars'
+
         # Set default axes ranges
         self.setRange(xRange=(0, 1), yRange=(0, 1))
         self.enableAutoRange(True)
@@ -227,6 +323,8 @@ class PlotWidget(pg.PlotWidget):
 
         # Listen for model events to add/remove items from the plot
         self.proxy_model.sourceModel().data_added.connect(self._check_unit_compatibility)
+        self.proxy_model.sourceModel().data_batch_added.connect(
+            self._check_batch_unit_compatibility)
         self.proxy_model.rowsAboutToBeRemoved.connect(
             lambda idx: self.remove_plot(index=idx))
 
@@ -263,22 +361,7 @@ class PlotWidget(pg.PlotWidget):
 
     @data_unit.setter
     def data_unit(self, value):
-        for plot_data_item in self.listDataItems():
-            if plot_data_item.is_data_unit_compatible(value):
-                plot_data_item.data_unit = value
-
-                # Re-initialize plot to update the displayed values and
-                # adjust ranges of the displayed axes
-                # TODO: Changed this to data_unit from spectral_axis_unit
-                self.initialize_plot(data_unit=value)
-            else:
-                # Technically, this should not occur, but in the unforseen
-                # case that it does, remove the plot and log an error
-                self.remove_plot(item=plot_data_item)
-                logging.error("Removing plot '%s' due to incompatible units "
-                              "('%s' and '%s').",
-                              plot_data_item.data_item.name,
-                              plot_data_item.data_unit, value)
+        self._set_units(data_unit=value)
 
     def set_data_unit(self, unit):
         """
@@ -290,30 +373,11 @@ class PlotWidget(pg.PlotWidget):
         unit : :class:`~astropy.units.Unit`
             The unit to which the data axis will be converted.
         """
-        self.data_unit = unit
-
-        if isinstance(unit, u.Unit):
-            unit = unit.to_string()
-
-        self.data_unit_changed.emit(unit)
+        self.set_units(data_unit=unit)
 
     @spectral_axis_unit.setter
     def spectral_axis_unit(self, value):
-        for plot_data_item in self.listDataItems():
-            if plot_data_item.is_spectral_axis_unit_compatible(value):
-                plot_data_item.spectral_axis_unit = value
-
-                # Re-initialize plot to update the displayed values and
-                # adjust ranges of the displayed axes
-                self.initialize_plot(spectral_axis_unit=value)
-            else:
-                # Technically, this should not occur, but in the unforseen
-                # case that it does, remove the plot and log an error
-                self.remove_plot(item=plot_data_item)
-                logging.error("Removing plot '%s' due to incompatible units "
-                              "('%s' and '%s').",
-                              plot_data_item.data_item.name,
-                              plot_data_item.spectral_axis_unit, value)
+        self._set_units(spectral_axis_unit=value)
 
     def set_spectral_axis_unit(self, unit):
         """
@@ -325,12 +389,69 @@ class PlotWidget(pg.PlotWidget):
         unit : :class:`~astropy.units.Unit`
             The unit to which the spectral axis will be converted.
         """
-        self.spectral_axis_unit = unit
+        self.set_units(spectral_axis_unit=unit)
 
-        if isinstance(unit, u.Unit):
-            unit = unit.to_string()
+    def set_units(self, data_unit=None, spectral_axis_unit=None):
+        """
+        Sets the data and spectral axis units in a single transaction, and
+        emits one signal for each unit that was given.
+
+        All plotted items are converted in one pass, after which the axes are
+        relabeled and the view range is re-evaluated once, regardless of the
+        number of items.
 
-        self.spectral_axis_unit_changed.emit(unit)
+        Parameters
+        ----------
+        data_unit : :class:`~astropy.units.Unit`, optional
+            The unit to which the data axis will be converted.
+        spectral_axis_unit : :class:`~astropy.units.Unit`, optional
+            The unit to which the spectral axis will be converted.
+        """
+        self._set_units(data_unit=data_unit,
+                        spectral_axis_unit=spectral_axis_unit)
+
+        for unit, signal in ((data_unit, self.data_unit_changed),
+                             (spectral_axis_unit,
+                              self.spectral_axis_unit_changed)):
+            if unit is None:
+                continue
+
+            if isinstance(unit, u.UnitBase):
+                unit = unit.to_string()
+
+            signal.emit(unit)
+
+    def _set_units(self, data_unit=None, spectral_axis_unit=None):
+        converted = False
+
+        for plot_data_item in self.listDataItems():
+            if not isinstance(plot_data_item, PlotDataItem):
+                continue
+
+            if (data_unit is None or
+                    plot_data_item.is_data_unit_compatible(data_unit)) and \
+                    (spectral_axis_unit is None or
+                     plot_data_item.is_spectral_axis_unit_compatible(
+                         spectral_axis_unit)):
+                plot_data_item.set_units(data_unit=data_unit,
+                                         spectral_axis_unit=spectral_axis_unit)
+                converted = True
+            else:
+                # Technically, this should not occur, but in the unforseen
+                # case that it does, remove the plot and log an error
+                self.remove_plot(item=plot_data_item)
+                logging.error("Removing plot '%s' due to incompatible units "
+                              "('%s' and '%s', '%s' and '%s').",
+                              plot_data_item.data_item.name,
+                              plot_data_item.data_unit, data_unit,
+                              plot_data_item.spectral_axis_unit,
+                              spectral_axis_unit)
+
+        # Re-initialize plot once to update the displayed values and adjust
+        # ranges of the displayed axes
+        if converted:
+            self.initialize_plot(data_unit=data_unit,
+                                 spectral_axis_unit=spectral_axis_unit)
 
     @property
     def selected_region(self):
@@ -353,25 +474,73 @@ class PlotWidget(pg.PlotWidget):
         """
         Called when the user clicks the item's checkbox.
         """
-        source_index = self.proxy_model.sourceModel().indexFromItem(item)
-        proxy_index = self.proxy_model.mapFromSource(source_index)
+        descriptor = self.proxy_model.descriptor_from_id(item.identifier)
 
-        plot_data_item = self.proxy_model.item_from_index(proxy_index)
+        if descriptor is None:
+            return
 
         # Re-evaluate plot unit compatibilities
         self.check_plot_compatibility()
 
-        if plot_data_item.visible:
+        # Only build the plot data item if it is to be shown, items which have
+        # never been shown cannot be in the plot
+        plot_data_item = self.proxy_model.item_from_id(
+            item.identifier, build=descriptor.visible)
+
+        if descriptor.visible:
             if plot_data_item not in self.listDataItems():
                 logging.info("Adding plot %s", item.name)
                 self.add_plot(item=plot_data_item,
                               visible=True,
                               initialize=len(self.listDataItems()) == 0)
         else:
-            if plot_data_item in self.listDataItems():
+            if plot_data_item is not None and \
+                    plot_data_item in self.listDataItems():
                 logging.info("Removing plot %s", item.name)
                 self.remove_plot(item=plot_data_item)
 
+    @property
+    def uncertainty_mode(self):
+        """
+        How the uncertainties of the plotted items are drawn, either as error
+        bars (``'bars'``) or as a shaded band (``'band'``).
+        """
+        return self._uncertainty_mode
+
+    @uncertainty_mode.setter
+    def uncertainty_mode(self, value):
+        self.set_uncertainty_mode(value)
+
+    def set_uncertainty_mode(self, mode):
+        """
+        Change how the uncertainties of the plotted items are drawn.
+
+        Parameters
+        ----------
+        mode : str
+            Either ``'bars'`` to draw error bars, or ``'band'`` to draw a
+            shaded band.
+        """
+        if mode not in PlotDataItem.uncertainty_modes:
+            raise ValueError("Uncertainty mode must be one of {}, not "
+                             "'{}'.".format(PlotDataItem.uncertainty_modes,
+                                            mode))
+
+        self._uncertainty_mode = mode
+
+        for item in self.listDataItems():
+            if not isinstance(item, PlotDataItem) or \
+                    item.uncertainty_mode == mode:
+                continue
+
+            if item.uncertainty is not None:
+                self.removeItem(item.uncertainty_item)
+
+            item.uncertainty_mode = mode
+
+            if item.uncertainty is not None:
+                self.addItem(item.uncertainty_item)
+
     def check_plot_compatibility(self):
         """
         Checks for unit compatibility between this plot widget and all plot
@@ -379,30 +548,47 @@ class PlotWidget(pg.PlotWidget):
         its state is set to disabled and the user will not be able to plot it
         in the plot widget.
         """
-        for i in range(self.proxy_model.sourceModel().rowCount()):
-            model_item = self.proxy_model.sourceModel().item(i)
-            source_index = self.proxy_model.sourceModel().indexFromItem(model_item)
-            proxy_index = self.proxy_model.mapFromSource(source_index)
-
-            if not proxy_index.isValid():
-                continue
+        if self._compatibility_checks_suspended:
+            return
 
-            plot_data_item = self.proxy_model.item_from_index(proxy_index)
+        # Unit compatibility is cached per source and target units, making
+        # this a lookup per row
+        for model_item in self.proxy_model.sourceModel().items:
+            descriptor = self.proxy_model.descriptor_from_id(
+                model_item.identifier)
 
             if self.data_unit is None and self.spectral_axis_unit is None or \
-                    plot_data_item.are_units_compatible(
+                    descriptor.are_units_compatible(
                         self.spectral_axis_unit, self.data_unit):
-                plot_data_item.data_item.setEnabled(True)
+                descriptor.data_item.setEnabled(True)
             else:
-                plot_data_item.visible = False
-                plot_data_item.data_item.setEnabled(False)
+                # Visible items necessarily have a plot data item, which needs
+                # to be notified of the change in visibility
+                if descriptor.visible:
+                    self.proxy_model.item_from_id(
+                        descriptor.data_item.identifier).visible = False
+
+                descriptor.data_item.setEnabled(False)
 
     def _check_unit_compatibility(self, item):
-        plot_data_item = self.proxy_model.item_from_id(item.identifier)
+        descriptor = self.proxy_model.descriptor_from_id(item.identifier)
 
-        if not plot_data_item.are_units_compatible(self.spectral_axis_unit,
-                                                   self.data_unit):
-            plot_data_item.data_item.setEnabled(False)
+        if not descriptor.are_units_compatible(self.spectral_axis_unit,
+                                               self.data_unit):
+            descriptor.data_item.setEnabled(False)
+
+    def _check_batch_unit_compatibility(self, items):
+        # With no units defined, every item can be plotted
+        if self.data_unit is None and self.spectral_axis_unit is None:
+            return
+
+        # Compatibility is cached per unit pair, so items sharing the same
+        # flux and spectral axis units are only evaluated once
+        for item in items:
+            descriptor = self.proxy_model.descriptor_from_id(item.identifier)
+
+            item.setEnabled(descriptor.are_units_compatible(
+                self.spectral_axis_unit, self.data_unit))
 
     def add_plot(self, item=None, index=None, visible=True, initialize=False):
         """
@@ -428,14 +614,15 @@ class PlotWidget(pg.PlotWidget):
 
         if item.are_units_compatible(self.spectral_axis_unit,
                                                self.data_unit):
-            item.data_unit = self.data_unit
-            item.spectral_axis_unit = self.spectral_axis_unit
+            item.set_units(self.data_unit, self.spectral_axis_unit)
         else:
             item.reset_units()
 
         # Include uncertainty item
+        item.uncertainty_mode = self.uncertainty_mode
+
         if item.uncertainty is not None:
-            self.addItem(item.error_bar_item)
+            self.addItem(item.uncertainty_item)
 
         self.addItem(item)
 
@@ -446,6 +633,61 @@ class PlotWidget(pg.PlotWidget):
         # Emit a plot added signal
         self.plot_added.emit(item)
 
+    def add_plots(self, items):
+        """
+        Adds several plot data items to the plot in one pass. Unit
+        compatibility is evaluated once the plot units have been defined by
+        the first plotted item, and once more after all items are added,
+        rather than after each addition.
+
+        Parameters
+        ----------
+        items : list
+            The :class:`~specviz.core.items.PlotDataItem` or
+            :class:`~specviz.core.items.PlotItemDescriptor` objects to add.
+            Plot data items are only built for the descriptors of data items
+            which can be displayed.
+        """
+        plotted = set(x.data_item.identifier for x in self.listDataItems()
+                      if isinstance(x, PlotDataItem))
+        added = []
+
+        self._compatibility_checks_suspended = True
+
+        try:
+            for item in items:
+                identifier = item.data_item.identifier
+
+                if identifier in plotted:
+                    continue
+
+                if len(plotted) == 0:
+                    item = self.proxy_model.item_from_id(identifier)
+                    item.visible = True
+                    self.add_plot(item=item, initialize=True)
+
+                    # The first item defines the plot units, re-evaluate which
+                    # of the remaining items can be displayed
+                    self._compatibility_checks_suspended = False
+                    self.check_plot_compatibility()
+                    self._compatibility_checks_suspended = True
+                elif item.data_item.isEnabled():
+                    item = self.proxy_model.item_from_id(identifier)
+                    item.visible = True
+                    self.add_plot(item=item)
+                else:
+                    continue
+
+                plotted.add(identifier)
+                added.append(identifier)
+        finally:
+            self._compatibility_checks_suspended = False
+
+        self.check_plot_compatibility()
+
+        # Refresh the check boxes of the added items in the views at once
+        self.proxy_model.emit_rows_changed(added)
+
     def initialize_plot(self, data_unit=None, spectral_axis_unit=None):
         """
         Routine to re-configure the display settings of the plot to fit the
@@ -518,9 +760,9 @@ class PlotWidget(pg.PlotWidget):
             # Remove plot data item from this plot
             self.removeItem(item)
 
-            # Remove plot error bars
+            # Remove plot uncertainties
             if item.uncertainty is not None:
-                self.removeItem(item.error_bar_item)
+                self.removeItem(item.uncertainty_item)
 
             # If there are no current plots, reset unit information for plot
             if len(self.listDataItems()) == 0:
@@ -62,15 +62,25 @@ class SpectrumSelection(QDialog):
         names : `list`
             The list of names that were selected when the dialog closes
         """
+        return [self._model.item(i).text() for i in self.get_selected_rows()]
+
+    def get_selected_rows(self):
+        """
+        Get the positions, in the list of names the dialog was populated with,
+        of the names that were actually checked when the dialog closes. Unlike
+        the names, the positions identify items sharing the same name.
+
+        Returns
+        -------
+        rows : `list`
+            The positions of the names that were selected when the dialog
+            closes, or an empty list in the cases listed in `get_selected`.
+        """
         if not self._selected:
             return []
 
-        selected = []
-        for i in range(self._model.rowCount()):
-            item = self._model.item(i)
-            if item.checkState() == Qt.Checked:
-                selected.append(item.text())
-        return selected
+        return [i for i in range(self._model.rowCount())
+                if self._model.item(i).checkState() == Qt.Checked]
 
     def _confirm_selection(self):
         self._selected = True
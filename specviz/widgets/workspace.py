@@ -5,25 +5,33 @@ from collections import OrderedDict
 
 import numpy as np
 from astropy.io import registry as io_registry
-from astropy.io.registry import IORegistryError, get_reader, identify_format
+from astropy.io.registry import get_reader
 from qtpy import compat
-from qtpy.QtCore import QEvent, Qt, Signal
-from qtpy.QtWidgets import (QApplication, QMainWindow, QMenu,
-                            QMessageBox, QTabBar, QToolButton)
+from qtpy.QtCore import QEvent, Qt, QThread, Signal
+from qtpy.QtWidgets import (QApplication, QDialogButtonBox, QInputDialog,
+                            QMainWindow, QMenu, QMessageBox, QProgressDialog,
+                            QTabBar, QToolButton)
 from qtpy.uic import loadUi
 from specutils import Spectrum1D, SpectrumList
 
 from .plotting import PlotWindow
+from ..core.events import WorkspaceChange, WorkspaceEventBus
+from ..core.export import (EXPORT_FORMATS, export_spectra,
+                           export_spectrum, format_from_path)
 from ..core.items import PlotDataItem
+from ..core.loading import (LoadCancelled, expand_paths, loader_cache,
+                            read_files, read_spectra, spectrum_names)
 from ..core.models import DataListModel
-from ..core.plugin import plugin
+from ..core.session import load_session, save_session
+from ..core.plugin import PluginInstances, plugin
 from ..widgets.delegates import DataItemDelegate
 from ..version import version as specviz_version
 
 from . import resources
 from .spectrum_selection import SpectrumSelection
 
-__all__ = ['Workspace']
+__all__ = ['Workspace', 'FileLoaderThread', 'BulkLoaderThread',
+           'ExportThread']
 
 
 class Workspace(QMainWindow):
@@ -46,6 +54,11 @@ class Workspace(QMainWindow):
         Fired when a new plot window is added to the workspace.
     plot_window_activated : ``qtpy.QtCore.Signal``
         Fired when a plto window in the workspace has become active.
+
+    Parameters
+    ----------
+    storage : :class:`~specviz.core.storage.MemmapStorage`, optional
+        Storage backend the arrays of the loaded spectra are spilled to.
     """
     window_activated = Signal(QMainWindow)
     window_closed = Signal(QMainWindow)
@@ -54,7 +67,7 @@ class Workspace(QMainWindow):
     plot_window_added = Signal(PlotWindow)
     plot_window_activated = Signal(PlotWindow)
 
-    def __init__(self, *args, **kwargs):
+    def __init__(self, storage=None, *args, **kwargs):
         super(Workspace, self).__init__(*args, **kwargs)
         # Retain a reference to the application
         self._app = QApplication.instance()
@@ -73,6 +86,10 @@ class Workspace(QMainWindow):
         # Setup workspace action connections
         self.new_workspace_action.triggered.connect(
             self._on_add_workspace)
+        self.open_workspace_action.triggered.connect(
+            self._on_open_workspace)
+        self.save_workspace_action.triggered.connect(
+            self._on_save_workspace)
         self.new_plot_action.triggered.connect(
             self._on_new_plot)
 
@@ -82,6 +99,8 @@ class Workspace(QMainWindow):
         self.delete_data_action.triggered.connect(
             self._on_delete_data)
         self.export_data_action.triggered.connect(self._on_export_data)
+        self.export_data_sets_action.triggered.connect(
+            self._on_export_data_sets)
 
         # Setup operations menu
         self.operations_button = self.main_tool_bar.widgetForAction(self.operations_action)
@@ -93,8 +112,9 @@ class Workspace(QMainWindow):
         # Ensure the mdiarea is in tabbed mode
         self.mdi_area.setViewMode(self.mdi_area.TabbedView)
 
-        # Define a new data list model for this workspace
-        self._model = DataListModel()
+        # Define a new data list model for this workspace, optionally spilling
+        # the loaded spectra to disk
+        self._model = DataListModel(storage=storage)
 
         # Set the styled item delegate on the model
         self.list_view.setItemDelegate(DataItemDelegate(self))
@@ -115,14 +135,36 @@ class Workspace(QMainWindow):
         self._model.itemChanged.connect(
             self._on_item_changed)
 
+        # Coalesce the bursts of state change signals fired by user actions
+        self._event_bus = WorkspaceEventBus(self)
+
+        for signal, change in (
+                (self._model.itemChanged, WorkspaceChange.DATA),
+                (self._model.data_batch_added, WorkspaceChange.DATA),
+                (self._model.rowsRemoved, WorkspaceChange.DATA),
+                (self.current_item_changed, WorkspaceChange.SELECTION),
+                (self.current_selected_changed, WorkspaceChange.SELECTION),
+                (self.plot_window_added, WorkspaceChange.PLOT_WINDOW),
+                (self.plot_window_activated, WorkspaceChange.PLOT_WINDOW),
+                (self.mdi_area.subWindowActivated,
+                 WorkspaceChange.PLOT_WINDOW)):
+            signal.connect(self._event_bus.notifier(change))
+
         # When a new data item is added to the model, select that item
         # self._model.rowsInserted.connect(self._on_row_inserted)
 
         # This is used purely for testing purposes in order to enable easy
         # access to various plugins from the workspace (rather than having to
-        # go through the toolbar).
-        self._plugins = {}
-        self._plugin_bars = {}
+        # go through the toolbar). Declared plugins are instantiated on first
+        # access.
+        self._plugins = PluginInstances(self)
+        self._plugin_bars = PluginInstances(self, plugin_bar=True)
+
+        # Keep references to the threads loading files in the background
+        self._loader_threads = []
+
+        # Keep references to the threads exporting data sets in the background
+        self._export_threads = []
 
         # Mount plugins
         plugin.mount(self)
@@ -143,6 +185,15 @@ class Workspace(QMainWindow):
         """The name of this workspace."""
         return self._name
 
+    @property
+    def event_bus(self):
+        """
+        The :class:`~specviz.core.events.WorkspaceEventBus` delivering one
+        coalesced notification of the changes to this workspace per user
+        action.
+        """
+        return self._event_bus
+
     @property
     def model(self):
         """
@@ -214,15 +265,15 @@ class Workspace(QMainWindow):
             return
 
         # If the item checkbox is clicked, ensure that the item is also selected
-        plot_item = self.proxy_model.item_from_id(item.identifier)
+        descriptor = self.proxy_model.descriptor_from_id(item.identifier)
 
-        if plot_item.visible:
+        if descriptor.visible:
             source_index = self.model.indexFromItem(item)
             idx = self.list_view.model().mapFromSource(source_index)
             self.list_view.setCurrentIndex(idx)
             return
 
-        for plot_item in self.list_view.model().items:
+        for plot_item in self.list_view.model().descriptors:
             if plot_item.visible:
                 proxy_index = self.list_view.model().mapFromSource(plot_item.data_item.index())
                 self.list_view.setCurrentIndex(proxy_index)
@@ -245,6 +296,106 @@ class Workspace(QMainWindow):
         self._app.current_workspace = workspace
         workspace.add_plot_window()
 
+    def save_session(self, path):
+        """
+        Save the data items of this workspace and the display state of its
+        plot windows to a session directory.
+
+        Parameters
+        ----------
+        path : str
+            The session directory, created if it does not exist. Saving over
+            an existing session only writes the data that changed.
+        """
+        save_session(path, self.model,
+                     windows=[sub_window.display_state() for sub_window
+                              in self.mdi_area.subWindowList()])
+
+        self._set_name(os.path.splitext(os.path.basename(
+            os.path.normpath(path)))[0])
+
+    def open_session(self, path):
+        """
+        Restore a session saved by `Workspace.save_session` into this
+        workspace. The data items are added to the model, and the existing
+        plot windows are reused before new ones are created.
+
+        The arrays of the spectra are memory-mapped from the session files,
+        so that only the spectra actually plotted are read from disk.
+
+        Parameters
+        ----------
+        path : str
+            The session directory.
+
+        Returns
+        -------
+        : list
+            The restored data items.
+        """
+        data_items, windows = load_session(path)
+
+        self.model.append_data_items(data_items)
+
+        sub_windows = self.mdi_area.subWindowList()
+
+        for i, state in enumerate(windows):
+            plot_window = sub_windows[i] if i < len(sub_windows) else \
+                self.add_plot_window()
+            plot_window.restore_display_state(state)
+
+        self._set_name(os.path.splitext(os.path.basename(
+            os.path.normpath(path)))[0])
+
+        return data_items
+
+    def _set_name(self, name):
+        self._name = name
+        self.setWindowTitle(self.name + " — SpecViz (v{})".format(specviz_version))
+
+    def _on_open_workspace(self):
+        path = compat.getexistingdirectory(parent=self,
+                                           caption="Open workspace session",
+                                           basedir=os.getcwd())
+        if not path:
+            return
+
+        # Keep the data already loaded in this workspace
+        workspace = self
+
+        if len(self.model.items) > 0:
+            workspace = self._app.add_workspace()
+            self._app.current_workspace = workspace
+
+        try:
+            workspace.open_session(path)
+        except Exception as e:
+            logging.error(e)
+            workspace.display_load_data_error(e)
+
+    def _on_save_workspace(self):
+        path, _ = compat.getsavefilename(parent=self,
+                                         caption="Save workspace session",
+                                         basedir=os.path.join(os.getcwd(),
+                                                              self.name),
+                                         filters="SpecViz session (*.specviz)")
+        if not path:
+            return
+
+        if not path.endswith('.specviz'):
+            path += '.specviz'
+
+        try:
+            self.save_session(path)
+        except Exception as e:
+            logging.error(e)
+
+            message_box = QMessageBox()
+            message_box.setText("Error saving workspace.")
+            message_box.setIcon(QMessageBox.Critical)
+            message_box.setInformativeText(str(e))
+            message_box.exec()
+
     def _on_change_color_theme(self, theme):
         import pyqtgraph as pg
 
@@ -311,12 +462,27 @@ class Workspace(QMainWindow):
         self.list_view.selectionModel().currentChanged.connect(
             plot_window._on_current_item_changed)
 
+        # Report the changes to the plots of this window to the event bus
+        plot_widget = plot_window.plot_widget
+
+        for signal, change in (
+                (plot_widget.plot_added, WorkspaceChange.PLOTS),
+                (plot_widget.plot_removed, WorkspaceChange.PLOTS),
+                (plot_widget.roi_moved, WorkspaceChange.ROI),
+                (plot_widget.roi_removed, WorkspaceChange.ROI),
+                (plot_widget.data_unit_changed, WorkspaceChange.UNITS),
+                (plot_widget.spectral_axis_unit_changed,
+                 WorkspaceChange.UNITS)):
+            signal.connect(self._event_bus.notifier(change))
+
         # Fire a signal letting everyone know a new plot window has been added
         self.plot_window_added.emit(plot_window)
 
         # Mount plugins
         plugin.mount(self, filt='plot_bar')
 
+        return plot_window
+
     def _on_sub_window_activated(self, window):
         if window is None:
             return
@@ -409,20 +575,16 @@ class Workspace(QMainWindow):
 
         filters, loader_name_map = self._create_loader_filters()
 
-        file_path, fmt = compat.getopenfilename(parent=self,
-                                                basedir=os.getcwd(),
-                                                caption="Load spectral data file",
-                                                filters=";;".join(filters))
-        return file_path, loader_name_map[fmt]
+        file_paths, fmt = compat.getopenfilenames(parent=self,
+                                                  basedir=os.getcwd(),
+                                                  caption="Load spectral data files",
+                                                  filters=";;".join(filters))
+        return file_paths, loader_name_map[fmt]
 
     def _load_spectra_by_name(self, specs_by_name):
-        data_items = []
-
-        for name, spec in specs_by_name.items():
-            data_items.append(self._add_and_plot_data(spec, name))
+        data_items = self.model.add_data_batch(specs_by_name)
 
-        for di in data_items:
-            self.force_plot(di)
+        self.force_plot_batch(data_items)
 
         # TODO: is this return value useful? Potentially just for testing
         return data_items
@@ -451,41 +613,219 @@ class Workspace(QMainWindow):
         """
         speclist = self.read_data_file(file_path, file_loader=file_loader)
 
-        name = file_path.split('/')[-1].split('.')[0]
+        specs_by_name = OrderedDict(
+            zip(spectrum_names(file_path, len(speclist)), speclist))
 
-        if len(speclist) == 1:
-            specs_to_load = {name: speclist[0]}
+        if len(specs_by_name) > 1 and multi_select:
+            specs_to_load = self._select_spectra_to_load(specs_by_name)
         else:
-            specs_by_name = OrderedDict()
-            for i, spec in enumerate(speclist):
-                # TODO: try to use more informative metadata in the name
-                specs_by_name['{}-{}'.format(name, i)] = spec
-            if multi_select:
-                specs_to_load = self._select_spectra_to_load(specs_by_name)
-            else:
-                specs_to_load = specs_by_name
+            specs_to_load = specs_by_name
 
         return self._load_spectra_by_name(specs_to_load)
 
+    def load_data_from_file_async(self, file_path, file_loader=None,
+                                  multi_select=True):
+        """
+        Loads spectral data from a given file path and a file loader in a
+        background thread, displaying the progress in a dialog allowing the
+        user to cancel the load.
+
+        Unless a selection dialog is displayed, the spectra are added to the
+        model and plotted in batches as they are handed over by the thread.
+
+        Parameters
+        ----------
+        file_path : str
+            Path to location of the spectrum file.
+        file_loader : str, or None
+            Format specified for the astropy io interface.
+            If `None`, attempts to automatically select loader based on file
+            type.
+        multi_select : bool
+            If `True`, displays dialog for choosing spectra to load from file
+            once it has been read. This only occurs if the file loader returns
+            multiple spectra.
+
+        Returns
+        -------
+        : :class:`FileLoaderThread`
+            The running loader thread.
+        """
+        thread = FileLoaderThread(file_path, file_loader=file_loader,
+                                  parent=self)
+
+        progress_dialog = QProgressDialog(
+            "Loading '{}'...".format(os.path.basename(file_path)), "Cancel",
+            0, 100, self)
+        progress_dialog.setWindowTitle("Load Data")
+        progress_dialog.setMinimumDuration(500)
+        progress_dialog.canceled.connect(thread.cancel)
+
+        # Spectra waiting for the user to select which ones to load
+        pending = OrderedDict()
+
+        def on_progress(value, total):
+            progress_dialog.setValue(int(100 * value / max(total, 1)))
+
+        def on_spectra_read(specs_by_name):
+            if multi_select and thread.count > 1:
+                pending.update(specs_by_name)
+            else:
+                self._load_spectra_by_name(specs_by_name)
+
+        def on_finished():
+            cancelled = progress_dialog.wasCanceled()
+
+            progress_dialog.reset()
+            progress_dialog.deleteLater()
+            self._loader_threads.remove(thread)
+
+            if len(pending) > 0 and not cancelled:
+                self._load_spectra_by_name(
+                    self._select_spectra_to_load(pending))
+
+        thread.progress.connect(on_progress)
+        thread.spectra_read.connect(on_spectra_read)
+        thread.exception.connect(self.display_load_data_error)
+        thread.finished.connect(on_finished)
+
+        self._loader_threads.append(thread)
+        thread.start()
+
+        return thread
+
+    def load_data_from_files(self, file_paths, file_loader=None,
+                             batch_size=64, max_workers=None):
+        """
+        Loads all the spectra of many files, reading the files in parallel in
+        a pool of worker processes.
+
+        The spectra are added to the model and plotted in batches as the files
+        are read. Errors are collected and displayed once all the files have
+        been read, so that a single unreadable file does not stop the load.
+
+        Parameters
+        ----------
+        file_paths : str or list
+            Paths of the spectrum files, glob patterns or directories whose
+            files are loaded.
+        file_loader : str, or None
+            Format specified for the astropy io interface.
+            If `None`, attempts to automatically select loader based on file
+            type.
+        batch_size : int
+            The number of spectra added to the model at a time.
+        max_workers : int, or None
+            The number of worker processes. Defaults to the number of
+            processors.
+
+        Returns
+        -------
+        : list
+            The data items added to the model.
+        """
+        data_items = []
+        errors = []
+
+        # Files from different directories may share a name, so spectra are
+        # kept as (spectrum, name) pairs rather than keyed by name
+        pending = []
+
+        for file_path, speclist, exception in read_files(
+                expand_paths(file_paths), file_loader=file_loader,
+                max_workers=max_workers, cache=loader_cache):
+            if exception is not None:
+                errors.append("{}: {}".format(file_path, exception))
+                continue
+
+            pending.extend(zip(speclist,
+                               spectrum_names(file_path, len(speclist))))
+
+            if len(pending) >= batch_size:
+                data_items.extend(self._load_spectra_by_name(pending))
+                pending = []
+
+        if len(pending) > 0:
+            data_items.extend(self._load_spectra_by_name(pending))
+
+        if len(errors) > 0:
+            self.display_load_data_error("\n".join(errors))
+
+        return data_items
+
+    def load_data_from_files_async(self, file_paths, file_loader=None):
+        """
+        Loads all the spectra of many files as `load_data_from_files` does,
+        from a background thread, displaying the number of files read in a
+        dialog allowing the user to cancel the load.
+
+        Parameters
+        ----------
+        file_paths : str or list
+            Paths of the spectrum files, glob patterns or directories whose
+            files are loaded.
+        file_loader : str, or None
+            Format specified for the astropy io interface.
+            If `None`, attempts to automatically select loader based on file
+            type.
+
+        Returns
+        -------
+        : :class:`BulkLoaderThread`
+            The running loader thread.
+        """
+        file_paths = expand_paths(file_paths)
+        thread = BulkLoaderThread(file_paths, file_loader=file_loader,
+                                  parent=self)
+
+        progress_dialog = QProgressDialog(
+            "Loading {} files...".format(len(file_paths)), "Cancel",
+            0, len(file_paths), self)
+        progress_dialog.setWindowTitle("Load Data")
+        progress_dialog.setMinimumDuration(500)
+        progress_dialog.canceled.connect(thread.cancel)
+
+        errors = []
+
+        def on_finished():
+            progress_dialog.reset()
+            progress_dialog.deleteLater()
+            self._loader_threads.remove(thread)
+
+            if len(errors) > 0:
+                self.display_load_data_error("\n".join(errors))
+
+        thread.progress.connect(lambda value, total:
+                                progress_dialog.setValue(value))
+        thread.spectra_read.connect(self._load_spectra_by_name)
+        thread.file_failed.connect(lambda file_path, exception: errors.append(
+            "{}: {}".format(file_path, exception)))
+        thread.finished.connect(on_finished)
+
+        self._loader_threads.append(thread)
+        thread.start()
+
+        return thread
+
     def _on_load_data(self):
         """
-        When the user loads a data file, this method is triggered. It provides
+        When the user loads data files, this method is triggered. It provides
         a file open dialog and from the dialog attempts to create a new
-        :class:`~specutils.SpectrumList` object and thereafter adds the
-        contents to the data model.
+        :class:`~specutils.SpectrumList` object for each file and thereafter
+        adds the contents to the data model.
         """
-        file_path, file_loader = self._choose_file_path()
-        if not file_path:
+        file_paths, file_loader = self._choose_file_path()
+        if not file_paths:
             return
 
-        try:
-            self.load_data_from_file(file_path, file_loader)
-        except Exception as e:
-            self.display_load_data_error(e)
+        if len(file_paths) == 1:
+            self.load_data_from_file_async(file_paths[0], file_loader)
+        else:
+            self.load_data_from_files_async(file_paths, file_loader)
 
-    def export_data_item(self, data_item, filename, fmt):
+    def export_data_item(self, data_item, filename, fmt=None):
         """
-        Exports the currently selected data item to an ECSV file.
+        Exports a data item to a FITS, HDF5 or ECSV file.
 
         Parameters
         ----------
@@ -494,61 +834,113 @@ class Workspace(QMainWindow):
         filename : `str`
             Path of the file to be created on export
         fmt : `str`
-            Format to be used by IO registry for writing `~specutils.Spectrum1D`
+            Export format, one of the keys of
+            `~specviz.core.export.EXPORT_FORMATS`. Defaults to the format
+            matching the file extension.
         """
-        # TODO: the current release of specutils doesn't support exporting
-        # very well (it's untested, and probably does not match the attributes
-        # of the Spectrum1D object). So, create some temporary export formats.
-        def generic_export(spectrum, path):
-            """
-            Creates a temporary export format for use in writing out data.
-            """
-            from astropy.table import QTable
-            import astropy.units as u
+        export_spectrum(data_item.data_item.spectrum, filename, fmt)
 
-            data = {
-                'spectral_axis': spectrum.spectral_axis,
-                'flux': spectrum.flux,
-                'mask': spectrum.mask if spectrum.mask is not None
-                        else u.Quantity(np.ones(spectrum.spectral_axis.shape))
-            }
+    def export_data_items(self, data_items, directory, fmt):
+        """
+        Exports several data items to a directory, writing the files in
+        parallel from a background thread and displaying the progress in a
+        single dialog allowing the user to cancel the export.
 
-            if spectrum.uncertainty is not None:
-                data['uncertainty'] = spectrum.uncertainty.array * spectrum.uncertainty.unit
+        Parameters
+        ----------
+        data_items : list
+            The :class:`~specviz.core.items.DataItem` objects to export. The
+            file names are derived from their names.
+        directory : str
+            The directory to write the files to.
+        fmt : str
+            Export format, one of the keys of
+            `~specviz.core.export.EXPORT_FORMATS`.
 
-            meta = {}
+        Returns
+        -------
+        : :class:`ExportThread`
+            The running export thread.
+        """
+        # Items sharing a name are exported under distinct file names
+        specs = [(data_item.name, data_item.spectrum)
+                 for data_item in data_items]
 
-            if spectrum.meta is not None and 'header' in spectrum.meta:
-                meta.update({'header': {k: v for k, v in
-                                        spectrum.meta['header'].items()}})
+        thread = ExportThread(specs, directory, fmt, parent=self)
 
-            tab = QTable(data, meta=meta)
-            tab.write(path, format='ascii.ecsv')
+        progress_dialog = QProgressDialog(
+            "Exporting {} data sets...".format(len(data_items)), "Cancel",
+            0, len(data_items), self)
+        progress_dialog.setWindowTitle("Export Data")
+        progress_dialog.setMinimumDuration(500)
+        progress_dialog.canceled.connect(thread.cancel)
 
-        # Below should be used when specutils has proper write capabilities
-        # all_formats = io_registry.get_formats(Spectrum1D)['Format'].data
-        # writable_formats = io_registry.get_formats(Spectrum1D)['Write'].data
-        #
-        # write_mask = [True if x == 'Yes' else False for x in writable_formats]
-        # all_formats = all_formats[np.array(write_mask)]
-        # all_filters = ";;".join(list(all_formats))
+        errors = []
 
-        try:
-            io_registry.register_writer('*.ecsv', Spectrum1D, generic_export)
-        except io_registry.IORegistryError:
-            pass
+        def on_finished():
+            cancelled = progress_dialog.wasCanceled()
 
-        data_item.data_item.spectrum.write(filename, format=fmt)
+            progress_dialog.reset()
+            progress_dialog.deleteLater()
+            self._export_threads.remove(thread)
 
+            if len(errors) > 0:
+                self._display_export_error("\n".join(errors))
+            elif not cancelled:
+                message_box = QMessageBox()
+                message_box.setText("Data exported successfully.")
+                message_box.setIcon(QMessageBox.Information)
+                message_box.setInformativeText(
+                    "{} data sets have been exported to '{}'".format(
+                        len(data_items), directory))
+
+                message_box.exec()
+
+        thread.progress.connect(lambda value, total:
+                                progress_dialog.setValue(value))
+        thread.file_failed.connect(lambda path, exception: errors.append(
+            "{}: {}".format(path, exception)))
+        thread.finished.connect(on_finished)
+
+        self._export_threads.append(thread)
+        thread.start()
+
+        return thread
+
+    def _display_export_error(self, text):
+        message_box = QMessageBox()
+        message_box.setText("Error exporting data set.")
+        message_box.setIcon(QMessageBox.Critical)
+        message_box.setInformativeText(text)
+        message_box.exec()
+
+    def _choose_export_directory(self):
+        """
+        Ask the user for a directory and a format to export data items to.
+        """
+        fmt, ok = QInputDialog.getItem(self, "Export Data", "Export format:",
+                                       list(EXPORT_FORMATS), 0, False)
+
+        if not ok:
+            return None, None
+
+        directory = compat.getexistingdirectory(
+            parent=self, caption="Export data to directory",
+            basedir=os.getcwd())
+
+        return directory, fmt
 
     def _on_export_data(self):
         """
-        Handler function that is called when the Export Data button is pressed
+        Handler function that is called when the Export Data button is
+        pressed. Exports the selected data item to a file.
         """
-        all_filters = ";;".join(['*.ecsv'])
-        path, fmt = compat.getsavefilename(filters=all_filters)
+        path, fmt = compat.getsavefilename(filters=";;".join(EXPORT_FORMATS))
 
         if path and fmt:
+            if format_from_path(path) != fmt:
+                path += fmt[1:]
+
             try:
                 plot_data_item = self.current_item
                 self.export_data_item(plot_data_item, path, fmt)
@@ -564,16 +956,41 @@ class Workspace(QMainWindow):
             except Exception as e:
                 logging.error(e)
 
-                message_box = QMessageBox()
-                message_box.setText("Error exporting data set.")
-                message_box.setIcon(QMessageBox.Critical)
-                message_box.setInformativeText(
+                self._display_export_error(
                     "{}\n{}".format(
-                        sys.exc_info()[0], sys.exc_info()[1].__repr__()[:100])
-                )
+                        sys.exc_info()[0], sys.exc_info()[1].__repr__()[:100]))
 
-                message_box.exec()
+    def _on_export_data_sets(self):
+        """
+        Handler function that is called when the Export Data Sets button is
+        pressed. Asks the user which data items of the workspace to export,
+        all of them by default, and exports them to a directory.
+        """
+        data_items = self.model.items
+
+        if len(data_items) == 0:
+            return
+
+        selection_dialog = SpectrumSelection(self)
+        selection_dialog.setWindowTitle("Export Data Sets")
+        selection_dialog.label.setText(
+            "Select which data sets should be exported. By default all data "
+            "sets will be exported.")
+        selection_dialog.buttonBox.button(QDialogButtonBox.Open).setText(
+            "Export")
+        selection_dialog.populate([x.name for x in data_items])
+        selection_dialog.exec_()
 
+        data_items = [data_items[i]
+                      for i in selection_dialog.get_selected_rows()]
+
+        if len(data_items) == 0:
+            return
+
+        directory, fmt = self._choose_export_directory()
+
+        if directory:
+            self.export_data_items(data_items, directory, fmt)
 
     def _add_and_plot_data(self, spectrum, name):
         data_item = self.model.add_data(spectrum, name=name)
@@ -586,26 +1003,6 @@ class Workspace(QMainWindow):
 
         return data_item
 
-    def _get_matching_formats(self, file_path):
-        return io_registry.identify_format(
-            'read', SpectrumList, file_path, None, [], {})
-
-    def _try_priority_file_loaders(self, file_path):
-        fmts = self._get_matching_formats(file_path)
-        logging.warning("Loaders for '%s' matched for this data set. "
-                        "Iterating based on priority."
-                        "", ', '.join(fmts))
-
-        for fmt in fmts:
-            try:
-                speclist = SpectrumList.read(file_path, format=fmt)
-                return speclist
-            except IORegistryError:
-                logging.warning("Attempted load with '%s' failed, "
-                                "trying next loader.", fmt)
-
-        raise IOError('Could not find appropriate loader for given file')
-
     def _select_spectra_to_load(self, specs_by_name):
 
         selection_dialog = SpectrumSelection(self)
@@ -648,22 +1045,8 @@ class Workspace(QMainWindow):
         : :class:`~specutils.SpectrumList`
             A `~specutils.SpectrumList` instance containing the spectra loaded from the file
         """
-        # In the case that the user has selected auto load, loop through every
-        # available loader and choose the one that 1) the registry identifier
-        # function allows, and 2) is the highest priority.
-        try:
-            if file_loader:
-                if file_loader not in self._get_matching_formats(file_path):
-                    msg = 'Given file can not be processed as specified file format ({})'
-                    raise IOError(msg.format(file_loader))
-            speclist = SpectrumList.read(file_path, format=file_loader)
-        except IORegistryError as e:
-            # In this case, assume that the registry has found several
-            # loaders that fit the same identifier, choose the highest
-            # priority one.
-            speclist = self._try_priority_file_loaders(file_path)
-
-        return speclist
+        return read_spectra(file_path, file_loader=file_loader,
+                            cache=loader_cache)
 
     def force_plot(self, data_item):
         """
@@ -681,6 +1064,28 @@ class Workspace(QMainWindow):
         self.current_plot_window.plot_widget.on_item_changed(data_item)
         self._on_item_changed(item=plot_data_item.data_item)
 
+    def force_plot_batch(self, data_items):
+        """
+        Enable the checkboxes of the `~specviz.core.items.PlotDataItem`
+        objects representing the provided data items and add them to the
+        current plot in a single pass. The row of the last plotted item is
+        highlighted.
+
+        Parameters
+        ----------
+        data_items : list
+            The :class:`~specviz.core.items.DataItem` objects for which specviz
+            will force render the plots.
+        """
+        if len(data_items) == 0:
+            return
+
+        descriptors = [self.proxy_model.descriptor_from_id(x.identifier)
+                       for x in data_items]
+
+        self.current_plot_window.plot_widget.add_plots(descriptors)
+        self._on_item_changed(item=data_items[-1])
+
     def _on_delete_data(self):
         """
         Listens for data deletion events from the
@@ -699,3 +1104,252 @@ class Workspace(QMainWindow):
 
     def _on_quit(self):
         self._app.quit()
+
+
+class FileLoaderThread(QThread):
+    """
+    Thread in which a data file is read, to ensure that the UI does not
+    freeze while a large file is parsed.
+
+    The spectra read are handed over in batches, so that the first spectra
+    can be added to the model while the following ones are still being
+    transferred.
+
+    Parameters
+    ----------
+    file_path : str
+        Path to location of the spectrum file.
+    file_loader : str, optional
+        Format specified for the astropy io interface.
+    batch_size : int, optional
+        The number of spectra handed over at a time.
+    parent : :class:`~qtpy.QtCore.QObject`, optional
+        The parent of the thread.
+
+    Signals
+    -------
+    progress : Signal
+        Reports the number of bytes read so far and the size of the file.
+    spectra_read : Signal
+        Delivers a batch of spectra as an ordered mapping of display names to
+        :class:`~specutils.Spectrum1D` objects.
+    exception : Signal
+        Sends the exception raised while reading the file, unless the load
+        was cancelled.
+    """
+    progress = Signal(int, int)
+    spectra_read = Signal(object)
+    exception = Signal(Exception)
+
+    def __init__(self, file_path, file_loader=None, batch_size=32,
+                 parent=None):
+        super(FileLoaderThread, self).__init__(parent)
+        self._file_path = file_path
+        self._file_loader = file_loader
+        self._batch_size = batch_size
+        self._cancelled = False
+        self._count = 0
+        self._size = 0
+
+    @property
+    def count(self):
+        """
+        The number of spectra read from the file, or zero while the file is
+        still being read.
+        """
+        return self._count
+
+    def cancel(self):
+        """
+        Request the load to stop as soon as possible. Spectra already handed
+        over are kept.
+        """
+        self._cancelled = True
+
+    def _on_progress(self, position):
+        if self._cancelled:
+            raise LoadCancelled()
+
+        self.progress.emit(position, self._size)
+
+    def run(self):
+        """Run the thread."""
+        try:
+            self._size = os.path.getsize(self._file_path)
+
+            speclist = read_spectra(self._file_path,
+                                    file_loader=self._file_loader,
+                                    progress=self._on_progress,
+                                    cache=loader_cache)
+
+            self._count = len(speclist)
+            names = spectrum_names(self._file_path, self._count)
+
+            for start in range(0, self._count, self._batch_size):
+                if self._cancelled:
+                    break
+
+                stop = start + self._batch_size
+
+                self.spectra_read.emit(OrderedDict(
+                    zip(names[start:stop], speclist[start:stop])))
+        except LoadCancelled:
+            logging.info("Loading of '%s' cancelled.", self._file_path)
+        except Exception as e:
+            if not self._cancelled:
+                self.exception.emit(e)
+
+
+class BulkLoaderThread(QThread):
+    """
+    Thread driving the parallel read of many data files, to ensure that the
+    UI does not freeze while the files are read by the worker processes.
+
+    Parameters
+    ----------
+    file_paths : list
+        Paths of the spectrum files.
+    file_loader : str, optional
+        Format specified for the astropy io interface.
+    batch_size : int, optional
+        The number of spectra handed over at a time.
+    max_workers : int, optional
+        The number of worker processes. Defaults to the number of processors.
+    parent : :class:`~qtpy.QtCore.QObject`, optional
+        The parent of the thread.
+
+    Signals
+    -------
+    progress : Signal
+        Reports the number of files read so far and the number of files.
+    spectra_read : Signal
+        Delivers a batch of spectra as a list of ``(spectrum, name)`` pairs.
+        Spectra read from different files may share a name.
+    file_failed : Signal
+        Sends the path of a file that could not be read and the exception
+        raised while reading it.
+    """
+    progress = Signal(int, int)
+    spectra_read = Signal(object)
+    file_failed = Signal(str, Exception)
+
+    def __init__(self, file_paths, file_loader=None, batch_size=64,
+                 max_workers=None, parent=None):
+        super(BulkLoaderThread, self).__init__(parent)
+        self._file_paths = list(file_paths)
+        self._file_loader = file_loader
+        self._batch_size = batch_size
+        self._max_workers = max_workers
+        self._cancelled = False
+
+    def cancel(self):
+        """
+        Request the load to stop once the files being read are done. Spectra
+        already handed over are kept.
+        """
+        self._cancelled = True
+
+    def run(self):
+        """Run the thread."""
+        pending = []
+        total = len(self._file_paths)
+
+        files = read_files(self._file_paths, file_loader=self._file_loader,
+                           max_workers=self._max_workers, cache=loader_cache)
+
+        try:
+            for count, (file_path, speclist, exception) in \
+                    enumerate(files, 1):
+                if self._cancelled:
+                    logging.info("Loading of %d files cancelled.", total)
+                    break
+
+                self.progress.emit(count, total)
+
+                if exception is not None:
+                    self.file_failed.emit(file_path, exception)
+                    continue
+
+                pending.extend(zip(speclist,
+                                   spectrum_names(file_path, len(speclist))))
+
+                if len(pending) >= self._batch_size:
+                    self.spectra_read.emit(pending)
+                    pending = []
+        finally:
+            # Cancels the files not yet read and shuts the pool down
+            files.close()
+
+        if len(pending) > 0 and not self._cancelled:
+            self.spectra_read.emit(pending)
+
+
+class ExportThread(QThread):
+    """
+    Thread driving the parallel export of many spectra, to ensure that the UI
+    does not freeze while the files are written.
+
+    Parameters
+    ----------
+    specs_by_name : dict or list
+        The spectra to export, as a mapping of display names to
+        :class:`~specutils.Spectrum1D` objects or as a list of
+        ``(name, spectrum)`` pairs.
+    directory : str
+        The directory to write the files to.
+    fmt : str
+        Export format, one of the keys of
+        `~specviz.core.export.EXPORT_FORMATS`.
+    max_workers : int, optional
+        The number of writer threads.
+    parent : :class:`~qtpy.QtCore.QObject`, optional
+        The parent of the thread.
+
+    Signals
+    -------
+    progress : Signal
+        Reports the number of files written so far and the number of files.
+    file_failed : Signal
+        Sends the path of a file that could not be written and the exception
+        raised while writing it.
+    """
+    progress = Signal(int, int)
+    file_failed = Signal(str, Exception)
+
+    def __init__(self, specs_by_name, directory, fmt, max_workers=None,
+                 parent=None):
+        super(ExportThread, self).__init__(parent)
+        self._specs_by_name = specs_by_name
+        self._directory = directory
+        self._fmt = fmt
+        self._max_workers = max_workers
+        self._cancelled = False
+
+    def cancel(self):
+        """
+        Request the export to stop once the files being written are done.
+        """
+        self._cancelled = True
+
+    def run(self):
+        """Run the thread."""
+        total = len(self._specs_by_name)
+
+        files = export_spectra(self._specs_by_name, self._directory,
+                               self._fmt, max_workers=self._max_workers)
+
+        try:
+            for count, (path, exception) in enumerate(files, 1):
+                if self._cancelled:
+                    logging.info("Export of %d files cancelled.", total)
+                    break
+
+                self.progress.emit(count, total)
+
+                if exception is not None:
+                    self.file_failed.emit(path, exception)
+        except Exception as e:
+            self.file_failed.emit(self._directory, e)
+        finally:
+            # Cancels the files not yet written
+            files.close()